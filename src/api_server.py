@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from controller.course_controller import CourseController
+from controller.student_controller import StudentController
+from db import DB_FILE, ConnectionPool, load_config
+from model import keyset
+from model.course_model import CourseModel
+from query_registry import registry
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiServer:
+    """Local HTTP/JSON API over the student and course controllers.
+
+    Connections are handled on one asyncio event loop, with HTTP/1.1
+    keep-alive, so many clients cost no threads. Controller calls block on
+    SQLite and run on a small pool of worker threads instead, which check
+    a database connection out of a ConnectionPool per request: reads share
+    the read-only connections and writes queue for the writer.
+
+    Routes, for entity in students and courses:
+        GET    /{entity}?after_id=&after_value=&limit=&order_by=&q=   keyset page
+        GET    /{entity}/search?q=&limit=               search
+        GET    /{entity}/{id}
+        POST   /{entity}                                create, 201
+        PUT    /{entity}/{id}   (or PATCH)              update given fields
+        DELETE /{entity}/{id}   (courses: ?policy=&reassign_to=)
+        POST   /{entity}/bulk   {"create": [], "update": [], "delete": []}
+        GET    /courses/stats
+        GET    /health
+        GET    /metrics      per-query timings (see query_registry) and pool metrics
+    """
+
+    MAX_BODY = 10 * 1024 * 1024
+    MAX_LIMIT = 1000
+
+    ROUTES = [
+        ("GET", r"/health", "health"),
+        ("GET", r"/metrics", "metrics"),
+        ("GET", r"/(courses)/stats", "stats"),
+        ("GET", r"/(students|courses)", "list"),
+        ("GET", r"/(students|courses)/search", "search"),
+        ("POST", r"/(students|courses)/bulk", "bulk"),
+        ("GET", r"/(students|courses)/(\d+)", "get"),
+        ("POST", r"/(students|courses)", "create"),
+        ("PUT", r"/(students|courses)/(\d+)", "update"),
+        ("PATCH", r"/(students|courses)/(\d+)", "update"),
+        ("DELETE", r"/(students|courses)/(\d+)", "delete"),
+    ]
+
+    CONTROLLERS = {"students": StudentController, "courses": CourseController}
+    WRITE_ACTIONS = {"create", "update", "delete", "bulk"}
+
+    def __init__(self, db_file=DB_FILE, tuning=None, host="127.0.0.1", port=8765, workers=4, pool=None):
+        """Serve db_file through pool, or through a pool of its own with one reader per worker"""
+        self.host = host
+        self.port = port
+        self.routes = [(method, re.compile(pattern + "$"), action) for method, pattern, action in self.ROUTES]
+        self.owns_pool = pool is None
+        self.connections = pool or ConnectionPool(db_file, tuning, readers=workers)
+        # One more thread than readers, so a queued write never holds up every read
+        self.pool = ThreadPoolExecutor(max_workers=workers + 1, thread_name_prefix="api-worker")
+        self.server = None
+
+    # ------------------------------
+    # WORKER SIDE
+    # ------------------------------
+    def _run(self, action, entity, row_id, query, body):
+        """Call the controller for one request; returns (status, payload)"""
+        if action == "health":
+            replaced = self.connections.check_health()
+            return 200, {"status": "ok", "replaced": replaced, "pool": self.connections.metrics()}
+        if action == "metrics":
+            top = _int_param(query, "top")
+            return 200, {"queries": registry.snapshot(top), "pool": self.connections.metrics()}
+        with self.connections.connection(write=action in self.WRITE_ACTIONS) as db:
+            return self._call(db.model(self.CONTROLLERS[entity]), action, entity, row_id, query, body)
+
+    def _call(self, controller, action, entity, row_id, query, body):
+        if action == "stats":
+            return 200, {"rows": [row.as_dict() for row in controller.stats()]}
+        if action == "list":
+            after_id = _int_param(query, "after_id")
+            # The previous page's last_value; without it the value is looked up from after_id
+            after_value = query.get("after_value", keyset.UNSET)
+            page = controller.list(after_id, self._limit(query), query.get("order_by", "id"), query.get("q", ""),
+                                   after_value)
+            return 200, dict(page, rows=[row.as_dict() for row in page["rows"]])
+        if action == "search":
+            result = controller.search(query.get("q", ""), self._limit(query))
+            return 200, dict(result, rows=[row.as_dict() for row in result["rows"]])
+        if action == "bulk":
+            body = _object_body(body)
+            return 200, controller.bulk(body.get("create", ()), body.get("update", ()), body.get("delete", ()))
+        if action == "get":
+            row = controller.get(row_id)
+        elif action == "create":
+            return 201, controller.create(_object_body(body)).as_dict()
+        elif action == "update":
+            row = controller.update(row_id, _object_body(body))
+        elif entity == "courses":
+            row = controller.delete(row_id, query.get("policy"), query.get("reassign_to"))
+        else:
+            row = controller.delete(row_id)
+        if row is None:
+            raise HttpError(404, f"No {entity[:-1]} with id {row_id}")
+        return 200, {"id": row} if action == "delete" else row.as_dict()
+
+    def _limit(self, query):
+        limit = _int_param(query, "limit") or 100
+        if not 0 < limit <= self.MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {self.MAX_LIMIT}")
+        return limit
+
+    # ------------------------------
+    # HTTP SIDE
+    # ------------------------------
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        # Port 0 picks a free port; report the one actually bound
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Serving the student API on http://{self.host}:{self.port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.pool.shutdown(wait=True)
+        if self.owns_pool:
+            self.connections.close()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and (version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"))
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            # The request could not be parsed, so the connection cannot be reused
+            self._write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None  # client closed the connection
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get("content-length") or "0"
+        if not length.isdigit():
+            raise HttpError(400, "Invalid Content-Length")
+        length = int(length)
+        if length > self.MAX_BODY:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, version, headers, body
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+        path = url.path.rstrip("/") or "/"
+        allowed = False
+        for route_method, pattern, action in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+            groups = match.groups()
+            entity = groups[0] if groups else None
+            row_id = int(groups[1]) if len(groups) > 1 else None
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.pool, self._run, action, entity, row_id, query, body)
+            except HttpError as e:
+                return e.status, {"error": str(e)}
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            except sqlite3.IntegrityError as e:
+                return 409, {"error": str(e)}
+            except Exception as e:
+                traceback.print_exc()
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+        if allowed:
+            return 405, {"error": f"{method} not allowed on {path}"}
+        return 404, {"error": f"No route for {path}"}
+
+    def _write_response(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+
+
+def _int_param(query, name):
+    value = query.get(name)
+    if value in (None, ""):
+        return None
+    if not value.isdigit():
+        raise ValueError(f"{name} must be a whole number")
+    return int(value)
+
+
+def _object_body(body):
+    """The request body parsed as a JSON object"""
+    try:
+        data = json.loads(body or b"{}")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Request body is not valid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    return data
+
+
+# ------------------------------
+# RUN SERVER
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the student and course API over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4, help="database worker threads")
+    args = parser.parse_args()
+
+    config = load_config()
+    CourseModel.configure(**config.get("courses", {}))
+    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+
+    server = ApiServer(DB_FILE, config.get("database"), args.host, args.port, args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,38 @@
+import argparse
+import sys
+
+from db import Database, load_config
+from model import integrity
+
+
+def check_integrity(repair=None, reassign_to=None, batch_size=integrity.DEFAULT_BATCH_SIZE):
+    """Report, and optionally repair, students whose course no longer exists"""
+    db = Database(tuning=load_config().get("database"))
+    try:
+        def progress(done, total):
+            print(f"\rScanned students up to id {done} of {total}", end="", flush=True)
+
+        report = integrity.scan_orphans(db, repair, reassign_to, batch_size, progress)
+        print()
+        if not report["orphans"]:
+            print("No orphaned students found.")
+            return True
+        print(f"{report['orphans']} orphaned students:")
+        for course_id, count in sorted(report["by_course"].items()):
+            print(f"  missing course {course_id}: {count}")
+        if repair:
+            print(f"Repaired {report['repaired']} ({repair}).")
+        return bool(repair)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find students enrolled on deleted courses")
+    parser.add_argument("--repair", choices=integrity.REPAIR_MODES,
+                        help="clear their course, delete them, or reassign them")
+    parser.add_argument("--reassign-to", type=int, help="course id for --repair reassign")
+    parser.add_argument("--batch-size", type=int, default=integrity.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    success = check_integrity(args.repair, args.reassign_to, args.batch_size)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,55 @@
+import sqlite3
+from contextlib import nullcontext
+
+
+class BaseController:
+    """Shared plumbing for controllers: subclasses define create/update/delete"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def bulk(self, create=(), update=(), delete=()):
+        """Apply many writes in one transaction, each in its own savepoint.
+
+        A failing item is rolled back and reported without affecting the
+        rest. Returns {"create": [...], "update": [...], "delete": [...]}
+        with {"ok": True, "id": id} or {"ok": False, "error": message} per item.
+        Malformed input raises ValueError, naming the item, before anything
+        is written.
+        """
+        _check_items("create", create, dict, "an object")
+        _check_items("update", update, dict, "an object")
+        _check_items("delete", delete, int, "an id")
+        results = {"create": [], "update": [], "delete": []}
+        with self.db.transaction():
+            with self._bulk_create_context():
+                for data in create:
+                    results["create"].append(self._bulk_item(self.create, data))
+            for data in update:
+                results["update"].append(self._bulk_item(self.update, data.get("id"), data))
+            for row_id in delete:
+                results["delete"].append(self._bulk_item(self.delete, row_id))
+        return results
+
+    def _bulk_create_context(self):
+        """Wraps the creates of bulk(); subclasses batch per-row trigger work here"""
+        return nullcontext()
+
+    def _bulk_item(self, write, *args):
+        try:
+            with self.db.transaction():
+                result = write(*args)
+        except (ValueError, sqlite3.IntegrityError) as e:
+            return {"ok": False, "error": str(e)}
+        if result is None:
+            return {"ok": False, "error": "Not found"}
+        return {"ok": True, "id": result if isinstance(result, int) else result.id}
+
+
+def _check_items(name, items, kind, description):
+    if not isinstance(items, (list, tuple)):
+        raise ValueError(f"bulk {name} must be a list")
+    for index, item in enumerate(items):
+        # bool is an int subclass, but true is not an id
+        if not isinstance(item, kind) or isinstance(item, bool):
+            raise ValueError(f"bulk {name}[{index}] must be {description}, not {type(item).__name__}")
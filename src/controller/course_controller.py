@@ -1,6 +1,67 @@
-class CourseController:
-    def __init__(self, view, model):
-        self.view = view
-        self.model = model
-        # Missing: Course-specific business rules and validation
+from controller.base_controller import BaseController
+from model import keyset
+from model.course_model import CourseModel
 
+
+class CourseController(BaseController):
+    """Course use cases with their validation, independent of any UI.
+
+    Input is a dict of fields, output CourseRow records (or None when the
+    course does not exist); invalid input raises ValueError.
+    """
+
+    FIELDS = ("course_code", "course_name", "lecturer", "credits")
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.model = CourseModel(db)
+
+    # ------------------------------
+    # VALIDATION
+    # ------------------------------
+    def validate(self, data):
+        """Check a course dict and return the values add_course/update_course take"""
+        values = []
+        for field in self.FIELDS:
+            value = str(data.get(field) if data.get(field) is not None else "").strip()
+            if not value:
+                raise ValueError(f"{field.replace('_', ' ').capitalize()} is required.")
+            values.append(value)
+        if not values[3].isdigit():
+            raise ValueError(f"Credits must be a whole number, got {values[3]!r}.")
+        values[3] = int(values[3])
+        return values
+
+    # ------------------------------
+    # QUERIES
+    # ------------------------------
+    def list(self, after_id=None, limit=100, order_by="id", term="", after_value=keyset.UNSET):
+        return self.model.page(after_id, limit, order_by, term, after_value)
+
+    def search(self, term, limit=100):
+        rows = self.model.search_courses(term)
+        return {"rows": rows[:limit], "complete": len(rows) <= limit}
+
+    def get(self, course_id):
+        return self.model.get_course_by_id(course_id)
+
+    def stats(self):
+        return self.model.get_course_stats()
+
+    # ------------------------------
+    # WRITES
+    # ------------------------------
+    def create(self, data):
+        return self.model.add_course(*self.validate(data))
+
+    def update(self, course_id, data):
+        """Update a course; fields left out of data keep their current value"""
+        current = self.model.get_course_by_id(course_id)
+        if current is None:
+            return None
+        merged = dict(current._asdict(), **data)
+        return self.model.update_course(course_id, *self.validate(merged))
+
+    def delete(self, course_id, policy=None, reassign_to=None):
+        """Delete a course, handling enrolled students by policy (see CourseModel.delete_course)"""
+        return self.model.delete_course(course_id, policy, reassign_to)
@@ -1,6 +1,103 @@
-class StudentController:
-    def __init__(self, view, model):
-        self.view = view
-        self.model = model
-        # Missing: Business logic methods, validation, workflow control
+import re
 
+from controller.base_controller import BaseController
+from model import keyset
+from model.course_model import CourseModel
+from model.student_model import StudentModel
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class StudentController(BaseController):
+    """Student use cases with their validation, independent of any UI.
+
+    Takes and returns plain values: input is a dict of fields, output is
+    StudentRow records (or None when the student does not exist). Invalid
+    input raises ValueError with a message fit to show the user. The Tk
+    views and the HTTP API both go through here.
+    """
+
+    FIELDS = ("student_no", "first_name", "last_name", "email")
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.model = StudentModel(db)
+        self.courses = CourseModel.catalog_for(db)
+
+    # ------------------------------
+    # VALIDATION
+    # ------------------------------
+    def validate(self, data):
+        """Check a student dict and return the values add_student/update_student take.
+
+        The course may be given as "course" (its name), "course_code" or "course_id".
+        """
+        return self.validate_fields(data) + [self.resolve_course(data)]
+
+    def validate_fields(self, data):
+        """Check and strip the FIELDS of a student dict, everything but the course"""
+        values = []
+        for field in self.FIELDS:
+            value = str(data.get(field) or "").strip()
+            if not value:
+                raise ValueError(f"{field.replace('_', ' ').capitalize()} is required.")
+            values.append(value)
+        if not EMAIL_PATTERN.match(values[3]):
+            raise ValueError(f"{values[3]!r} is not a valid email address.")
+        return values
+
+    def resolve_course(self, data):
+        if data.get("course_id") not in (None, ""):
+            course_id = data["course_id"]
+            if not isinstance(course_id, int) or self.courses.code_for_id(course_id) is None:
+                raise ValueError(f"Course {course_id!r} not found.")
+            return course_id
+        if data.get("course_code"):
+            course_id = self.courses.id_for_code(str(data["course_code"]).strip())
+        elif data.get("course"):
+            course_id = self.courses.id_for_name(str(data["course"]).strip())
+        else:
+            raise ValueError("Course is required.")
+        if course_id is None:
+            raise ValueError("Selected course not found.")
+        return course_id
+
+    # ------------------------------
+    # QUERIES
+    # ------------------------------
+    def list(self, after_id=None, limit=100, order_by="id", term="", after_value=keyset.UNSET):
+        return self.model.page(after_id, limit, order_by, term, after_value)
+
+    def search(self, term, limit=100):
+        return self.model.search_rows(term, limit)
+
+    def get(self, student_id):
+        return self.model.get_student(student_id)
+
+    # ------------------------------
+    # WRITES
+    # ------------------------------
+    def create(self, data):
+        return self.model.add_student(*self.validate(data))
+
+    def _bulk_create_context(self):
+        return self.model.deferred_insert_triggers()
+
+    def update(self, student_id, data):
+        """Update a student; fields left out of data keep their current value.
+
+        A course left out (or blank, as from a form with none selected)
+        keeps the stored course_id as it is, even if it is NULL or its
+        course no longer exists.
+        """
+        current = self.model.get_student(student_id)
+        if current is None:
+            return None
+        merged = {field: current[field] for field in self.FIELDS}
+        merged.update(data)
+        if any(data.get(key) not in (None, "") for key in ("course", "course_code", "course_id")):
+            return self.model.update_student(student_id, *self.validate(merged))
+        return self.model.update_student(student_id, *self.validate_fields(merged))
+
+    def delete(self, student_id):
+        return self.model.delete_student(student_id)
@@ -1,59 +1,559 @@
+import json
 import sqlite3
 import os  # This import is declared but not used in the code
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
 # DB_FILE = "database.db"  # Commented out code - dead code
 
+from profiler import profiler
+from query_registry import AD_HOC, Query, registry
+
 
 DATA_DIR = "data"
 DB_FILE = os.path.join(DATA_DIR, "database.db")
 print (f"Database file path: {DB_FILE}")
+CONFIG_FILE = "config.json"
+
+
+def load_config(path=CONFIG_FILE):
+    """The parsed config.json, or an empty dict if there is none"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ------------------------------
+# SCHEMA MIGRATIONS
+# ------------------------------
+# Each migration upgrades the schema by one version; PRAGMA user_version
+# records the last one applied so existing databases only run what is new.
+
+def _create_base_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS courses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_code TEXT UNIQUE,
+            course_name TEXT,
+            lecturer TEXT,
+            credits INTEGER
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_no TEXT UNIQUE,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            phone TEXT,
+            course_id INTEGER,
+            FOREIGN KEY(course_id) REFERENCES courses(id)
+        )
+    """)
+    # Tables created by older StudentModel.create_table had no phone column
+    columns = [r[1] for r in conn.execute("PRAGMA table_info(students)")]
+    if "phone" not in columns:
+        conn.execute("ALTER TABLE students ADD COLUMN phone TEXT")
+
+
+def _create_lookup_indexes(conn):
+    # students.course_id backs every course join and course-deletion check;
+    # courses.course_name is looked up by exact name on every student write
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_students_course_id ON students(course_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_courses_course_name ON courses(course_name)")
+
+
+# Schema version whose migration creates (and fills) the full-text index
+SEARCH_INDEX_VERSION = 3
+
+
+def _create_search_index(conn):
+    from model import search_index
+    search_index.ensure_search_index(conn)
+
+
+def _create_audit_events(conn):
+    # Append-only trail of writes, recorded in the same transaction as the write
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS audit_events (
+            id INTEGER PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            entity TEXT NOT NULL,
+            action TEXT NOT NULL,
+            entity_id INTEGER,
+            payload TEXT NOT NULL DEFAULT '{}'
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_created_at ON audit_events(created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_entity ON audit_events(entity, entity_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_action ON audit_events(action)")
+    for event in ("UPDATE", "DELETE"):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS audit_events_no_{event.lower()} BEFORE {event} ON audit_events BEGIN
+                SELECT RAISE(ABORT, 'audit_events is append-only');
+            END
+        """)
+
+
+def _create_course_stats(conn):
+    from model import course_stats
+    course_stats.ensure_course_stats(conn)
+
+
+MIGRATIONS = [
+    (1, "base tables", _create_base_tables),
+    (2, "lookup indexes", _create_lookup_indexes),
+    (SEARCH_INDEX_VERSION, "full-text search index", _create_search_index),
+    (4, "audit events", _create_audit_events),
+    (5, "course statistics", _create_course_stats),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate(conn):
+    """Apply every migration newer than the database's user_version.
+
+    Each migration runs in its own transaction together with the version
+    bump, so an interrupted upgrade resumes from the last completed step.
+    Returns the schema version the database was at before migrating.
+    """
+    start_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for version, description, apply in MIGRATIONS:
+        if version <= start_version:
+            continue
+        try:
+            conn.execute("BEGIN")
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return start_version
+
+
+# ------------------------------
+# CONNECTION TUNING
+# ------------------------------
+# Applied to every connection at open time; override per key through the
+# "database" section of config.json.
+DEFAULT_TUNING = {
+    "journal_mode": "WAL",        # readers no longer block the writer
+    "synchronous": "NORMAL",      # fsync at checkpoints instead of every commit (safe under WAL)
+    "mmap_size": 268435456,       # 256 MB of the file read through memory mapping
+    "cache_size": -65536,         # negative = KiB, so 64 MB page cache
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,         # ms to wait on a locked database before failing
+    "foreign_keys": "ON",         # enforce students.course_id -> courses.id (off by default in SQLite)
+}
+
+TUNING_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+    "foreign_keys": {"ON", "OFF"},
+}
+
+# SQLite reports these pragmas as numbers
+PRAGMA_NAMES = {
+    "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+    "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+    "foreign_keys": {0: "OFF", 1: "ON"},
+}
+
+
+def tuning_pragmas(tuning):
+    """Validate a tuning profile and return the PRAGMA statements applying it"""
+    statements = []
+    for name, value in tuning.items():
+        if name in TUNING_CHOICES:
+            value = str(value).upper()
+            if value not in TUNING_CHOICES[name]:
+                raise ValueError(f"Invalid {name} setting: {value!r}")
+        elif name in ("mmap_size", "cache_size", "busy_timeout"):
+            value = int(value)
+        else:
+            raise ValueError(f"Unknown database tuning setting: {name!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def connect_read_only(db_file, tuning, check_same_thread=True):
+    """Open a read-only connection to db_file with the tuning profile applied"""
+    if db_file == ":memory:":
+        raise ValueError("An in-memory database cannot be opened from another connection")
+    uri = Path(db_file).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread,
+                           cached_statements=registry.statement_cache_size())
+    # journal_mode is a property of the file and cannot be set read-only
+    reader_tuning = {k: v for k, v in tuning.items() if k != "journal_mode"}
+    for statement in tuning_pragmas(reader_tuning):
+        conn.execute(statement)
+    return conn
+
+
+def _sql(query):
+    return query.sql if isinstance(query, Query) else query
+
+
+def _record(query, started, rows):
+    name = query.name if isinstance(query, Query) else AD_HOC
+    seconds = time.perf_counter() - started
+    registry.record(name, seconds, rows)
+    if profiler.enabled:
+        profiler.record_sql(name, started, seconds, rows)
 
 
 class Database:
-    def __init__(self):
-        self.conn = sqlite3.connect(DB_FILE)
+    def __init__(self, db_file=DB_FILE, tuning=None, read_only=False, check_same_thread=True):
+        """Open db_file and bring its schema up to date.
+
+        read_only opens it without write access and without migrating (see
+        ConnectionPool). check_same_thread=False lets the connection be
+        handed between threads, one at a time.
+        """
+        self.db_file = db_file
+        self.tuning = dict(DEFAULT_TUNING, **(tuning or {}))
+        self.read_only = read_only
+        if read_only:
+            self.conn = connect_read_only(db_file, self.tuning, check_same_thread)
+        else:
+            self.conn = sqlite3.connect(db_file, check_same_thread=check_same_thread,
+                                        cached_statements=registry.statement_cache_size())
+            for statement in tuning_pragmas(self.tuning):
+                self.conn.execute(statement)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
-        self.setup()
+        self.transaction_depth = 0
+        self.commit_callbacks = []
+        self.models = {}
+        profiler.attach(self)
+        self.migrated_from = None
+        if not read_only:
+            self.setup()
 
     def setup(self):
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS courses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                course_code TEXT UNIQUE,
-                course_name TEXT,
-                lecturer TEXT,
-                credits INTEGER
-            )
-        """)
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_no TEXT UNIQUE,
-                first_name TEXT NOT NULL,
-                last_name TEXT NOT NULL,
-                email TEXT NOT NULL UNIQUE,
-                phone TEXT,
-                course_id INTEGER,
-                FOREIGN KEY(course_id) REFERENCES courses(id)
-            )
-        """)
-        self.conn.commit()
+        # Schema version found on opening, before any migration ran
+        self.migrated_from = migrate(self.conn)
+
+    def model(self, model_class):
+        """The model_class(self) instance for this connection, built on first use"""
+        model = self.models.get(model_class)
+        if model is None:
+            model = self.models[model_class] = model_class(self)
+        return model
+
+    def open_reader(self):
+        """Open an extra read-only connection to the same file, e.g. for a worker thread.
+
+        The connection belongs to the thread that calls this; the caller closes it.
+        """
+        return connect_read_only(self.db_file, self.tuning)
+
+    def settings(self):
+        """Report the pragma values actually in effect on this connection"""
+        active = {}
+        for name in DEFAULT_TUNING:
+            row = self.conn.execute(f"PRAGMA {name}").fetchone()
+            value = row[0] if row else None  # mmap_size reports nothing for :memory:
+            if name in PRAGMA_NAMES and value in PRAGMA_NAMES[name]:
+                value = PRAGMA_NAMES[name][value]
+            active[name] = value.upper() if isinstance(value, str) else value
+        return active
+
+    # ------------------------------
+    # STATEMENTS
+    # ------------------------------
+    # query is a declared Query (see query_registry) or plain SQL text; each
+    # execution is timed and recorded in the registry under the query's name.
 
     def fetchall(self, query, params=()):
-        self.cursor.execute(query, params)
-        return self.cursor.fetchall()
+        started = time.perf_counter()
+        rows = self.cursor.execute(_sql(query), params).fetchall()
+        _record(query, started, len(rows))
+        return rows
 
     def fetchone(self, query, params=()):
-        self.cursor.execute(query, params)
-        return self.cursor.fetchone()
+        started = time.perf_counter()
+        row = self.cursor.execute(_sql(query), params).fetchone()
+        _record(query, started, row is not None)
+        return row
+
+    def fetch_records(self, record, query, params=()):
+        """fetchall() building tuple-based record rows (see model.records) instead of sqlite3.Row"""
+        started = time.perf_counter()
+        cursor = self.conn.cursor()
+        cursor.row_factory = None  # plain tuples, converted in C below
+        rows = cursor.execute(_sql(query), params).fetchall()
+        _record(query, started, len(rows))
+        return list(map(partial(tuple.__new__, record), rows))
+
+    def fetch_record(self, record, query, params=()):
+        rows = self.fetch_records(record, query, params)
+        return rows[0] if rows else None
 
     def execute(self, query, params=()):
-        self.cursor.execute(query, params)
-        self.conn.commit()
+        started = time.perf_counter()
+        self.cursor.execute(_sql(query), params)
+        _record(query, started, max(self.cursor.rowcount, 0))
+        if not self.transaction_depth:
+            self.conn.commit()
+        return self.cursor
+
+    def executemany(self, query, seq_of_params):
+        started = time.perf_counter()
+        self.cursor.executemany(_sql(query), seq_of_params)
+        _record(query, started, max(self.cursor.rowcount, 0))
+        if not self.transaction_depth:
+            self.conn.commit()
+
+    # ------------------------------
+    # TRANSACTIONS
+    # ------------------------------
+    @contextmanager
+    def transaction(self):
+        """Group statements into one commit: ``with db.transaction(): ...``
+
+        execute()/executemany() inside the block do not commit on their own.
+        Nested blocks become savepoints, so an inner failure only undoes the
+        inner block while the outer one decides whether to commit.
+        """
+        if self.transaction_depth == 0:
+            # IMMEDIATE takes the write lock up front instead of failing mid-transaction
+            self.conn.execute("BEGIN IMMEDIATE")
+            savepoint = None
+        else:
+            # Callbacks registered inside a savepoint are dropped if it rolls back
+            mark = len(self.commit_callbacks)
+            savepoint = f"sp_{self.transaction_depth}"
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+        self.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth -= 1
+            if savepoint is None:
+                self.conn.rollback()
+                self.commit_callbacks.clear()
+            else:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                self.conn.execute(f"RELEASE {savepoint}")
+                del self.commit_callbacks[mark:]
+            raise
+        self.transaction_depth -= 1
+        if savepoint is None:
+            self.conn.commit()
+            self._run_commit_callbacks()
+        else:
+            self.conn.execute(f"RELEASE {savepoint}")
+
+    def after_commit(self, callback):
+        """Call callback() once the current transaction commits, or now outside one.
+
+        Used to announce changes only when they are durable: a rolled back
+        transaction or savepoint discards the callbacks registered in it.
+        """
+        if self.transaction_depth:
+            self.commit_callbacks.append(callback)
+        else:
+            callback()
+
+    def _run_commit_callbacks(self):
+        callbacks, self.commit_callbacks = self.commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    @property
+    def in_transaction(self):
+        return self.transaction_depth > 0
 
     def close(self):
         # Close the DB connection
         self.conn.close()
 
 
+# ------------------------------
+# CONNECTION POOL
+# ------------------------------
+class ConnectionPool:
+    """One writer and a fixed set of read-only Database connections to one file.
+
+    Under WAL readers never block the writer or each other, so reads can
+    run in parallel on the reader connections while every write goes
+    through the single writer, which SQLite would serialize anyway. Threads
+    check a connection out, use it alone and check it back in:
+
+        with pool.connection() as db: ...            # a reader
+        with pool.connection(write=True) as db: ...  # the writer
+
+    Each connection has its own cursor and is set up with the tuning
+    profile when opened. One idle longer than HEALTH_CHECK_AFTER is pinged
+    on checkout and replaced if it no longer works. metrics() reports
+    usage and waiting, for sizing the pool.
+    """
+
+    HEALTH_CHECK_AFTER = 30  # seconds idle before a connection is pinged on checkout
+
+    def __init__(self, db_file=DB_FILE, tuning=None, readers=4, timeout=30):
+        if db_file == ":memory:":
+            raise ValueError("An in-memory database cannot be shared by a pool")
+        if readers < 1:
+            raise ValueError("A pool needs at least one reader")
+        self.db_file = db_file
+        self.tuning = tuning
+        self.timeout = timeout
+        self.available = threading.Condition()
+        self.closed = False
+        # The writer is opened first: it creates the file and migrates the schema
+        self.writer = self._open(write=True)
+        self.readers = [self._open(write=False) for _ in range(readers)]
+        self.idle_writer = self.writer
+        self.idle_readers = list(self.readers)  # used as a stack, so warm connections are reused first
+        self.last_used = {db: time.monotonic() for db in self.readers + [self.writer]}
+        self.stats = {"checkouts": 0, "writes": 0, "waits": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0,
+                      "timeouts": 0, "health_checks": 0, "replaced": 0, "peak_in_use": 0}
+
+    def _open(self, write):
+        return Database(self.db_file, self.tuning, read_only=not write, check_same_thread=False)
+
+    # ------------------------------
+    # CHECKOUT / CHECKIN
+    # ------------------------------
+    def checkout(self, write=False, timeout=None):
+        """Take a connection for this thread's exclusive use until checkin(db).
+
+        Waits up to timeout (default: the pool's) for one to come free and
+        raises TimeoutError if none does.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        with self.available:
+            waited = False
+            while not self.closed and not (self.idle_writer if write else self.idle_readers):
+                waited = True
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0 or not self.available.wait(remaining):
+                    if not (self.idle_writer if write else self.idle_readers):
+                        self.stats["timeouts"] += 1
+                        raise TimeoutError(f"No {'writer' if write else 'reader'} connection free "
+                                           f"after {timeout} seconds")
+            if self.closed:
+                raise ValueError("Connection pool is closed")
+            if write:
+                db, self.idle_writer = self.idle_writer, None
+            else:
+                db = self.idle_readers.pop()
+            self.stats["checkouts"] += 1
+            self.stats["writes"] += write
+            if waited:
+                wait = time.monotonic() - started
+                self.stats["waits"] += 1
+                self.stats["wait_seconds"] += wait
+                self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], wait)
+            self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self.in_use())
+            stale = time.monotonic() - self.last_used[db] > self.HEALTH_CHECK_AFTER
+        if stale:
+            db = self._ensure_healthy(db)
+        return db
+
+    def checkin(self, db):
+        """Return a connection, undoing anything the borrower left behind"""
+        try:
+            db.conn.set_progress_handler(None, 0)
+            if db.conn.in_transaction:
+                db.conn.rollback()
+            db.transaction_depth = 0
+            db.commit_callbacks.clear()
+        except sqlite3.Error:
+            pass  # a broken connection is replaced on its next health check
+        with self.available:
+            self.last_used[db] = time.monotonic()
+            if self.closed:
+                db.close()
+            elif db.read_only:
+                self.idle_readers.append(db)
+            else:
+                self.idle_writer = db
+            self.available.notify_all()
+
+    @contextmanager
+    def connection(self, write=False, timeout=None):
+        db = self.checkout(write, timeout)
+        try:
+            yield db
+        finally:
+            self.checkin(db)
+
+    # ------------------------------
+    # HEALTH AND METRICS
+    # ------------------------------
+    def _healthy(self, db):
+        try:
+            db.conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _ensure_healthy(self, db):
+        """db if it still answers, otherwise a fresh connection in its place"""
+        with self.available:
+            self.stats["health_checks"] += 1
+        if self._healthy(db):
+            return db
+        replacement = self._open(write=not db.read_only)
+        with self.available:
+            self.stats["replaced"] += 1
+            del self.last_used[db]
+            self.last_used[replacement] = time.monotonic()
+            if db.read_only:
+                self.readers[self.readers.index(db)] = replacement
+            else:
+                self.writer = replacement
+        try:
+            db.close()
+        except sqlite3.Error:
+            pass
+        return replacement
+
+    def check_health(self):
+        """Ping every idle connection now, replacing any that fail; returns how many were replaced"""
+        replaced = 0
+        idle = []
+        with self.available:
+            if self.idle_writer is not None:
+                idle.append(self.idle_writer)
+                self.idle_writer = None
+            idle.extend(self.idle_readers)
+            self.idle_readers = []
+        for db in idle:
+            healthy = self._ensure_healthy(db)
+            replaced += healthy is not db
+            self.checkin(healthy)
+        return replaced
+
+    def in_use(self):
+        return (self.idle_writer is None) + len(self.readers) - len(self.idle_readers)
+
+    def metrics(self):
+        """Snapshot of pool size, current use and cumulative counters"""
+        with self.available:
+            return dict(self.stats, readers=len(self.readers), in_use=self.in_use(),
+                        writer_in_use=self.idle_writer is None,
+                        readers_in_use=len(self.readers) - len(self.idle_readers))
+
+    def close(self):
+        """Close idle connections now and the rest as they are checked in"""
+        with self.available:
+            self.closed = True
+            idle = ([self.idle_writer] if self.idle_writer is not None else []) + self.idle_readers
+            self.idle_writer, self.idle_readers = None, []
+            self.available.notify_all()
+        for db in idle:
+            db.close()
+
+
 
@@ -0,0 +1,125 @@
+import argparse
+import os
+import random
+import sys
+from itertools import accumulate
+
+from db import Database
+from model import course_stats, search_index
+
+# Dataset presets: (students, courses)
+SIZES = {
+    "10k": (10_000, 500),
+    "100k": (100_000, 2_000),
+    "1m": (1_000_000, 5_000),
+}
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 50_000
+
+FIRST_NAMES = (
+    "Olivia", "Liam", "Amelia", "Noah", "Isla", "Oliver", "Ava", "Jack", "Mia", "William",
+    "Charlotte", "Leo", "Grace", "Lucas", "Chloe", "Thomas", "Zoe", "Henry", "Ruby", "James",
+    "Aisha", "Mohammed", "Priya", "Arjun", "Mei", "Wei", "Yuki", "Hiroshi", "Sofia", "Mateo",
+    "Chidi", "Amara", "Tatenda", "Nyasha", "Fatima", "Omar", "Elena", "Ivan", "Ana", "Diego",
+)
+LAST_NAMES = (
+    "Smith", "Jones", "Williams", "Brown", "Wilson", "Taylor", "Johnson", "White", "Martin", "Anderson",
+    "Thompson", "Nguyen", "Thomas", "Walker", "Harris", "Lee", "Ryan", "Robinson", "Kelly", "King",
+    "Patel", "Singh", "Chen", "Wang", "Tanaka", "Garcia", "Rodriguez", "Okafor", "Moyo", "Sikweche",
+    "Ivanova", "Kowalski", "Murphy", "O'Brien", "Rossi", "Muller", "Silva", "Haddad", "Kim", "Park",
+)
+SUBJECTS = (
+    ("ISYS", "Information Systems"), ("COMP", "Computer Science"), ("MATH", "Mathematics"),
+    ("STAT", "Statistics"), ("ACCT", "Accounting"), ("ECON", "Economics"), ("MKTG", "Marketing"),
+    ("MGMT", "Management"), ("PSYC", "Psychology"), ("ENGL", "English"), ("HIST", "History"),
+    ("BIOL", "Biology"), ("CHEM", "Chemistry"), ("PHYS", "Physics"), ("LAWS", "Law"), ("NURS", "Nursing"),
+)
+TOPICS = (
+    "Foundations", "Principles", "Methods", "Design", "Analysis", "Practice", "Theory", "Systems",
+    "Applications", "Ethics", "Research", "Project", "Advanced Topics", "Data", "Modelling",
+)
+CREDITS = (3, 3, 3, 6, 6, 12, 25)
+EMAIL_DOMAINS = ("student.example.edu", "example.edu", "mail.example.com")
+
+
+def generate_courses(count, rng):
+    """(course_code, course_name, lecturer, credits) rows with unique codes and names"""
+    for n in range(1, count + 1):
+        prefix, subject = SUBJECTS[n % len(SUBJECTS)]
+        code = f"{prefix}{n:04d}"
+        name = f"{subject} {rng.choice(TOPICS)} {n}"
+        lecturer = f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        yield code, name, lecturer, rng.choice(CREDITS)
+
+
+def generate_students(count, course_ids, rng, start=1):
+    """(student_no, first_name, last_name, email, phone, course_id) rows with unique numbers and emails.
+
+    Enrolment is skewed like a real catalogue: a few large courses take
+    most students and the long tail has only a handful each.
+    """
+    cumulative = list(accumulate(1 / rank for rank in range(1, len(course_ids) + 1)))
+    for n in range(start, start + count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = f"{first}.{last}.{n}@{rng.choice(EMAIL_DOMAINS)}".lower().replace("'", "")
+        phone = f"04{rng.randrange(10**8):08d}" if rng.random() < 0.8 else None
+        yield f"S{n:07d}", first, last, email, phone, rng.choices(course_ids, cum_weights=cumulative)[0]
+
+
+def generate(db, students, courses, seed=DEFAULT_SEED, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Fill an empty database with a seeded dataset; the same seed gives the same rows.
+
+    Students are inserted in batches of batch_size, each one transaction
+    with full-text indexing and enrolment counts deferred to one statement
+    per batch.
+    progress(done, total) is called after each batch.
+    """
+    if db.fetchone("SELECT COUNT(*) FROM students")[0] or db.fetchone("SELECT COUNT(*) FROM courses")[0]:
+        raise ValueError("generate needs an empty database")
+    rng = random.Random(seed)
+    fts_enabled = search_index.is_available(db.conn)
+    with db.transaction():
+        db.executemany("INSERT INTO courses (course_code, course_name, lecturer, credits) VALUES (?, ?, ?, ?)",
+                       generate_courses(courses, rng))
+    course_ids = [row[0] for row in db.fetchall("SELECT id FROM courses ORDER BY id")]
+
+    rows = generate_students(students, course_ids, rng)
+    done = 0
+    while done < students:
+        batch = [next(rows) for _ in range(min(batch_size, students - done))]
+        with db.transaction(), course_stats.deferred_student_counts(db.conn):
+            if fts_enabled:
+                with search_index.deferred_student_indexing(db.conn):
+                    _insert_students(db, batch)
+            else:
+                _insert_students(db, batch)
+        done += len(batch)
+        if progress:
+            progress(done, students)
+    return {"students": students, "courses": courses, "seed": seed}
+
+
+def _insert_students(db, batch):
+    db.executemany("INSERT INTO students (student_no, first_name, last_name, email, phone, course_id) "
+                   "VALUES (?, ?, ?, ?, ?, ?)", batch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create a database filled with a seeded synthetic dataset")
+    parser.add_argument("db_file", help="database to create; must not exist yet")
+    parser.add_argument("--size", choices=SIZES, default="10k", help="students/courses preset")
+    parser.add_argument("--students", type=int, help="override the preset's student count")
+    parser.add_argument("--courses", type=int, help="override the preset's course count")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db_file):
+        sys.exit(f"{args.db_file} already exists")
+    students, courses = SIZES[args.size]
+    db = Database(args.db_file)
+    try:
+        generate(db, args.students or students, args.courses or courses, args.seed,
+                 progress=lambda done, total: print(f"\rInserted {done} of {total} students", end="", flush=True))
+        print()
+    finally:
+        db.close()
@@ -1,14 +1,23 @@
+import time
+
+# Cold start is measured from here, before the heavier imports below
+START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
-from db import Database
+from db import CONFIG_FILE, ConnectionPool, load_config
+from query_executor import QueryExecutor
+from view.change_dispatcher import ChangeDispatcher
+from model import audit_log
+from model.course_model import CourseModel
+from profiler import profiler
 import os
-import json
 
 from view.student_view import StudentView
 from view.course_view import CourseView
+from view.performance_window import PerformanceWindow
 
-CONFIG_FILE = "config.json"
 #DB_FILE = "database.db"
 
 
@@ -16,14 +25,33 @@ CONFIG_FILE = "config.json"
 # APPLICATION
 # ------------------------------
 class App(tk.Tk):
+    # Tabs in notebook order; each view is built the first time its tab is selected
+    TAB_VIEWS = (("Students", StudentView), ("Courses", CourseView))
+
     def __init__(self):
         super().__init__()
         self.title("Student & Course Management System")
         self.geometry("1150x750")
 
-        self.db = Database()
         self.load_config()
-        
+        audit_log.configure(**self.config.get("audit", {}))
+        CourseModel.configure(**self.config.get("courses", {}))
+        # Opt-in; configured before the pool so its connections are traced from the start
+        profiler.configure(**self.config.get("profiling", {}))
+        # One writer plus read-only connections, checked out by whichever thread needs one
+        pool_settings = self.config.get("pool", {})
+        self.pool = ConnectionPool(tuning=self.config.get("database"), readers=pool_settings.get("readers", 4),
+                                   timeout=pool_settings.get("timeout", 30))
+        # Views run their queries on this worker so the window never blocks on SQLite
+        self.executor = QueryExecutor(self, pool=self.pool)
+        # One feed of committed writes shared by every tab
+        self.changes = ChangeDispatcher(self)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Milliseconds from START to each startup milestone, see report_startup
+        self.startup_times = {}
+        self.loading_tabs = []
+        self.executor.add_busy_listener(self.on_executor_busy)
+
         self.style = ttk.Style()
         self.style.theme_use("clam")
 
@@ -31,36 +59,74 @@ class App(tk.Tk):
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True)
 
-        self.student_tab = StudentView(self.notebook, self.db, CONFIG_FILE)
-        self.course_tab = CourseView(self.notebook, self.db, CONFIG_FILE)
+        # Empty frames hold each tab's place until its view is built
+        self.tabs = {}
+        self.tab_frames = []
+        for name, view_class in self.TAB_VIEWS:
+            frame = tk.Frame(self.notebook)
+            self.notebook.add(frame, text=name)
+            self.tab_frames.append(frame)
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.build_tab(self.notebook.index("current")))
+        self.after_idle(self.on_window_shown)
+        # Performance panel: latest operations split into SQL, Python and Tk time
+        self.bind_all("<F12>", lambda e: PerformanceWindow(self))
 
-        self.notebook.add(self.student_tab, text="Students")
-        self.notebook.add(self.course_tab, text="Courses")
+    # ------------------------------
+    # LAZY TABS
+    # ------------------------------
+    def on_window_shown(self):
+        self.update_idletasks()
+        self.report_startup("window shown")
+        self.build_tab(self.notebook.index("current"))
+
+    def build_tab(self, index):
+        name, view_class = self.TAB_VIEWS[index]
+        if name in self.tabs:
+            return
+        started = time.perf_counter()
+        view = view_class(self.tab_frames[index], self.pool, CONFIG_FILE, self.executor, self.changes)
+        view.pack(fill="both", expand=True)
+        view.theme_button.config(command=self.toggle_theme)
+        self.tabs[name] = view
+        self.report_startup(f"{name} tab built", started)
+        # Queued behind the view's own load_after_paint, so its queries are already pending
+        self.after_idle(self.loading_tabs.append, name)
 
-        # Sync theme toggle buttons
-        self.sync_theme_buttons()
+    def on_executor_busy(self, busy):
+        if not busy:
+            for name in self.loading_tabs:
+                self.report_startup(f"{name} data loaded")
+            self.loading_tabs.clear()
+
+    def report_startup(self, milestone, started=None):
+        """Record and print how long after START a milestone was reached"""
+        elapsed = (time.perf_counter() - START) * 1000
+        self.startup_times[milestone] = elapsed
+        took = f" (took {(time.perf_counter() - started) * 1000:.0f} ms)" if started else ""
+        print(f"Startup: {milestone} at {elapsed:.0f} ms{took}")
 
     # ------------------------------
     # CONFIG
     # ------------------------------
     def load_config(self):
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                self.config = json.load(f)
-        else:
-            self.config = {"theme": "light"}
+        self.config = load_config() or {"theme": "light"}
+
+    def on_close(self):
+        self.executor.shutdown()
+        self.changes.close()
+        # Entries still queued are written before the process exits
+        audit_log.close_all()
+        self.pool.close()
+        profiler.close()
+        self.destroy()
 
     # ------------------------------
     # THEME SYNC
     # ------------------------------
-    def sync_theme_buttons(self):
-        def theme_callback():
-            self.student_tab.toggle_theme()
-            self.course_tab.toggle_theme()
-
-        # Replace both buttons commands
-        self.student_tab.theme_button.config(command=theme_callback)
-        self.course_tab.theme_button.config(command=theme_callback)
+    def toggle_theme(self):
+        # Tabs not built yet pick up the saved theme when they are
+        for view in self.tabs.values():
+            view.toggle_theme()
 
 
 # ------------------------------
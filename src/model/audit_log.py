@@ -0,0 +1,218 @@
+import atexit
+import datetime
+import gzip
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+import traceback
+
+# Defaults, overridable from the "audit" section of config.json through configure()
+DEFAULT_SETTINGS = {
+    "max_queue": 10000,        # entries waiting to be written before log() blocks
+    "flush_interval": 0.5,     # seconds an entry may wait to be grouped with others
+    "flush_lines": 1000,       # write as soon as this many entries are waiting
+    "max_bytes": 5 * 1024 * 1024,  # rotate once the file reaches this size (0 = never)
+    "max_age": 0,              # rotate once the file is this many seconds old (0 = never)
+    "backups": 5,              # rotated files kept as name.1 ... name.N
+    "compress": True,          # gzip rotated files
+}
+
+# Longest flush() and close() wait for the writer, so a stuck disk cannot hang the app on exit
+WAIT_TIMEOUT = 10.0
+
+_settings = dict(DEFAULT_SETTINGS)
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+class AuditWriter:
+    """Appends audit lines to a file from a background thread.
+
+    log() only queues the entry, so callers never wait on the disk. The
+    writer keeps the file open and writes whatever has queued up in one go,
+    at most flush_interval after the first waiting entry or as soon as
+    flush_lines are waiting. The queue is bounded: if the disk cannot keep
+    up, log() blocks rather than dropping entries.
+
+    The file is rotated by size and/or age into name.1 ... name.N
+    (gzipped when compress is set), oldest dropped. A failed write or
+    rotation is reported on stderr and kept in last_error; those entries
+    are lost, and the writer reopens the file for the next ones.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path, max_queue=10000, flush_interval=0.5, flush_lines=1000,
+                 max_bytes=0, max_age=0, backups=5, compress=True):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_lines = flush_lines
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backups = backups
+        self.compress = compress
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.closed = False
+        self.file = None
+        self.opened_at = None
+        self.last_error = None
+        self.thread = threading.Thread(target=self._run, name=f"audit-{os.path.basename(path)}", daemon=True)
+        self.thread.start()
+
+    # ------------------------------
+    # CALLER SIDE
+    # ------------------------------
+    def log(self, action, data):
+        """Queue one entry; the timestamp is taken now, formatting happens on the writer"""
+        if self.closed:
+            raise ValueError("Audit log is closed")
+        self.queue.put((time.time(), action, data))
+
+    def flush(self, timeout=WAIT_TIMEOUT):
+        """Block until every entry queued so far is written; False if that took longer than timeout"""
+        if self.closed or not self.thread.is_alive():
+            return False
+        done = threading.Event()
+        self.queue.put(done, timeout=timeout)
+        return done.wait(timeout)
+
+    def close(self, timeout=WAIT_TIMEOUT):
+        """Write everything still queued, then stop the writer and close the file.
+
+        Gives up after timeout; the writer is a daemon thread, so it cannot
+        keep the process alive.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self.thread.is_alive():
+            self.queue.put(self._STOP, timeout=timeout)
+            self.thread.join(timeout)
+
+    # ------------------------------
+    # WRITER THREAD
+    # ------------------------------
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            # Group commit: gather what arrives shortly after, unless a flush is waiting
+            while len(batch) < self.flush_lines and isinstance(batch[-1], tuple):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            entries = [item for item in batch if isinstance(item, tuple)]
+            try:
+                if entries:
+                    self._write("".join(self._format(entry) for entry in entries))
+            except Exception as e:
+                self._report(e, len(entries))
+            finally:
+                # Waiting flushes are released even when the write failed
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+            if batch[-1] is self._STOP:
+                if self.file is not None:
+                    self.file.close()
+                return
+
+    def _report(self, error, count):
+        self.last_error = error
+        print(f"Audit log {self.path}: {count} entries could not be written", file=sys.stderr)
+        traceback.print_exception(type(error), error, error.__traceback__)
+        # Start from a fresh handle next time; the old one may be closed or broken
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+
+    def _format(self, entry):
+        timestamp, action, data = entry
+        when = datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{when} | {action} | {json.dumps(data, ensure_ascii=False, default=str)}\n"
+
+    def _write(self, text):
+        if self.file is None:
+            self._open()
+        elif self._due_for_rotation():
+            self._rotate()
+        self.file.write(text)
+        self.file.flush()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8")
+        # An existing file keeps its age across restarts
+        self.opened_at = os.path.getmtime(self.path) if self.file.tell() else time.time()
+
+    def _due_for_rotation(self):
+        size = self.file.tell()
+        if not size:
+            return False
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        return bool(self.max_age) and time.time() - self.opened_at >= self.max_age
+
+    def _rotate(self):
+        self.file.close()
+        suffix = ".gz" if self.compress else ""
+        if self.backups:
+            for i in range(self.backups - 1, 0, -1):
+                source = f"{self.path}.{i}{suffix}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}{suffix}")
+            if self.compress:
+                with open(self.path, "rb") as src, gzip.open(f"{self.path}.1.gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.path)
+            else:
+                os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+
+# ------------------------------
+# SHARED WRITERS
+# ------------------------------
+def configure(**settings):
+    """Set options for writers created from now on (see DEFAULT_SETTINGS)"""
+    unknown = set(settings) - set(DEFAULT_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown audit log settings: {', '.join(sorted(unknown))}")
+    _settings.update(settings)
+
+
+def writer_for(path):
+    """The one writer for path, shared by every model and thread in the process"""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer.closed:
+            writer = _writers[key] = AuditWriter(path, **_settings)
+        return writer
+
+
+def close_all():
+    """Flush and close every writer; called by App on exit, and at interpreter exit"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(close_all)
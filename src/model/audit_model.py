@@ -0,0 +1,91 @@
+import datetime
+import json
+from functools import lru_cache
+
+from db import migrate
+from model.records import AuditRow
+from query_registry import declare
+
+INSERT_EVENT = declare("audit.record", """
+    INSERT INTO audit_events (created_at, entity, action, entity_id, payload) VALUES (?, ?, ?, ?, ?)
+""")
+
+
+def record_event(db, entity, action, entity_id=None, payload=None):
+    """Append one audit event. Call it inside the write's own transaction so
+    the change and its audit entry commit, or roll back, together."""
+    created_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    db.execute(
+        INSERT_EVENT,
+        (created_at, entity, action, entity_id, json.dumps(payload or {}, ensure_ascii=False, default=str))
+    )
+
+
+class AuditModel:
+    ENTITIES = ("student", "course")
+    ACTIONS = ("ADD", "UPDATE", "DELETE", "IMPORT", "REPAIR")
+
+    def __init__(self, db):
+        self.db = db
+        migrate(self.db.conn)
+
+    def _filter(self, filters):
+        """WHERE clause and parameters for a filters dict.
+
+        Keys: entity, action, entity_id, since, until (dates or timestamps)
+        and text (substring of the payload). Missing or empty means any.
+        """
+        filters = filters or {}
+        entity, action, entity_id = filters.get("entity"), filters.get("action"), filters.get("entity_id")
+        since, until, text = filters.get("since"), filters.get("until"), filters.get("text")
+        conditions, params = [], []
+        for column, value in (("entity", entity), ("action", action), ("entity_id", entity_id)):
+            if value is not None and value != "":
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        # created_at is 'YYYY-MM-DD HH:MM:SS', so a bare date compares correctly as a prefix
+        if since:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("created_at < ?")
+            params.append(until)
+        if text:
+            conditions.append("payload LIKE ?")
+            params.append(f"%{text}%")
+        return " AND ".join(conditions) or "1", tuple(params)
+
+    # Filters combine into a bounded set of WHERE clauses; each is declared once
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _count_query(condition):
+        return declare("audit.count", f"SELECT COUNT(*) FROM audit_events WHERE {condition}")
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _page_query(resume, condition):
+        return declare("audit.page", f"""
+        SELECT {AuditRow.COLUMNS}
+        FROM audit_events
+        WHERE {"id < ?" if resume else "1"} AND {condition}
+        ORDER BY id DESC
+        LIMIT ?
+        """)
+
+    def count_events(self, filters=None):
+        condition, params = self._filter(filters)
+        return self.db.fetchone(self._count_query(condition), params)[0]
+
+    def page(self, before_id=None, limit=100, filters=None):
+        """Return the page of events, newest first, that precedes before_id.
+
+        Result is {"rows": [...], "has_more": bool, "last_id": id or None};
+        pass last_id back as before_id to fetch the next (older) page.
+        """
+        condition, params = self._filter(filters)
+        seek_params = (before_id,) if before_id is not None else ()
+        query = self._page_query(before_id is not None, condition)
+        rows = self.db.fetch_records(AuditRow, query, seek_params + params + (limit + 1,))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {"rows": rows, "has_more": has_more, "last_id": rows[-1].id if rows else None}
@@ -0,0 +1,75 @@
+import threading
+from collections import namedtuple
+
+# entity: "student" or "course"; op: "insert", "update", "delete" or "import";
+# id: the row id (None for "import"); values: the row as written (None for "delete");
+# source: the database file written to
+Change = namedtuple("Change", "entity op id values source", defaults=(None,))
+
+
+class ChangeFeed:
+    """Publish/subscribe feed of committed model writes.
+
+    Models publish one Change per write once it has committed; listeners are
+    called synchronously on the publishing thread, which for the app is the
+    query worker. UI code subscribes through view.change_dispatcher instead,
+    which hands changes over to the Tk thread.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.listeners = []
+
+    def subscribe(self, listener):
+        """Call listener(change) for every change from now on; returns an unsubscribe function"""
+        with self.lock:
+            self.listeners.append(listener)
+        return lambda: self.unsubscribe(listener)
+
+    def unsubscribe(self, listener):
+        with self.lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+    def publish(self, change):
+        with self.lock:
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener(change)
+
+
+# Shared by every model instance, whichever thread or connection it runs on
+feed = ChangeFeed()
+
+
+def publish_after_commit(db, entity, op, row_id, values=None):
+    """Publish a change once db's current transaction commits (immediately outside one)"""
+    change = Change(entity, op, row_id, values, db.db_file)
+    db.after_commit(lambda: feed.publish(change))
+
+
+def coalesce(batch):
+    """Collapse a burst of changes into the net change per row, in first-seen order.
+
+    An "import" stands for arbitrary many rows, so it absorbs every other
+    change to the same entity in the burst.
+    """
+    imported = {c.entity for c in batch if c.op == "import"}
+    net = {}
+    for change in batch:
+        if change.entity in imported:
+            net.setdefault((change.entity, None), change._replace(op="import", id=None, values=None))
+            continue
+        key = (change.entity, change.id)
+        previous = net.get(key)
+        if previous is None:
+            net[key] = change
+        elif previous.op == "insert" and change.op == "delete":
+            del net[key]  # never seen by anyone, so nothing to undo
+        elif previous.op == "insert":
+            net[key] = previous._replace(values=change.values)
+        elif previous.op == "delete" and change.op == "insert":
+            net[key] = change._replace(op="update")  # id reused within the burst
+        else:
+            net[key] = change
+    return list(net.values())
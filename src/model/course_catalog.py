@@ -0,0 +1,109 @@
+import threading
+import weakref
+
+from model import changes
+
+
+class CourseCatalog:
+    """In-memory id <-> code <-> name maps over the courses table.
+
+    Courses are few and rarely change, so the whole table is read on first
+    use and then kept current from the change feed: added, updated and
+    deleted courses are patched in place, and only a bulk import forces a
+    reload. Changes to the same database file made through other
+    connections (e.g. the query worker) are picked up the same way.
+
+    hits/misses count lookups answered from memory versus lookups that had
+    to (re)load the table first.
+    """
+
+    def __init__(self, conn, db_file):
+        self.conn = conn
+        self.db_file = db_file
+        self.lock = threading.Lock()
+        self.by_id = None  # id -> (course_code, course_name); None until loaded
+        self.id_by_code = {}
+        self.id_by_name = {}
+        self.hits = 0
+        self.misses = 0
+        # The feed only holds the catalogue weakly, and forgets it once it is collected
+        ref = weakref.ref(self)
+        listener = lambda change: CourseCatalog._on_change(ref, change)
+        changes.feed.subscribe(listener)
+        weakref.finalize(self, changes.feed.unsubscribe, listener)
+
+    # ------------------------------
+    # LOOKUPS
+    # ------------------------------
+    def id_for_name(self, course_name):
+        return self._lookup(lambda: self.id_by_name.get(course_name))
+
+    def id_for_code(self, course_code):
+        return self._lookup(lambda: self.id_by_code.get(course_code))
+
+    def name_for_id(self, course_id):
+        entry = self._lookup(lambda: self.by_id.get(course_id))
+        return entry[1] if entry else None
+
+    def code_for_id(self, course_id):
+        entry = self._lookup(lambda: self.by_id.get(course_id))
+        return entry[0] if entry else None
+
+    def names(self):
+        """Every course name, sorted, as the course dropdown lists them"""
+        return self._lookup(lambda: sorted(name for name in self.id_by_name if name is not None))
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.by_id or ())}
+
+    def _lookup(self, read):
+        with self.lock:
+            if self.by_id is None:
+                self.misses += 1
+                self._load()
+            else:
+                self.hits += 1
+            return read()
+
+    def _load(self):
+        rows = self.conn.execute("SELECT id, course_code, course_name FROM courses ORDER BY id").fetchall()
+        self.by_id = {r[0]: (r[1], r[2]) for r in rows}
+        self._reindex()
+
+    def _reindex(self):
+        # Duplicate names or codes resolve to the lowest id, as the old per-call queries did
+        self.id_by_code, self.id_by_name = {}, {}
+        for course_id in sorted(self.by_id):
+            code, name = self.by_id[course_id]
+            self.id_by_code.setdefault(code, course_id)
+            self.id_by_name.setdefault(name, course_id)
+
+    # ------------------------------
+    # INVALIDATION
+    # ------------------------------
+    @staticmethod
+    def _on_change(ref, change):
+        catalog = ref()
+        if catalog is None:
+            return
+        if change.entity == "course" and change.source == catalog.db_file:
+            catalog.apply(change)
+
+    def apply(self, change):
+        """Patch the maps for one committed course change"""
+        with self.lock:
+            if self.by_id is None:
+                return  # nothing cached yet
+            if change.op == "import":
+                self.by_id = None
+                return
+            if change.op == "delete":
+                self.by_id.pop(change.id, None)
+            else:
+                self.by_id[change.id] = (change.values["course_code"], change.values["course_name"])
+            self._reindex()
+
+    def invalidate(self):
+        """Forget everything; the next lookup reloads the table"""
+        with self.lock:
+            self.by_id = None
@@ -1,67 +1,304 @@
+import weakref
+from functools import lru_cache
+
+from db import migrate
+from model import changes, course_stats, csv_export, csv_import, keyset, search_index
+from model.audit_model import record_event
+from model.course_catalog import CourseCatalog
+from model.records import CourseRow, CourseStatsRow
+from query_registry import declare
+
+
 class CourseModel:
+    # One catalogue per Database, shared by every model built on it
+    catalogs = weakref.WeakKeyDictionary()
+
+    # What deleting a course does to its students: refuse, delete them, or move
+    # them to the course whose code is reassign_to. Set from config by configure().
+    DELETE_POLICIES = ("restrict", "cascade", "reassign")
+    delete_policy = "restrict"
+    reassign_to = None
+
+    # ------------------------------
+    # STATEMENTS
+    # ------------------------------
+    # Declared once so their text is identical on every call (see query_registry)
+    INSERT = declare("courses.insert", """
+        INSERT INTO courses (course_code, course_name, lecturer, credits)
+        VALUES (?, ?, ?, ?)
+    """)
+    UPDATE = declare("courses.update", """
+        UPDATE courses
+        SET course_code = ?, course_name = ?, lecturer = ?, credits = ?
+        WHERE id = ?
+    """)
+    ENROLLED_IDS = declare("courses.enrolled_ids", "SELECT id FROM students WHERE course_id = ?")
+    DELETE_STUDENTS = declare("courses.delete_students", "DELETE FROM students WHERE course_id = ?")
+    REASSIGN_STUDENTS = declare("courses.reassign_students", "UPDATE students SET course_id = ? WHERE course_id = ?")
+    DELETE = declare("courses.delete", "DELETE FROM courses WHERE id = ?")
+    GET = declare("courses.get", f"SELECT {CourseRow.COLUMNS} FROM courses WHERE id = ?")
+    GET_ALL = declare("courses.all", f"SELECT {CourseRow.COLUMNS} FROM courses")
+    SEARCH_FTS = declare("courses.search", """
+        SELECT c.id, c.course_code, c.course_name, c.lecturer, c.credits
+        FROM courses_fts f
+        JOIN courses c ON c.id = f.rowid
+        WHERE courses_fts MATCH ?
+        ORDER BY f.rank
+    """)
+    SEARCH_LIKE = declare("courses.search", f"""
+        SELECT {CourseRow.COLUMNS}
+        FROM courses
+        WHERE course_code LIKE ? OR course_name LIKE ? OR lecturer LIKE ?
+    """)
+    STATS = declare("courses.stats", f"""
+        SELECT {CourseStatsRow.COLUMNS} FROM course_stats cs JOIN courses c ON c.id = cs.course_id
+    """)
+    COUNT = declare("courses.count", "SELECT COUNT(*) FROM courses")
+    IMPORT = declare("courses.import", """
+        INSERT INTO courses (course_code, course_name, lecturer, credits)
+        VALUES (?, ?, ?, ?)
+    """)
+    # Streamed through csv_export on the caller's connection, so not timed
+    EXPORT_SQL = "SELECT id, course_code, course_name, lecturer, credits FROM courses ORDER BY id"
+
+    # Search conditions page() picks from; each is part of the cache key below
+    MATCH_ALL = "1"
+    MATCH_FTS = "id IN (SELECT rowid FROM courses_fts WHERE courses_fts MATCH ?)"
+    MATCH_LIKE = "(course_code LIKE ? OR course_name LIKE ? OR lecturer LIKE ?)"
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _page_query(order_by, seek_kind, condition):
+        seek = keyset.seek_condition(seek_kind, order_by, "id")
+        return declare("courses.page", f"""
+        SELECT {CourseRow.COLUMNS}
+        FROM courses
+        WHERE {seek} AND {condition}
+        ORDER BY {order_by}, id
+        LIMIT ?
+        """)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _sort_value_query(order_by):
+        return declare("courses.page_anchor", f"SELECT {order_by} FROM courses WHERE id = ?")
+
     def __init__(self, db):
         self.db = db
         self.create_table()
+        self.catalog = self.catalog_for(db)
+
+    @classmethod
+    def configure(cls, delete_policy="restrict", reassign_to=None):
+        """Set the default delete policy from the "courses" section of config.json"""
+        if delete_policy not in cls.DELETE_POLICIES:
+            raise ValueError(f"Unknown course delete policy: {delete_policy!r}")
+        cls.delete_policy = delete_policy
+        cls.reassign_to = reassign_to
+
+    @classmethod
+    def catalog_for(cls, db):
+        """The cached course catalogue for db, created on first use"""
+        catalog = cls.catalogs.get(db)
+        if catalog is None:
+            catalog = cls.catalogs[db] = CourseCatalog(db.conn, db.db_file)
+        return catalog
 
     def create_table(self):
-        """Create courses table if it does not exist"""
-        query = """
-        CREATE TABLE IF NOT EXISTS courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course_code TEXT NOT NULL UNIQUE,
-            course_name TEXT NOT NULL,
-            lecturer TEXT NOT NULL,
-            credits INTEGER NOT NULL
-        )
-        """
-        self.db.execute(query) # No error handling for database operations
+        """Bring the shared schema (students, courses, indexes) up to date"""
+        migrate(self.db.conn)
+        self.fts_enabled = search_index.is_available(self.db.conn)
+
+    def rebuild_search_index(self):
+        """Repopulate the full-text index from the students and courses tables"""
+        if self.fts_enabled:
+            with self.db.transaction():
+                search_index.rebuild_search_index(self.db.conn)
+
+    def rebuild_course_stats(self):
+        """Recount enrolments from the students table, e.g. after editing the file by hand"""
+        with self.db.transaction():
+            course_stats.rebuild_course_stats(self.db.conn)
 
     # ------------------------------
     # CRUD OPERATIONS
     # ------------------------------
     def add_course(self, course_code, course_name, lecturer, credits):
-        query = """
-        INSERT INTO courses (course_code, course_name, lecturer, credits)
-        VALUES (?, ?, ?, ?)
-        """
-        self.db.execute(query, (course_code, course_name, lecturer, credits))
+        with self.db.transaction():
+            course_id = self.db.execute(self.INSERT, (course_code, course_name, lecturer, credits)).lastrowid
+            row = self.get_course_by_id(course_id)
+            record_event(self.db, "course", "ADD", course_id, row._asdict())
+            changes.publish_after_commit(self.db, "course", "insert", course_id, row)
+        return row
 
     def update_course(self, course_id, course_code, course_name, lecturer, credits):
-        query = """
-        UPDATE courses
-        SET course_code = ?, course_name = ?, lecturer = ?, credits = ?
-        WHERE id = ?
+        with self.db.transaction():
+            self.db.execute(self.UPDATE, (course_code, course_name, lecturer, credits, course_id))
+            row = self.get_course_by_id(course_id)
+            if row:
+                record_event(self.db, "course", "UPDATE", course_id, row._asdict())
+                changes.publish_after_commit(self.db, "course", "update", course_id, row)
+        return row
+
+    def delete_course(self, course_id, policy=None, reassign_to=None):
+        """Delete a course; returns its id, or None if it did not exist.
+
+        Enrolled students are handled by policy (default: delete_policy):
+        "restrict" raises ValueError, "cascade" deletes them and "reassign"
+        moves them to the course with code reassign_to. Students are found
+        through idx_students_course_id, so this is a seek however many
+        students there are.
         """
-        self.db.execute(query, (course_code, course_name, lecturer, credits, course_id))
+        with self.db.transaction():
+            row = self.get_course_by_id(course_id)
+            if row is None:
+                return None
+            policy = policy or self.delete_policy
+            if policy not in self.DELETE_POLICIES:
+                raise ValueError(f"Unknown course delete policy: {policy!r}")
+            student_ids = [r[0] for r in self.db.fetchall(self.ENROLLED_IDS, (course_id,))]
+            if student_ids:
+                if policy == "restrict":
+                    raise ValueError(f"Cannot delete course {_label(row)}: "
+                                     f"{len(student_ids)} students are enrolled on it")
+                if policy == "cascade":
+                    self.db.execute(self.DELETE_STUDENTS, (course_id,))
+                    for student_id in student_ids:
+                        record_event(self.db, "student", "DELETE", student_id,
+                                     {"id": student_id, "course_id": course_id, "reason": "course deleted"})
+                else:
+                    target_id = self._reassign_target(reassign_to or self.reassign_to, course_id)
+                    self.db.execute(self.REASSIGN_STUDENTS, (target_id, course_id))
+                    for student_id in student_ids:
+                        record_event(self.db, "student", "UPDATE", student_id,
+                                     {"id": student_id, "course_id": target_id, "reason": "course deleted"})
+            self.db.execute(self.DELETE, (course_id,))
+            record_event(self.db, "course", "DELETE", course_id,
+                         dict(row._asdict(), policy=policy, students=len(student_ids)))
+            # Student views reload on a course delete, which covers moved or deleted students
+            changes.publish_after_commit(self.db, "course", "delete", course_id)
+        return course_id
 
-    def delete_course(self, course_id):
-        query = "DELETE FROM courses WHERE id = ?"
-        self.db.execute(query, (course_id,))
+    def _reassign_target(self, course_code, course_id):
+        if not course_code:
+            raise ValueError("No course to reassign students to: set reassign_to to a course code")
+        target_id = self.catalog.id_for_code(course_code)
+        if target_id is None:
+            raise ValueError(f"Cannot reassign students to {course_code}: no course has that code")
+        if target_id == course_id:
+            raise ValueError(f"Cannot reassign students to {course_code}: it is the course being deleted")
+        return target_id
 
     def get_all_courses(self):
-        query = "SELECT id, course_code, course_name, lecturer, credits FROM courses"
-        rows = self.db.fetchall(query)
-        return [
-            {"id": r[0], "course_code": r[1], "course_name": r[2], "lecturer": r[3], "credits": r[4]}
-            for r in rows
-        ]
+        return self.db.fetch_records(CourseRow, self.GET_ALL)
 
     def search_courses(self, term):
-        query = """
-        SELECT id, course_code, course_name, lecturer, credits
-        FROM courses
-        WHERE course_code LIKE ? OR course_name LIKE ? OR lecturer LIKE ?
-        """
+        if self.fts_enabled and search_index.can_use_index(term):
+            # Ranked full-text search through the trigram index
+            return self.db.fetch_records(CourseRow, self.SEARCH_FTS, (search_index.match_phrase(term),))
+
+        # Terms too short for trigrams fall back to a LIKE scan
         term_like = f"%{term}%"
-        rows = self.db.fetchall(query, (term_like, term_like, term_like))
-        return [
-            {"id": r[0], "course_code": r[1], "course_name": r[2], "lecturer": r[3], "credits": r[4]}
-            for r in rows
-        ]
+        return self.db.fetch_records(CourseRow, self.SEARCH_LIKE, (term_like, term_like, term_like))
 
     def get_course_by_id(self, course_id):
-        query = "SELECT id, course_code, course_name, lecturer, credits FROM courses WHERE id = ?"
-        row = self.db.fetchone(query, (course_id,))
-        if row:
-            return {"id": row[0], "course_code": row[1], "course_name": row[2], "lecturer": row[3], "credits": row[4]}
-        return None
+        return self.db.fetch_record(CourseRow, self.GET, (course_id,))
+
+    def get_course_id(self, course_name):
+        """Return the id of the course with this exact name, or None"""
+        return self.catalog.id_for_name(course_name)
+
+    def get_course_names(self):
+        return self.catalog.names()
+
+    # ------------------------------
+    # STATISTICS
+    # ------------------------------
+    def get_course_stats(self):
+        """Enrolment count and enrolled credits for every course, read from course_stats"""
+        return self.db.fetch_records(CourseStatsRow, self.STATS)
+
+    # ------------------------------
+    # BULK IMPORT
+    # ------------------------------
+    IMPORT_COLUMNS = ("course_code", "course_name", "lecturer", "credits")
+
+    def import_csv(self, source, batch_size=csv_import.DEFAULT_BATCH_SIZE):
+        """Bulk-load courses from a CSV path or file.
+
+        Columns: course_code, course_name, lecturer, credits.
+        Returns {"imported": n, "rejected": [(line_no, reason), ...]}.
+        """
+        def prepare(values):
+            csv_import.check_required(values, self.IMPORT_COLUMNS)
+            course_code, course_name, lecturer, credits = values
+            if not credits.isdigit():
+                raise ValueError(f"Credits must be a whole number, got {credits!r}")
+            return (course_code, course_name, lecturer, int(credits))
+
+        with csv_import.open_csv(source) as reader:
+            result = csv_import.import_rows(self.db, reader, self.IMPORT_COLUMNS, prepare, self.IMPORT, batch_size)
+        record_event(self.db, "course", "IMPORT", None,
+                     {"imported": result["imported"], "rejected": len(result["rejected"])})
+        if result["imported"]:
+            changes.publish_after_commit(self.db, "course", "import", None)
+        return result
+
+    # ------------------------------
+    # STREAMING EXPORT
+    # ------------------------------
+    EXPORT_HEADER = ["ID", "Course Code", "Course Name", "Lecturer", "Credits"]
+
+    def count_courses(self):
+        return self.db.fetchone(self.COUNT)[0]
+
+    def export_csv(self, f, conn=None, **options):
+        """Stream every course into CSV file f; see csv_export.export_query for options.
+
+        conn lets a worker thread export through its own connection.
+        """
+        return csv_export.export_query(conn or self.db.conn, self.EXPORT_SQL, self.EXPORT_HEADER, f, **options)
+
+    # ------------------------------
+    # KEYSET PAGINATION
+    # ------------------------------
+    # Only columns backed by an index, so each page is a seek rather than a scan
+    PAGE_ORDER_COLUMNS = ("id", "course_code")
+
+    def page(self, after_id=None, limit=100, order_by="id", term="", after_value=keyset.UNSET):
+        """Return the page of courses that follows the row (after_value, after_id) in order_by order.
+
+        Result is {"rows": [...], "has_more": bool, "last_id": id or None,
+        "last_value": the last row's order_by value}; pass them back as
+        after_id and after_value to fetch the next page (see StudentModel.page).
+        """
+        if order_by not in self.PAGE_ORDER_COLUMNS:
+            raise ValueError(f"Cannot page courses by {order_by!r}")
+
+        if term and self.fts_enabled and search_index.can_use_index(term):
+            condition, params = self.MATCH_FTS, (search_index.match_phrase(term),)
+        elif term:
+            term_like = f"%{term}%"
+            condition, params = self.MATCH_LIKE, (term_like, term_like, term_like)
+        else:
+            condition, params = self.MATCH_ALL, ()
+
+        if after_id is not None and order_by != "id" and after_value is keyset.UNSET:
+            row = self.db.fetchone(self._sort_value_query(order_by), (after_id,))
+            if row is None:
+                raise ValueError(f"Course {after_id} no longer exists; pass the page's last_value "
+                                 "as after_value to continue after it")
+            after_value = row[0]
+        seek_kind, seek_params = keyset.seek(order_by, after_id, after_value)
+        query = self._page_query(order_by, seek_kind, condition)
+        # One extra row tells us whether another page exists
+        rows = self.db.fetch_records(CourseRow, query, seek_params + params + (limit + 1,))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {"rows": rows, "has_more": has_more, "last_id": rows[-1].id if rows else None,
+                "last_value": getattr(rows[-1], order_by) if rows else None}
+
+
+def _label(row):
+    """How a course is named in messages; code and name are both optional"""
+    return row.course_code or row.course_name or f"#{row.id}"
@@ -0,0 +1,82 @@
+# Enrolment counts per course, kept current by triggers so reading them
+# costs one row per course instead of a GROUP BY over every student.
+from contextlib import contextmanager
+
+TRIGGERS = [
+    # A new course starts with whatever students already point at it (normally none)
+    """
+    CREATE TRIGGER IF NOT EXISTS course_stats_course_ai AFTER INSERT ON courses BEGIN
+        INSERT OR REPLACE INTO course_stats (course_id, enrolled)
+        VALUES (new.id, (SELECT COUNT(*) FROM students WHERE course_id = new.id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS course_stats_course_ad AFTER DELETE ON courses BEGIN
+        DELETE FROM course_stats WHERE course_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS course_stats_student_ai AFTER INSERT ON students BEGIN
+        UPDATE course_stats SET enrolled = enrolled + 1 WHERE course_id = new.course_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS course_stats_student_ad AFTER DELETE ON students BEGIN
+        UPDATE course_stats SET enrolled = enrolled - 1 WHERE course_id = old.course_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS course_stats_student_au AFTER UPDATE OF course_id ON students
+    WHEN old.course_id IS NOT new.course_id BEGIN
+        UPDATE course_stats SET enrolled = enrolled - 1 WHERE course_id = old.course_id;
+        UPDATE course_stats SET enrolled = enrolled + 1 WHERE course_id = new.course_id;
+    END
+    """,
+]
+
+
+def ensure_course_stats(conn):
+    """Create the summary table and its triggers if missing, filled from current rows. Does not commit."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS course_stats (
+            course_id INTEGER PRIMARY KEY REFERENCES courses(id),
+            enrolled INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    for trigger in TRIGGERS:
+        conn.execute(trigger)
+    rebuild_course_stats(conn)
+
+
+def rebuild_course_stats(conn):
+    """Recount every course from the students table. Does not commit."""
+    conn.execute("DELETE FROM course_stats")
+    conn.execute("""
+        INSERT INTO course_stats (course_id, enrolled)
+        SELECT c.id, (SELECT COUNT(*) FROM students s WHERE s.course_id = c.id)
+        FROM courses c
+    """)
+
+
+@contextmanager
+def deferred_student_counts(conn):
+    """Count students inserted in this block once per course instead of per row.
+
+    Must run inside a transaction: the insert trigger is dropped and then
+    recreated before commit, so other connections never see it missing.
+    Only inserts are batched; deletes and course changes in the block are
+    still counted by their triggers.
+    """
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM students").fetchone()[0]
+    conn.execute("DROP TRIGGER IF EXISTS course_stats_student_ai")
+    try:
+        yield
+    finally:
+        # Recount just the courses that gained students; each count is a seek on idx_students_course_id
+        conn.execute("""
+            INSERT OR REPLACE INTO course_stats (course_id, enrolled)
+            SELECT course_id, COUNT(*) FROM students
+            WHERE course_id IN (SELECT course_id FROM students WHERE id > ? AND course_id IS NOT NULL)
+            GROUP BY course_id
+        """, (last_id,))
+        conn.execute(TRIGGERS[2])
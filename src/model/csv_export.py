@@ -0,0 +1,32 @@
+import csv
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def export_query(conn, query, header, f, params=(), preamble=(), batch_size=DEFAULT_BATCH_SIZE,
+                 progress=None, cancelled=None):
+    """Stream the rows of query into CSV file f without materializing the result.
+
+    Rows are pulled from the cursor with fetchmany and written batch by batch,
+    so memory use does not depend on table size. progress(rows_written) is
+    called after each batch; when cancelled() returns True the export stops.
+    Returns the number of rows written, or None if cancelled.
+    """
+    writer = csv.writer(f)
+    writer.writerows(preamble)
+    writer.writerow(header)
+    cursor = conn.execute(query, params)
+    written = 0
+    try:
+        while True:
+            if cancelled and cancelled():
+                return None
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return written
+            writer.writerows(batch)
+            written += len(batch)
+            if progress:
+                progress(written)
+    finally:
+        cursor.close()
@@ -0,0 +1,88 @@
+import csv
+import sqlite3
+from contextlib import contextmanager, nullcontext
+from operator import itemgetter
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+@contextmanager
+def open_csv(source):
+    """Yield a csv.reader over a path or an already open text file"""
+    if hasattr(source, "read"):
+        yield csv.reader(source)
+    else:
+        with open(source, "r", newline="", encoding="utf-8-sig") as f:
+            yield csv.reader(f)
+
+
+def import_rows(db, reader, columns, prepare, insert_sql, batch_size=DEFAULT_BATCH_SIZE, batch_context=None):
+    """Stream rows from a csv.reader into the database in batched transactions.
+
+    The first row is the header; columns names the fields handed to
+    prepare(values) as a tuple of stripped strings, in that order (a column
+    missing from the header is passed as ""). prepare returns the insert
+    parameters, or raises ValueError to reject the row.
+
+    Each batch is inserted with one executemany and committed once; if the
+    batch hits a constraint violation it is rolled back and retried row by
+    row so only the offending rows are rejected. batch_context, if given, is
+    a callable returning a context manager that wraps each batch inside its
+    transaction.
+
+    Returns {"imported": count, "rejected": [(line_no, reason), ...]}.
+    """
+    header = [name.strip() for name in next(reader, [])]
+    # Point absent optional columns at an always-empty trailing field
+    width = len(header)
+    pick = itemgetter(*[header.index(c) if c in header else width for c in columns])
+
+    result = {"imported": 0, "rejected": []}
+    batch = []
+    for line_no, row in enumerate(reader, start=2):
+        if not row:
+            continue
+        try:
+            if len(row) != width:
+                raise ValueError(f"Expected {width} fields, got {len(row)}")
+            row.append("")
+            values = tuple(value.strip() for value in pick(row))
+            batch.append((line_no, prepare(values)))
+        except ValueError as e:
+            result["rejected"].append((line_no, str(e)))
+            continue
+        if len(batch) >= batch_size:
+            _insert_batch(db, insert_sql, batch, result, batch_context)
+            batch = []
+    if batch:
+        _insert_batch(db, insert_sql, batch, result, batch_context)
+    return result
+
+
+def _insert_batch(db, insert_sql, batch, result, batch_context):
+    # No savepoint around the fast path: one would journal every index page the
+    # batch touches, a cost that grows with the table. A violation rolls back
+    # the whole batch instead.
+    try:
+        with db.transaction(), (batch_context() if batch_context else nullcontext()):
+            db.executemany(insert_sql, [params for _, params in batch])
+        result["imported"] += len(batch)
+        return
+    except sqlite3.IntegrityError:
+        pass
+    # Slow path: find the rows that violate constraints
+    with db.transaction(), (batch_context() if batch_context else nullcontext()):
+        for line_no, params in batch:
+            try:
+                with db.transaction():
+                    db.execute(insert_sql, params)
+                result["imported"] += 1
+            except sqlite3.IntegrityError as e:
+                result["rejected"].append((line_no, str(e)))
+
+
+def check_required(values, columns):
+    """Reject the row if any of the leading required values is blank"""
+    if not all(values[:len(columns)]):
+        missing = [c for c, v in zip(columns, values) if not v]
+        raise ValueError(f"Missing {', '.join(missing)}")
@@ -0,0 +1,71 @@
+from model import changes
+from model.audit_model import record_event
+from query_registry import declare
+
+DEFAULT_BATCH_SIZE = 10000
+REPAIR_MODES = ("null", "delete", "reassign")
+
+# Students in one id range whose course no longer exists
+ORPHAN_CONDITION = """
+    id > ? AND id <= ? AND course_id IS NOT NULL
+    AND NOT EXISTS (SELECT 1 FROM courses c WHERE c.id = students.course_id)
+"""
+COURSE_EXISTS = declare("integrity.course_exists", "SELECT 1 FROM courses WHERE id = ?")
+MAX_STUDENT_ID = declare("integrity.max_id", "SELECT COALESCE(MAX(id), 0) FROM students")
+FIND_ORPHANS = declare("integrity.scan", f"SELECT id, course_id FROM students WHERE {ORPHAN_CONDITION}")
+DELETE_ORPHANS = declare("integrity.repair", f"DELETE FROM students WHERE {ORPHAN_CONDITION}")
+REASSIGN_ORPHANS = declare("integrity.repair", f"UPDATE students SET course_id = ? WHERE {ORPHAN_CONDITION}")
+
+
+def scan_orphans(db, repair=None, reassign_to=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Find, and optionally repair, students pointing at a deleted course.
+
+    Databases written before foreign keys were enforced can hold such rows.
+    Unlike PRAGMA foreign_key_check, which reports every violation in one
+    pass, students are walked in id ranges of batch_size, so each statement
+    is short and each repaired batch commits on its own: the scan can run on
+    a live database and resume cheaply if interrupted.
+
+    repair is None (report only), "null" (clear the course), "delete" (drop
+    the student) or "reassign" (move to the course id reassign_to).
+    progress(last_id, max_id) is called after each batch.
+    Returns {"orphans": n, "repaired": n, "by_course": {course_id: n}}.
+    """
+    if repair is not None and repair not in REPAIR_MODES:
+        raise ValueError(f"Unknown repair mode: {repair!r}")
+    if repair == "reassign" and not db.fetchone(COURSE_EXISTS, (reassign_to,)):
+        raise ValueError(f"No course with id {reassign_to!r} to reassign students to")
+
+    report = {"orphans": 0, "repaired": 0, "by_course": {}}
+    max_id = db.fetchone(MAX_STUDENT_ID)[0]
+    last_id = 0
+    while last_id < max_id:
+        upper = last_id + batch_size
+        with db.transaction():
+            orphans = db.fetchall(FIND_ORPHANS, (last_id, upper))
+            for row in orphans:
+                report["by_course"][row[1]] = report["by_course"].get(row[1], 0) + 1
+            report["orphans"] += len(orphans)
+            if repair and orphans:
+                report["repaired"] += _repair_batch(db, repair, reassign_to, last_id, upper, orphans)
+        last_id = upper
+        if progress:
+            progress(min(last_id, max_id), max_id)
+    if report["repaired"]:
+        changes.publish_after_commit(db, "student", "import", None)
+    return report
+
+
+def _repair_batch(db, repair, reassign_to, low, high, orphans):
+    if repair == "delete":
+        statement, params = DELETE_ORPHANS, (low, high)
+    else:
+        course_id = reassign_to if repair == "reassign" else None
+        statement, params = REASSIGN_ORPHANS, (course_id, low, high)
+    repaired = db.execute(statement, params).rowcount
+    record_event(db, "student", "REPAIR", None, {
+        "mode": repair,
+        "course_id": reassign_to if repair == "reassign" else None,
+        "students": [{"id": row[0], "course_id": row[1]} for row in orphans],
+    })
+    return repaired
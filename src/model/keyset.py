@@ -0,0 +1,32 @@
+# ------------------------------
+# KEYSET PAGINATION
+# ------------------------------
+# Shared by the models' page() methods. A page resumes after the last row
+# seen, identified by its sort value and id, so it needs no OFFSET and still
+# works when that row has since been deleted or edited.
+
+# Default for after_value: the caller did not pass the last row's sort value
+UNSET = object()
+
+
+def seek(order_by, after_id, after_value):
+    """(kind, params) of the condition resuming after the row (after_value, after_id)"""
+    if after_id is None:
+        return None, ()
+    if order_by == "id":
+        return "id", (after_id,)
+    if after_value is None:
+        return "null", (after_id,)
+    return "value", (after_value, after_id)
+
+
+def seek_condition(kind, column, id_column):
+    """SQL for a seek kind from seek(); a statement's text depends only on the kind"""
+    if kind is None:
+        return "1"
+    if kind == "id":
+        return f"{id_column} > ?"
+    if kind == "null":
+        # NULLs sort first: the rest of the NULL group, then every non-NULL value
+        return f"(({column} IS NULL AND {id_column} > ?) OR {column} IS NOT NULL)"
+    return f"({column}, {id_column}) > (?, ?)"
@@ -0,0 +1,202 @@
+import bisect
+import os
+import re
+import threading
+
+# Bytes read per step while indexing or searching
+BLOCK_SIZE = 64 * 1024
+
+
+class LogFile:
+    """Random access by line number to a large, growing text file.
+
+    Nothing is loaded up front. index_more() scans the file a block at a
+    time (counting newlines in C, not per line in Python) and keeps one
+    checkpoint (line number, byte offset) per block, so a multi-GB file is
+    indexed at disk speed into a few thousand entries. read_lines() seeks to
+    the nearest checkpoint and reads only the lines asked for.
+
+    Only complete lines (ending in a newline) are counted, so a line being
+    appended is shown once it is finished. If the file shrinks or is replaced
+    (e.g. rotated) the index starts over.
+    """
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.lock = threading.Lock()
+        self.generation = 0  # bumped whenever the index starts over
+        self._reset()
+
+    def _reset(self):
+        self.line_count = 0
+        self.indexed_pos = 0            # offset just past the last complete line
+        self.checkpoint_lines = [0]     # parallel lists, sorted
+        self.checkpoint_offsets = [0]
+        self.identity = None
+        self.generation += 1
+
+    POLL_SECONDS = 0.5
+    # Indexed per step by the background thread, so progress shows while a big file loads
+    STEP_BYTES = 32 * 1024 * 1024
+
+    def start(self):
+        """Index on a background thread, then keep watching for appended lines (tail -f)"""
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._follow, name="log-index", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def _follow(self):
+        while not self.stopped.is_set():
+            if not self.index_more(self.STEP_BYTES):
+                self.stopped.wait(self.POLL_SECONDS)
+
+    def index_more(self, max_bytes=None):
+        """Index lines appended since the last call; returns how many were added"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return 0
+        with self.lock:
+            identity = (stat.st_dev, stat.st_ino)
+            if self.identity is not None and (identity != self.identity or stat.st_size < self.indexed_pos):
+                self._reset()  # rotated or truncated
+            self.identity = identity
+            start_pos, start_count = self.indexed_pos, self.line_count
+        added, pos = 0, start_pos
+        end = stat.st_size if max_bytes is None else min(stat.st_size, start_pos + max_bytes)
+        new_lines, new_offsets = [], []
+        with open(self.path, "rb") as f:
+            f.seek(start_pos)
+            read_pos = start_pos
+            while read_pos < end:
+                block = f.read(min(BLOCK_SIZE, end - read_pos))
+                if not block:
+                    break
+                read_pos += len(block)
+                newlines = block.count(b"\n")
+                if newlines:
+                    # Checkpoint the line that starts after this block's last newline
+                    added += newlines
+                    pos = read_pos - len(block) + block.rfind(b"\n") + 1
+                    new_lines.append(start_count + added)
+                    new_offsets.append(pos)
+        if added:
+            with self.lock:
+                if self.indexed_pos == start_pos:  # not reset meanwhile
+                    self.line_count = start_count + added
+                    self.indexed_pos = pos
+                    self.checkpoint_lines.extend(new_lines)
+                    self.checkpoint_offsets.extend(new_offsets)
+        return added
+
+    def offset_of(self, line_no):
+        """Byte offset where line line_no starts, seeking from the nearest checkpoint"""
+        with self.lock:
+            i = bisect.bisect_right(self.checkpoint_lines, line_no) - 1
+            line, offset = self.checkpoint_lines[i], self.checkpoint_offsets[i]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for _ in range(line_no - line):
+                f.readline()
+            return f.tell()
+
+    def read_lines(self, start, count):
+        """Lines start .. start+count-1 (fewer at the end), without newlines"""
+        count = max(0, min(count, self.line_count - start))
+        if not count:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset_of(start))
+            return [self._decode(f.readline()) for _ in range(count)]
+
+    def read_at(self, offsets):
+        """The lines starting at each of the given byte offsets"""
+        lines = []
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                lines.append(self._decode(f.readline()))
+        return lines
+
+    def _decode(self, raw):
+        return raw.rstrip(b"\r\n").decode(self.encoding, errors="replace")
+
+
+class LogSearch:
+    """Finds the lines of a LogFile matching a pattern, on a background thread.
+
+    Matching runs over whole blocks with a compiled bytes regex, so most of
+    the work happens in C. Matches are collected as line start offsets in
+    file order and can be read while the search is still running. Unless
+    cancelled, the search keeps following lines that are indexed later.
+    """
+
+    POLL_SECONDS = 0.5
+
+    def __init__(self, log, pattern, regex=False, ignore_case=True):
+        self.log = log
+        source = pattern.encode(log.encoding) if regex else re.escape(pattern.encode(log.encoding))
+        # MULTILINE so ^ and $ anchor to each line, not to the chunk being scanned
+        self.regex = re.compile(source, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+        self.offsets = []         # byte offset of each matching line
+        self.line_numbers = []    # and its 1-based line number
+        self.scanned_pos = 0
+        self.scanned_lines = 0
+        self.generation = log.generation
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="log-search", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @property
+    def match_count(self):
+        return len(self.offsets)
+
+    def _run(self):
+        while not self.cancelled.is_set():
+            if self.log.generation != self.generation:
+                return  # the file was replaced; the caller starts a new search
+            if self.scanned_pos >= self.log.indexed_pos:
+                self.cancelled.wait(self.POLL_SECONDS)
+                continue
+            self._scan(self.scanned_pos, min(self.log.indexed_pos, self.scanned_pos + 16 * BLOCK_SIZE))
+
+    def _scan(self, start, end):
+        with open(self.log.path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+            if b"\n" not in data:
+                # One line longer than the chunk: take it whole (indexed_pos is a line end)
+                data += f.read(self.log.indexed_pos - end)
+        # Stop at the last complete line; the rest is scanned with the next chunk
+        data = data[:data.rfind(b"\n") + 1]
+        pos, found, numbers = 0, [], []
+        line_no, counted_to = self.scanned_lines, 0
+        while True:
+            match = self.regex.search(data, pos)
+            # An empty match after the final newline (e.g. ^) belongs to a line not read yet
+            if match is None or match.start() >= len(data):
+                break
+            line_start = data.rfind(b"\n", 0, match.start()) + 1
+            line_end = data.find(b"\n", match.start())
+            if line_end == -1:
+                line_end = len(data)
+            line_no += data.count(b"\n", counted_to, line_start)
+            counted_to = line_start
+            found.append(start + line_start)
+            numbers.append(line_no + 1)
+            # Past the matched line, and always forward, even after an empty match
+            pos = max(line_end + 1, pos + 1)
+            if pos >= len(data):
+                break
+        # Line numbers first, so a reader never sees an offset without its number
+        self.line_numbers.extend(numbers)
+        self.offsets.extend(found)
+        self.scanned_lines += data.count(b"\n")
+        self.scanned_pos = start + len(data)
@@ -0,0 +1,66 @@
+import json
+from collections import namedtuple
+
+
+class Record:
+    """Mixin for compact result rows built on namedtuple.
+
+    A row costs one tuple instead of a dict, and derived display fields are
+    computed on access instead of stored. Rows still read like the dicts
+    they replace, row["email"], as well as row.email.
+    """
+
+    __slots__ = ()
+    COMPUTED = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def as_dict(self):
+        """Stored and computed fields as a plain dict, e.g. for JSON"""
+        values = self._asdict()
+        for name in self.COMPUTED:
+            values[name] = getattr(self, name)
+        return values
+
+
+class StudentRow(Record, namedtuple("StudentRow", "id student_no first_name last_name email course_code course_name")):
+    __slots__ = ()
+    COMPUTED = ("name", "course")
+    # Column list matching the fields, for "FROM students s LEFT JOIN courses c"
+    COLUMNS = "s.id, s.student_no, s.first_name, s.last_name, s.email, c.course_code, c.course_name"
+
+    @property
+    def name(self):
+        return f"{self.first_name} {self.last_name}"
+
+    @property
+    def course(self):
+        return self.course_name
+
+
+class CourseRow(Record, namedtuple("CourseRow", "id course_code course_name lecturer credits")):
+    __slots__ = ()
+    COLUMNS = "id, course_code, course_name, lecturer, credits"
+
+
+class CourseStatsRow(Record, namedtuple("CourseStatsRow", "course_id enrolled credits_enrolled")):
+    __slots__ = ()
+    # For "FROM course_stats cs JOIN courses c"; credits_enrolled is credits times students
+    COLUMNS = "cs.course_id, cs.enrolled, cs.enrolled * COALESCE(c.credits, 0)"
+
+
+class AuditRow(Record, namedtuple("AuditRow", "id created_at entity action entity_id payload")):
+    __slots__ = ()
+    COMPUTED = ("data",)
+    COLUMNS = "id, created_at, entity, action, entity_id, payload"
+
+    @property
+    def data(self):
+        """The JSON payload decoded"""
+        return json.loads(self.payload)
@@ -0,0 +1,134 @@
+import sqlite3
+from contextlib import contextmanager
+
+# Trigram tokens are three characters long, so shorter terms cannot use the index
+MIN_TERM_LENGTH = 3
+
+STUDENT_FTS_COLUMNS = "student_no, first_name, last_name, email, course_code, course_name"
+COURSE_FTS_COLUMNS = "course_code, course_name, lecturer"
+
+# Copy the new student row, plus its course fields, into students_fts
+STUDENT_FTS_INSERT = f"""
+    INSERT INTO students_fts (rowid, {STUDENT_FTS_COLUMNS})
+    SELECT new.id, new.student_no, new.first_name, new.last_name, new.email,
+           (SELECT course_code FROM courses WHERE id = new.course_id),
+           (SELECT course_name FROM courses WHERE id = new.course_id);
+"""
+
+TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN
+        {STUDENT_FTS_INSERT}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN
+        DELETE FROM students_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE ON students BEGIN
+        DELETE FROM students_fts WHERE rowid = old.id;
+        {STUDENT_FTS_INSERT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS courses_fts_ai AFTER INSERT ON courses BEGIN
+        INSERT INTO courses_fts (rowid, {COURSE_FTS_COLUMNS})
+        VALUES (new.id, new.course_code, new.course_name, new.lecturer);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_ad AFTER DELETE ON courses BEGIN
+        DELETE FROM courses_fts WHERE rowid = old.id;
+        UPDATE students_fts SET course_code = NULL, course_name = NULL
+        WHERE rowid IN (SELECT id FROM students WHERE course_id = old.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS courses_fts_au AFTER UPDATE ON courses BEGIN
+        DELETE FROM courses_fts WHERE rowid = old.id;
+        INSERT INTO courses_fts (rowid, {COURSE_FTS_COLUMNS})
+        VALUES (new.id, new.course_code, new.course_name, new.lecturer);
+        UPDATE students_fts SET course_code = new.course_code, course_name = new.course_name
+        WHERE rowid IN (SELECT id FROM students WHERE course_id = new.id);
+    END
+    """,
+]
+
+
+def ensure_search_index(conn):
+    """Create the FTS5 shadow tables and sync triggers if missing.
+
+    Returns False when this SQLite build has no FTS5 trigram tokenizer, in
+    which case searches keep using LIKE. Does not commit.
+    """
+    if is_available(conn):
+        return True
+    try:
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5({STUDENT_FTS_COLUMNS}, tokenize='trigram')")
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts USING fts5({COURSE_FTS_COLUMNS}, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    for trigger in TRIGGERS:
+        conn.execute(trigger)
+    # Index created on a database that may already hold rows
+    rebuild_search_index(conn)
+    return True
+
+
+def is_available(conn):
+    """True when the shadow tables exist in this database"""
+    row = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('students_fts', 'courses_fts')"
+    ).fetchone()
+    return row[0] == 2
+
+
+def rebuild_search_index(conn):
+    """Repopulate both shadow tables from students and courses. Does not commit."""
+    conn.execute("DELETE FROM students_fts")
+    conn.execute(f"""
+        INSERT INTO students_fts (rowid, {STUDENT_FTS_COLUMNS})
+        SELECT s.id, s.student_no, s.first_name, s.last_name, s.email, c.course_code, c.course_name
+        FROM students s
+        LEFT JOIN courses c ON s.course_id = c.id
+    """)
+    conn.execute("DELETE FROM courses_fts")
+    conn.execute(f"""
+        INSERT INTO courses_fts (rowid, {COURSE_FTS_COLUMNS})
+        SELECT id, course_code, course_name, lecturer FROM courses
+    """)
+    conn.execute("INSERT INTO students_fts (students_fts) VALUES ('optimize')")
+    conn.execute("INSERT INTO courses_fts (courses_fts) VALUES ('optimize')")
+
+
+@contextmanager
+def deferred_student_indexing(conn):
+    """Index students inserted in this block with one statement instead of per row.
+
+    Must run inside a transaction: the insert trigger is dropped and then
+    recreated before commit, so other connections never see it missing.
+    """
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM students").fetchone()[0]
+    conn.execute("DROP TRIGGER IF EXISTS students_fts_ai")
+    try:
+        yield
+    finally:
+        conn.execute(f"""
+            INSERT INTO students_fts (rowid, {STUDENT_FTS_COLUMNS})
+            SELECT s.id, s.student_no, s.first_name, s.last_name, s.email, c.course_code, c.course_name
+            FROM students s
+            LEFT JOIN courses c ON s.course_id = c.id
+            WHERE s.id > ?
+        """, (last_id,))
+        conn.execute(TRIGGERS[0])
+
+
+def can_use_index(term):
+    return len(term) >= MIN_TERM_LENGTH
+
+
+def match_phrase(term):
+    """Quote term as a single FTS5 phrase so user input is never parsed as query syntax"""
+    return '"' + term.replace('"', '""') + '"'
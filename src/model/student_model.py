@@ -1,114 +1,390 @@
 import os
 import datetime
+from contextlib import ExitStack
+from functools import lru_cache
+
+from db import migrate
+from model import audit_log, changes, course_stats, csv_export, csv_import, keyset, search_index
+from model.audit_model import record_event
+from model.course_model import CourseModel
+from model.records import StudentRow
+from query_registry import declare
+
+# Every student query reads these columns through the same join
+SELECT_STUDENTS = f"""
+        SELECT {StudentRow.COLUMNS}
+        FROM students s
+        LEFT JOIN courses c ON s.course_id = c.id
+"""
+
+# Default course_id for update_student: leave the student's course as it is
+KEEP_COURSE = object()
+
 
 class StudentModel:
+    # Audit log written by every instance; tests and benchmarks point it at a scratch file
+    LOG_FILE = os.path.join("logs", "student_audit.log")
+
+    # ------------------------------
+    # STATEMENTS
+    # ------------------------------
+    # Declared once so their text is identical on every call (see query_registry);
+    # statements assembled from a search condition are declared once per variant below.
+    INSERT = declare("students.insert", """
+        INSERT INTO students (student_no, first_name, last_name, email, course_id) VALUES (?, ?, ?, ?, ?)
+    """)
+    UPDATE = declare("students.update", """
+        UPDATE students
+        SET student_no = ?, first_name = ?, last_name = ?, email = ?, course_id = ?
+        WHERE id = ?
+    """)
+    UPDATE_KEEP_COURSE = declare("students.update_keep_course", """
+        UPDATE students
+        SET student_no = ?, first_name = ?, last_name = ?, email = ?
+        WHERE id = ?
+    """)
+    SELECT_FOR_DELETE = declare("students.select_for_delete", """
+        SELECT student_no, first_name, last_name, email, course_id FROM students WHERE id = ?
+    """)
+    DELETE = declare("students.delete", "DELETE FROM students WHERE id = ?")
+    GET = declare("students.get", SELECT_STUDENTS + """
+        WHERE s.id = ?
+    """)
+    GET_ALL = declare("students.all", SELECT_STUDENTS)
+    SEARCH_FTS = declare("students.search", f"""
+        SELECT {StudentRow.COLUMNS}
+        FROM students_fts f
+        JOIN students s ON s.id = f.rowid
+        LEFT JOIN courses c ON s.course_id = c.id
+        WHERE students_fts MATCH ?
+        ORDER BY f.rank
+    """)
+    SEARCH_LIKE = declare("students.search", SELECT_STUDENTS + """
+        WHERE s.student_no LIKE ? OR s.first_name LIKE ? OR s.last_name LIKE ? OR s.email LIKE ?
+    """)
+    IMPORT = declare("students.import", """
+        INSERT INTO students (student_no, first_name, last_name, email, phone, course_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """)
+    # Streamed through csv_export on the caller's connection, so not timed
+    EXPORT_SQL = """
+        SELECT s.id, s.student_no, s.first_name || ' ' || s.last_name, s.email, c.course_name
+        FROM students s
+        LEFT JOIN courses c ON s.course_id = c.id
+        ORDER BY s.id
+    """
+
+    # Conditions _search_condition picks from; each is part of the cache keys below
+    MATCH_ALL = "1"
+    MATCH_FTS = "s.id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)"
+    MATCH_LIKE = "(s.student_no LIKE ? OR s.first_name LIKE ? OR s.last_name LIKE ? OR s.email LIKE ?)"
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _count_query(condition):
+        return declare("students.count", f"SELECT COUNT(*) FROM students s WHERE {condition}")
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _window_query(condition):
+        return declare("students.window", SELECT_STUDENTS + f"""
+        WHERE {condition}
+        ORDER BY s.id
+        LIMIT ? OFFSET ?
+        """)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _seek_window_query(condition, backwards):
+        # Seeks from the row next to the window instead of counting past OFFSET rows
+        seek, direction = ("s.id < ?", "DESC") if backwards else ("s.id > ?", "ASC")
+        return declare("students.window", SELECT_STUDENTS + f"""
+        WHERE {seek} AND {condition}
+        ORDER BY s.id {direction}
+        LIMIT ?
+        """)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _search_rows_query(condition):
+        return declare("students.search_rows", SELECT_STUDENTS + f"""
+        WHERE {condition}
+        ORDER BY s.id
+        LIMIT ?
+        """)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _page_query(order_by, seek_kind, condition):
+        seek = keyset.seek_condition(seek_kind, f"s.{order_by}", "s.id")
+        return declare("students.page", SELECT_STUDENTS + f"""
+        WHERE {seek} AND {condition}
+        ORDER BY s.{order_by}, s.id
+        LIMIT ?
+        """)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _sort_value_query(order_by):
+        return declare("students.page_anchor", f"SELECT {order_by} FROM students WHERE id = ?")
+
     def __init__(self, db):
         self.db = db
         self.create_table()
-        self.log_file = os.path.join("logs", "student_audit.log")
-        os.makedirs("logs", exist_ok=True)
+        # Course names and ids come from the catalogue CourseModel keeps for this db
+        self.courses = CourseModel.catalog_for(db)
+        self.log_file = self.LOG_FILE
 
     def log_action(self, action, student_data):
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"{timestamp} | {action} | {student_data}\n"
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        # Queued for the shared background writer; never waits on the disk
+        audit_log.writer_for(self.log_file).log(action, student_data)
 
     def create_table(self):
-        """Create students table if it does not exist"""
-        query = """
-        CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_no TEXT UNIQUE,
-                first_name TEXT NOT NULL,
-                last_name TEXT NOT NULL,
-                email TEXT NOT NULL UNIQUE,
-                course_id INTEGER,
-                FOREIGN KEY(course_id) REFERENCES courses(id)
-        )
-        """
-        self.db.execute(query)
+        """Bring the shared schema (students, courses, indexes) up to date"""
+        migrate(self.db.conn)
+        self.fts_enabled = search_index.is_available(self.db.conn)
+
+    def rebuild_search_index(self):
+        """Repopulate the full-text index from the students and courses tables"""
+        if self.fts_enabled:
+            with self.db.transaction():
+                search_index.rebuild_search_index(self.db.conn)
 
     # ------------------------------
     # CRUD OPERATIONS
     # ------------------------------
     def add_student(self, student_no, first_name, last_name, email, course_id):
-        query = "INSERT INTO students (student_no, first_name, last_name, email, course_id) VALUES (?, ?, ?, ?, ?)"
-        self.db.execute(query, (student_no, first_name, last_name, email, course_id))
-        self.log_action("ADD", {
+        data = {
             "student_no": student_no,
             "first_name": first_name,
             "last_name": last_name,
             "email": email,
             "course_id": course_id
-        })
+        }
+        with self.db.transaction():
+            student_id = self.db.execute(self.INSERT, (student_no, first_name, last_name, email, course_id)).lastrowid
+            record_event(self.db, "student", "ADD", student_id, data)
+            row = self.get_student(student_id)
+            changes.publish_after_commit(self.db, "student", "insert", student_id, row)
+        self.log_action("ADD", data)
+        return row
 
-    def update_student(self, id, student_no, first_name, last_name, email, course_id):
-        query = """
-        UPDATE students
-        SET student_no = ?, first_name = ?, last_name = ?, email = ?, course_id = ?
-        WHERE id = ?
-        """
-        self.db.execute(query, (student_no, first_name, last_name, email, course_id, id))
-        self.log_action("UPDATE", {
+    def update_student(self, id, student_no, first_name, last_name, email, course_id=KEEP_COURSE):
+        """Update a student; with course_id left out its stored course, even a NULL or missing one, stays"""
+        data = {
             "id": id,
             "student_no": student_no,
             "first_name": first_name,
             "last_name": last_name,
             "email": email,
-            "course_id": course_id
-        })
+        }
+        if course_id is KEEP_COURSE:
+            query, params = self.UPDATE_KEEP_COURSE, (student_no, first_name, last_name, email, id)
+        else:
+            data["course_id"] = course_id
+            query, params = self.UPDATE, (student_no, first_name, last_name, email, course_id, id)
+        with self.db.transaction():
+            if self.db.execute(query, params).rowcount == 0:
+                return None  # no such student; nothing to audit
+            row = self.get_student(id)
+            record_event(self.db, "student", "UPDATE", id, data)
+            changes.publish_after_commit(self.db, "student", "update", id, row)
+        self.log_action("UPDATE", data)
+        return row
 
     def delete_student(self, student_id):
-        # Fetch student details before deletion for logging
-        row = self.db.fetchone("SELECT student_no, first_name, last_name, email, course_id FROM students WHERE id = ?", (student_id,))
-        query = "DELETE FROM students WHERE id = ?"
-        self.db.execute(query, (student_id,))
-        if row:
-            self.log_action("DELETE", {
+        """Delete a student; returns its id, or None if it did not exist"""
+        # Fetch student details before deletion for logging; read and delete commit together
+        with self.db.transaction():
+            row = self.db.fetchone(self.SELECT_FOR_DELETE, (student_id,))
+            if row is None:
+                return None
+            data = {
                 "id": student_id,
                 "student_no": row["student_no"],
                 "first_name": row["first_name"],
                 "last_name": row["last_name"],
                 "email": row["email"],
                 "course_id": row["course_id"]
-            })
+            }
+            self.db.execute(self.DELETE, (student_id,))
+            record_event(self.db, "student", "DELETE", student_id, data)
+            changes.publish_after_commit(self.db, "student", "delete", student_id)
+        self.log_action("DELETE", data)
+        return student_id
 
-    def get_all_students(self):
-        query = """
-        SELECT s.id, s.student_no, s.first_name, s.last_name, s.email, s.course_id, c.course_name
-        FROM students s
-        LEFT JOIN courses c ON s.course_id = c.id
-        """
-        rows = self.db.fetchall(query)
-        # Create a single 'name' field for the view
-        return [
-            {
-            "id": r["id"],
-            "student_no": r["student_no"],
-            "name": f"{r['first_name']} {r['last_name']}",
-            "email": r["email"],
-            "course": r["course_name"]
+    def get_student(self, student_id):
+        """Return one student as a StudentRow, or None"""
+        return self.db.fetch_record(StudentRow, self.GET, (student_id,))
 
-            }
-            for r in rows
-        ]
+
+    def get_all_students(self):
+        # Rows are StudentRow tuples; 'name' and 'course' are computed when read
+        return self.db.fetch_records(StudentRow, self.GET_ALL)
 
     def search_students(self, term):
-        query = """
-        SELECT s.id, s.student_no, s.first_name, s.last_name, s.email, c.course_name
-        FROM students s
-        LEFT JOIN courses c ON s.course_id = c.id
-        WHERE s.student_no LIKE ? OR s.first_name LIKE ? OR s.last_name LIKE ? OR s.email LIKE ?
-        """
+        if self.fts_enabled and search_index.can_use_index(term):
+            # Ranked full-text search through the trigram index
+            return self.db.fetch_records(StudentRow, self.SEARCH_FTS, (search_index.match_phrase(term),))
+
+        # Terms too short for trigrams fall back to a LIKE scan
         term_like = f"%{term}%" #This is safe due to parameterization
-        rows = self.db.fetchall(query, (term_like, term_like, term_like, term_like))
-        
-        return [
-            {"id": r[0], "student_no": f"{r[1]}", "name": f"{r[2]} {r[3]}", "email": r[4], "course": r[5]}
-            for r in rows
-        ]
+        return self.db.fetch_records(StudentRow, self.SEARCH_LIKE, (term_like, term_like, term_like, term_like))
+
     
+    # ------------------------------
+    # BULK IMPORT
+    # ------------------------------
+    IMPORT_COLUMNS = ("student_no", "first_name", "last_name", "email", "course")
+
+    def import_csv(self, source, batch_size=csv_import.DEFAULT_BATCH_SIZE):
+        """Bulk-load students from a CSV path or file.
+
+        Columns: student_no, first_name, last_name, email, course (the course
+        name) and an optional phone. Returns {"imported": n, "rejected": [...]}.
+        """
+        def prepare(values):
+            csv_import.check_required(values, self.IMPORT_COLUMNS)
+            student_no, first_name, last_name, email, course_name, phone = values
+            course_id = self.courses.id_for_name(course_name)
+            if course_id is None:
+                raise ValueError(f"Unknown course {course_name!r}")
+            return (student_no, first_name, last_name, email, phone or None, course_id)
+
+        with csv_import.open_csv(source) as reader:
+            result = csv_import.import_rows(self.db, reader, self.IMPORT_COLUMNS + ("phone",), prepare,
+                                           self.IMPORT, batch_size, self.deferred_insert_triggers)
+        summary = {"imported": result["imported"], "rejected": len(result["rejected"])}
+        # Each batch commits on its own, so the import is recorded once it has finished
+        record_event(self.db, "student", "IMPORT", None, summary)
+        self.log_action("IMPORT", summary)
+        if result["imported"]:
+            # One change for the whole file rather than one per row
+            changes.publish_after_commit(self.db, "student", "import", None)
+        return result
+
+    def deferred_insert_triggers(self):
+        """Context for a bulk insert inside a transaction: the search index and
+        enrolment counts are brought up to date once at the end, not per row"""
+        stack = ExitStack()
+        stack.enter_context(course_stats.deferred_student_counts(self.db.conn))
+        if self.fts_enabled:
+            stack.enter_context(search_index.deferred_student_indexing(self.db.conn))
+        return stack
+
+    # ------------------------------
+    # STREAMING EXPORT
+    # ------------------------------
+    EXPORT_HEADER = ["ID", "Student No", "Firstname Lastname", "Email", "Course"]
+
+    def export_csv(self, f, conn=None, **options):
+        """Stream every student into CSV file f; see csv_export.export_query for options.
+
+        conn lets a worker thread export through its own connection.
+        """
+        timestamp = datetime.datetime.now().strftime("%y%m%d%H%M%S")
+        return csv_export.export_query(conn or self.db.conn, self.EXPORT_SQL, self.EXPORT_HEADER, f,
+                                       preamble=[["Exported", timestamp]], **options)
+
+    # ------------------------------
+    # WINDOWED READS (virtual table)
+    # ------------------------------
+    def _search_condition(self, term):
+        """SQL condition and params shared by the windowed and paged student queries"""
+        if not term:
+            return self.MATCH_ALL, ()
+        if self.fts_enabled and search_index.can_use_index(term):
+            return self.MATCH_FTS, (search_index.match_phrase(term),)
+        term_like = f"%{term}%"
+        return self.MATCH_LIKE, (term_like, term_like, term_like, term_like)
+
+    def count_students(self, term=""):
+        """Number of students matching term (all students when term is empty)"""
+        condition, params = self._search_condition(term)
+        row = self.db.fetchone(self._count_query(condition), params)
+        return row[0]
+
+    def get_students_window(self, offset, limit, term="", after_id=None, before_id=None):
+        """Return at most limit students starting at offset, ordered by id.
+
+        after_id (or before_id) is the id of the row just before (or just
+        after) the window, e.g. the edge of a neighbouring window already
+        loaded. The window is then found by seeking on id, which costs the
+        same however deep it is; without either it is counted out with
+        OFFSET, for jumps to an arbitrary scroll position.
+        """
+        condition, params = self._search_condition(term)
+        if after_id is not None:
+            return self.db.fetch_records(StudentRow, self._seek_window_query(condition, False),
+                                         (after_id,) + params + (limit,))
+        if before_id is not None:
+            rows = self.db.fetch_records(StudentRow, self._seek_window_query(condition, True),
+                                         (before_id,) + params + (limit,))
+            rows.reverse()
+            return rows
+        return self.db.fetch_records(StudentRow, self._window_query(condition), params + (limit, offset))
+
+    # ------------------------------
+    # INCREMENTAL SEARCH
+    # ------------------------------
+    # Same columns as students_fts, so refining in memory matches what MATCH would return
+    REFINE_FIELDS = ("student_no", "first_name", "last_name", "email", "course_code", "course_name")
+
+    def search_rows(self, term, limit):
+        """Return up to limit matching students with every searchable field.
+
+        Result is {"rows": [...], "complete": bool}; a complete result can be
+        narrowed with refine() as the user keeps typing.
+        """
+        condition, params = self._search_condition(term)
+        rows = self.db.fetch_records(StudentRow, self._search_rows_query(condition), params + (limit + 1,))
+        return {"rows": rows[:limit], "complete": len(rows) <= limit}
+
+    def can_refine(self, previous_term, term):
+        """True when the matches for term are a subset of those for previous_term"""
+        # Short terms use LIKE over fewer columns, so only index-backed results refine exactly
+        return (self.fts_enabled and search_index.can_use_index(previous_term)
+                and previous_term.lower() in term.lower())
+
+    def refine(self, rows, term):
+        """Filter rows from search_rows down to those matching the longer term"""
+        needle = term.lower()
+        fields = self.REFINE_FIELDS
+        return [r for r in rows if any(needle in (getattr(r, f) or "").lower() for f in fields)]
+
+    # ------------------------------
+    # KEYSET PAGINATION
+    # ------------------------------
+    # Only columns backed by an index, so each page is a seek rather than a scan
+    PAGE_ORDER_COLUMNS = ("id", "student_no", "email")
+
+    def page(self, after_id=None, limit=100, order_by="id", term="", after_value=keyset.UNSET):
+        """Return the page of students that follows the row (after_value, after_id) in order_by order.
+
+        Result is {"rows": [...], "has_more": bool, "last_id": id or None,
+        "last_value": the last row's order_by value}; pass them back as
+        after_id and after_value to fetch the next page. That keeps working
+        when the last row has been deleted meanwhile. Without after_value
+        it is looked up from after_id, which fails if that row is gone.
+        """
+        if order_by not in self.PAGE_ORDER_COLUMNS:
+            raise ValueError(f"Cannot page students by {order_by!r}")
+        condition, params = self._search_condition(term)
+
+        if after_id is not None and order_by != "id" and after_value is keyset.UNSET:
+            row = self.db.fetchone(self._sort_value_query(order_by), (after_id,))
+            if row is None:
+                raise ValueError(f"Student {after_id} no longer exists; pass the page's last_value "
+                                 "as after_value to continue after it")
+            after_value = row[0]
+        seek_kind, seek_params = keyset.seek(order_by, after_id, after_value)
+        query = self._page_query(order_by, seek_kind, condition)
+        # One extra row tells us whether another page exists
+        rows = self.db.fetch_records(StudentRow, query, seek_params + params + (limit + 1,))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {"rows": rows, "has_more": has_more, "last_id": rows[-1].id if rows else None,
+                "last_value": getattr(rows[-1], order_by) if rows else None}
+
     def get_course_name(self, course_id):
-        row = self.db.fetchone("SELECT course_name FROM courses WHERE id = ?", (course_id,))
-        return row["course_name"] if row else ""
\ No newline at end of file
+        return self.courses.name_for_id(course_id) or ""
\ No newline at end of file
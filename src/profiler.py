@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+
+# Statement texts kept per operation for the trace, beyond which only the count grows
+MAX_SQL_SAMPLES = 20
+
+
+class Operation:
+    """One model call traced from the request on the Tk thread to its callback.
+
+    Times are in seconds: queued waiting for the worker, model for the
+    model method on the worker, of which sql inside Database statements,
+    and tk for the callback that updates the widgets.
+    """
+
+    __slots__ = ("name", "thread", "requested", "queued", "model", "sql", "tk", "total",
+                 "statements", "rows", "sql_samples", "outcome")
+
+    def __init__(self, name):
+        self.name = name
+        self.thread = threading.get_ident()
+        self.requested = time.perf_counter()
+        self.queued = self.model = self.sql = self.tk = self.total = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.sql_samples = []
+        self.outcome = "ok"
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "total_ms": self.total * 1000,
+            "queued_ms": self.queued * 1000,
+            "sql_ms": self.sql * 1000,
+            # Python time in the model: building rows, catalogue lookups, audit payloads
+            "python_ms": max(self.model - self.sql, 0.0) * 1000,
+            "tk_ms": self.tk * 1000,
+            "statements": self.statements,
+            "rows": self.rows,
+            "outcome": self.outcome,
+        }
+
+
+class Profiler:
+    """Opt-in timing of model calls, their SQL and the Tk callbacks they feed.
+
+    Off by default; while disabled every hook is a single attribute check.
+    When enabled, QueryExecutor turns each call into an Operation: the
+    worker's model method is timed, Database reports each statement's time
+    and rows, sqlite3's trace callback counts every statement the
+    connection runs (including triggers and helpers that bypass Database),
+    and the callback on the Tk thread is timed last. The latest operations
+    are kept for the performance panel, and every span can be appended to
+    a trace file: one Chrome trace event per line, which chrome_trace()
+    wraps into a file Perfetto or chrome://tracing opens as a timeline.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.history = deque(maxlen=200)
+        self.completed = 0  # operations finished so far, lets the panel skip redraws
+        self.databases = weakref.WeakSet()
+        self.trace_file = None
+        self.trace_path = None
+        # Trace timestamps are wall-clock microseconds, so traces from several runs line up
+        self.epoch = time.perf_counter()
+        self.epoch_us = time.time() * 1e6
+        self.pid = os.getpid()
+
+    def configure(self, enabled=False, history=200, trace_file=None):
+        """Apply the "profiling" section of config.json"""
+        with self.lock:
+            self.history = deque(self.history, maxlen=history)
+        self.set_trace_file(trace_file)
+        if enabled:
+            self.enable()
+        else:
+            self.disable()
+
+    def enable(self):
+        self.enabled = True
+        for db in list(self.databases):
+            self._watch_statements(db, True)
+
+    def disable(self):
+        self.enabled = False
+        for db in list(self.databases):
+            self._watch_statements(db, False)
+
+    def set_trace_file(self, path):
+        """Append trace events to path from now on; None stops tracing"""
+        with self.lock:
+            if self.trace_file is not None:
+                self.trace_file.close()
+            self.trace_file = self.trace_path = None
+            if path:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.trace_file = open(path, "a", encoding="utf-8")
+                self.trace_path = path
+
+    def close(self):
+        self.disable()
+        self.set_trace_file(None)
+
+    # ------------------------------
+    # CONNECTIONS
+    # ------------------------------
+    def attach(self, db):
+        """Count the statements db runs whenever profiling is enabled"""
+        self.databases.add(db)
+        if self.enabled:
+            self._watch_statements(db, True)
+
+    def _watch_statements(self, db, watch):
+        try:
+            db.conn.set_trace_callback(self._on_statement if watch else None)
+        except Exception:
+            pass  # closed, or owned by another thread; it is picked up when next attached
+
+    def _on_statement(self, sql):
+        op = getattr(self.local, "operation", None)
+        if op is not None:
+            op.statements += 1
+            if len(op.sql_samples) < MAX_SQL_SAMPLES:
+                op.sql_samples.append(sql.strip())
+
+    # ------------------------------
+    # OPERATIONS
+    # ------------------------------
+    def start(self, name):
+        """A new Operation for name, or None when profiling is off"""
+        return Operation(name) if self.enabled else None
+
+    @contextmanager
+    def phase(self, op, phase, name=None):
+        """Time one phase of op ("model" on the worker, "tk" on the Tk thread).
+
+        Statements run meanwhile on this thread are counted against op.
+        """
+        if op is None:
+            yield
+            return
+        previous = getattr(self.local, "operation", None)
+        self.local.operation = op
+        started = time.perf_counter()
+        if phase == "model":
+            op.queued = started - op.requested
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.local.operation = previous
+            setattr(op, phase, getattr(op, phase) + seconds)
+            self._emit(name or op.name, phase, started, seconds)
+
+    def finish(self, op, outcome="ok"):
+        if op is None:
+            return
+        op.total = time.perf_counter() - op.requested
+        op.outcome = outcome
+        with self.lock:
+            self.history.append(op)
+            self.completed += 1
+        self._emit(op.name, "operation", op.requested, op.total,
+                   dict(op.as_dict(), sql=op.sql_samples), thread=op.thread)
+
+    def recent(self):
+        """The latest operations as dicts, newest first"""
+        with self.lock:
+            operations = list(self.history)
+        return [op.as_dict() for op in reversed(operations)]
+
+    def clear(self):
+        with self.lock:
+            self.history.clear()
+            self.completed += 1
+
+    # ------------------------------
+    # SPANS
+    # ------------------------------
+    def record_sql(self, name, started, seconds, rows):
+        """Called by Database after each statement it runs while profiling is on"""
+        op = getattr(self.local, "operation", None)
+        if op is not None:
+            op.sql += seconds
+            op.rows += rows
+        self._emit(name, "sql", started, seconds, {"rows": rows})
+
+    @contextmanager
+    def span(self, name, category="python"):
+        """Time a block of code into the trace, e.g. a view method; a no-op while disabled"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._emit(name, category, started, time.perf_counter() - started)
+
+    def _emit(self, name, category, started, seconds, args=None, thread=None):
+        if self.trace_file is None:
+            return
+        event = {"name": name, "cat": category, "ph": "X",
+                 "ts": round(self.epoch_us + (started - self.epoch) * 1e6, 1), "dur": round(seconds * 1e6, 1),
+                 "pid": self.pid, "tid": thread or threading.get_ident()}
+        if args:
+            event["args"] = args
+        line = json.dumps(event, default=str) + "\n"
+        with self.lock:
+            if self.trace_file is not None:
+                self.trace_file.write(line)
+                self.trace_file.flush()
+
+
+def chrome_trace(jsonl_path, output_path):
+    """Wrap a JSON-lines trace into the {"traceEvents": [...]} file timeline viewers load"""
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+
+profiler = Profiler()
+
+
+# ------------------------------
+# CONVERT TRACE
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a JSON-lines profiler trace for Perfetto or chrome://tracing")
+    parser.add_argument("trace", help="trace file written with profiling enabled")
+    parser.add_argument("output", help="JSON file to write")
+    args = parser.parse_args()
+    print(f"Wrote {chrome_trace(args.trace, args.output)} events to {args.output}")
@@ -0,0 +1,176 @@
+import queue
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+from db import ConnectionPool
+from profiler import profiler
+
+
+class QueryExecutor:
+    """Runs model calls on a worker thread so the Tk main loop never waits on SQLite.
+
+    The worker checks connections out of a ConnectionPool per call: keyed
+    requests, which are reads, take a read-only connection and everything
+    else the writer. Models are built once per connection. Results come back to the Tk thread by polling a queue with after(), so
+    callbacks may touch widgets. Requests sharing a key supersede each
+    other: only the newest one delivers its result, and an older one still
+    queued or running is cancelled (running SQL is aborted through a
+    progress handler). Keys are therefore meant for reads, never writes.
+    """
+
+    POLL_MS = 15
+    # SQLite virtual machine steps between checks for a superseded request
+    PROGRESS_STEPS = 1000
+
+    def __init__(self, root, db_file=None, tuning=None, pool=None):
+        """Run calls against pool, or against a pool of its own over db_file"""
+        self.root = root
+        self.owns_pool = pool is None
+        self.connections = pool or ConnectionPool(db_file, tuning, readers=1)
+        # One worker keeps writes in the order they were requested
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-worker")
+        self.completed = queue.SimpleQueue()
+        self.pending = 0
+        self.generations = {}
+        self.busy_listeners = []
+        self.polling = False
+
+    # ------------------------------
+    # WORKER SIDE
+    # ------------------------------
+    def _run(self, model_class, method, args, key, generation, op):
+        if key is not None and self.generations.get(key) != generation:
+            raise CancelledError()  # superseded before it started
+        with self.connections.connection(write=key is None) as db, profiler.phase(op, "model"):
+            model = db.model(model_class)
+            if key is None:
+                return getattr(model, method)(*args)
+            # A non-zero return interrupts the statement as soon as a newer request arrives;
+            # the pool clears the handler on checkin
+            db.conn.set_progress_handler(lambda: self.generations.get(key) != generation, self.PROGRESS_STEPS)
+            return getattr(model, method)(*args)
+
+    # ------------------------------
+    # TK SIDE
+    # ------------------------------
+    def call(self, model_class, method, *args, callback=None, errback=None, key=None):
+        """Run model_class(db).method(*args) on the worker thread.
+
+        callback(result) or errback(exception) is then called on the Tk
+        thread. Returns a concurrent.futures.Future.
+        """
+        generation = None
+        if key is not None:
+            generation = self.generations[key] = self.generations.get(key, 0) + 1
+        # Traced from here to the end of the callback when profiling is on
+        op = profiler.start(f"{model_class.__name__}.{method}")
+        future = self.pool.submit(self._run, model_class, method, args, key, generation, op)
+        self._set_pending(self.pending + 1)
+        future.add_done_callback(
+            lambda f: self.completed.put((f, callback, errback, key, generation, op))
+        )
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.POLL_MS, self._poll)
+        return future
+
+    def cancel(self, key):
+        """Supersede every outstanding request with this key without sending a new one"""
+        if key in self.generations:
+            self.generations[key] += 1
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    future, callback, errback, key, generation, op = self.completed.get_nowait()
+                except queue.Empty:
+                    break
+                self._set_pending(self.pending - 1)
+                if key is not None and generation != self.generations.get(key):
+                    profiler.finish(op, "superseded")
+                    continue  # superseded by a newer request with the same key
+                with profiler.phase(op, "tk"):
+                    _deliver(future, callback, errback, self.root.report_callback_exception)
+                profiler.finish(op, "error" if future.exception() is not None else "ok")
+        finally:
+            # Whatever went wrong above, later results must still be delivered
+            if self.pending:
+                self.root.after(self.POLL_MS, self._poll)
+            else:
+                self.polling = False
+
+    def add_busy_listener(self, listener):
+        """listener(busy) is called on the Tk thread whenever work starts or drains"""
+        self.busy_listeners.append(listener)
+
+    def _set_pending(self, pending):
+        was_busy = self.pending > 0
+        self.pending = pending
+        if was_busy != (pending > 0):
+            for listener in self.busy_listeners:
+                try:
+                    listener(pending > 0)
+                except Exception as e:
+                    # A broken listener must not stop the call or the delivery of results
+                    self.root.report_callback_exception(type(e), e, e.__traceback__)
+
+    def shutdown(self):
+        """Finish queued work, then close the pool if the executor opened it"""
+        self.pool.shutdown(wait=True)
+        if self.owns_pool:
+            self.connections.close()
+
+
+class InlineExecutor:
+    """QueryExecutor stand-in that runs calls immediately on the calling thread.
+
+    Used when views are built without a worker, e.g. over an in-memory
+    database that another connection cannot open.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.models = {}
+
+    def call(self, model_class, method, *args, callback=None, errback=None, key=None):
+        model = self.models.get(model_class)
+        if model is None:
+            model = self.models[model_class] = model_class(self.db)
+        op = profiler.start(f"{model_class.__name__}.{method}")
+        future = Future()
+        try:
+            with profiler.phase(op, "model"):
+                future.set_result(getattr(model, method)(*args))
+        except Exception as e:
+            future.set_exception(e)
+        try:
+            with profiler.phase(op, "tk"):
+                _deliver(future, callback, errback, None)
+        finally:
+            profiler.finish(op, "error" if future.exception() is not None else "ok")
+        return future
+
+    def cancel(self, key):
+        pass
+
+    def add_busy_listener(self, listener):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+def _deliver(future, callback, errback, report):
+    """Hand a finished future to its callback or errback"""
+    try:
+        error = future.exception()
+        if error is not None:
+            if errback is None:
+                raise error
+            errback(error)
+        elif callback is not None:
+            callback(future.result())
+    except Exception as e:
+        if report is None:
+            raise
+        report(type(e), e, e.__traceback__)
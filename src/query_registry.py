@@ -0,0 +1,112 @@
+import threading
+from collections import deque, namedtuple
+
+# Latest timings kept per query for percentiles
+SAMPLES_PER_QUERY = 1024
+# Statements cached per connection at least, whatever has been declared so far
+MIN_STATEMENT_CACHE = 128
+# Name used for SQL passed as plain text rather than a declared Query
+AD_HOC = "(ad hoc)"
+
+
+class Query(namedtuple("Query", "name sql")):
+    """A named SQL statement. Database methods accept one wherever they take SQL text."""
+    __slots__ = ()
+
+
+class QueryRegistry:
+    """Declared statements plus the timing of every call made through them.
+
+    Models declare their SQL once, at import time (or once per variant for
+    statements assembled from parts), so each statement's text is built
+    once and stays identical between calls. That is what sqlite3's
+    per-connection statement cache keys on, so repeated calls skip
+    re-preparing the statement. Database times each execution and records
+    it here under the query's name. snapshot() then shows which model
+    methods dominate the load.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = {}  # (name, sql) -> Query
+        self.stats = {}    # name -> _QueryStats
+
+    def declare(self, name, sql):
+        """The Query for name and sql, registered on first use.
+
+        Variants of one statement (e.g. different WHERE clauses) share a
+        name, so they are timed together.
+        """
+        key = (name, sql)
+        query = self.queries.get(key)
+        if query is None:
+            with self.lock:
+                query = self.queries.setdefault(key, Query(name, sql))
+        return query
+
+    def statement_cache_size(self):
+        """Per-connection statement cache that fits every declared statement, with room for variants"""
+        return max(MIN_STATEMENT_CACHE, 2 * len(self.queries))
+
+    # ------------------------------
+    # TIMING
+    # ------------------------------
+    def record(self, name, seconds, rows):
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = _QueryStats()
+            stats.calls += 1
+            stats.rows += rows
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.samples.append(seconds)
+
+    def snapshot(self, top=None):
+        """Per-query calls, rows and latency (ms), the most total time first"""
+        with self.lock:
+            entries = [(name, stats.calls, stats.rows, stats.total, stats.max, sorted(stats.samples))
+                       for name, stats in self.stats.items()]
+        report = []
+        for name, calls, rows, total, longest, samples in entries:
+            report.append({
+                "name": name,
+                "calls": calls,
+                "rows": rows,
+                "total_ms": total * 1000,
+                "mean_ms": total / calls * 1000,
+                "p50_ms": _percentile(samples, 50) * 1000,
+                "p95_ms": _percentile(samples, 95) * 1000,
+                "p99_ms": _percentile(samples, 99) * 1000,
+                "max_ms": longest * 1000,
+            })
+        report.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        return report[:top] if top else report
+
+    def reset(self):
+        """Forget all timings; declared statements are kept"""
+        with self.lock:
+            self.stats.clear()
+
+
+class _QueryStats:
+    __slots__ = ("calls", "rows", "total", "max", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLES_PER_QUERY)
+
+
+def _percentile(samples, percent):
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    rank = max(1, -(-len(samples) * percent // 100))  # ceiling division
+    return samples[int(rank) - 1]
+
+
+registry = QueryRegistry()
+declare = registry.declare
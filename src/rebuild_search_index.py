@@ -0,0 +1,30 @@
+import sys
+
+from db import SEARCH_INDEX_VERSION, Database, load_config
+from model import search_index
+
+
+def rebuild_search_index():
+    """Rebuild the full-text search index of the application database"""
+    db = Database(tuning=load_config().get("database"))
+    try:
+        # Opening an older database has just created and filled the index while migrating
+        indexed_before = db.migrated_from >= SEARCH_INDEX_VERSION and search_index.is_available(db.conn)
+        with db.transaction():
+            # Builds and fills a missing index, e.g. after upgrading to an SQLite with FTS5
+            if not search_index.ensure_search_index(db.conn):
+                print("This SQLite build has no FTS5 trigram support; search uses LIKE scans.")
+                return False
+            if indexed_before:
+                search_index.rebuild_search_index(db.conn)
+        students = db.fetchone("SELECT COUNT(*) FROM students_fts")[0]
+        courses = db.fetchone("SELECT COUNT(*) FROM courses_fts")[0]
+        print(f"Search index rebuilt: {students} students, {courses} courses")
+        return True
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    success = rebuild_search_index()
+    sys.exit(0 if success else 1)
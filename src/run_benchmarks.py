@@ -0,0 +1,320 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from db import ConnectionPool, Database
+from generate_data import DEFAULT_SEED, SIZES, generate, generate_students
+from model import audit_log
+from model.course_model import CourseModel
+from model.student_model import StudentModel
+
+BASELINE_FILE = "benchmark_baseline.json"
+DATASET_DIR = os.path.join("data", "benchmarks")
+DEFAULT_REPEAT = 5
+# A benchmark regresses when its median is this much slower than the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and slower by at least this many milliseconds, so timer noise on fast ones is ignored
+NOISE_FLOOR_MS = 2.0
+IMPORT_ROWS = 1000
+# Large enough to span several import batches, so throughput falling as the table grows shows up
+IMPORT_BULK_ROWS = 20_000
+
+
+# ------------------------------
+# DATASETS
+# ------------------------------
+def dataset_path(size, seed):
+    """The generated database for a preset, created on first use and reused after"""
+    path = os.path.join(DATASET_DIR, f"students-{size}-seed{seed}.db")
+    if not os.path.exists(path):
+        os.makedirs(DATASET_DIR, exist_ok=True)
+        students, courses = SIZES[size]
+        print(f"Generating {students} students and {courses} courses into {path}...")
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        db = Database(partial)
+        try:
+            generate(db, students, courses, seed)
+            db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            db.close()
+        os.replace(partial, path)
+    return path
+
+
+# ------------------------------
+# BENCHMARKS
+# ------------------------------
+class BenchmarkSuite:
+    """Times model and view operations against a scratch copy of a generated dataset.
+
+    Each benchmark runs once to warm caches, then repeat times; results
+    are per-benchmark milliseconds (min, median, mean, max). Writes go to
+    the copy, so the generated dataset stays identical between runs.
+    """
+
+    def __init__(self, db_file, students, repeat=DEFAULT_REPEAT, work_dir=None):
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix="benchmarks-")
+        self.db_file = os.path.join(self.work_dir, "bench.db")
+        shutil.copyfile(db_file, self.db_file)
+        self.students = students
+        self.repeat = repeat
+        self.db = Database(self.db_file)
+        # Audit entries from the timed writes go to the scratch directory, not logs/
+        StudentModel.LOG_FILE = os.path.join(self.work_dir, "student_audit.log")
+        self.student_model = StudentModel(self.db)
+        self.course_model = CourseModel(self.db)
+        self.course_id = self.course_model.get_all_courses()[0].id
+        self.next_student = students + 1
+        self.results = {}
+
+    def close(self):
+        self.db.close()
+        audit_log.close_all()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def timed(self, name, run):
+        """Record run()'s timings under name; run may return extra details to keep"""
+        details = run()
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            details = run()
+            samples.append((time.perf_counter() - started) * 1000)
+        self.results[name] = {
+            "min_ms": min(samples),
+            "median_ms": statistics.median(samples),
+            "mean_ms": statistics.fmean(samples),
+            "max_ms": max(samples),
+            "runs": len(samples),
+        }
+        if isinstance(details, dict):
+            self.results[name].update(details)
+        print(f"  {name:<28} median {self.results[name]['median_ms']:9.2f} ms")
+
+    def skip(self, name, reason):
+        self.results[name] = {"skipped": reason}
+        print(f"  {name:<28} skipped: {reason}")
+
+    def run_all(self, include_view=True):
+        model = self.student_model
+        self.timed("get_all_students", lambda: {"rows": len(model.get_all_students())})
+        self.timed("search_students_index", lambda: {"rows": len(model.search_students("smith"))})
+        self.timed("search_students_short", lambda: {"rows": len(model.search_students("ol"))})
+        self.timed("search_rows", lambda: {"rows": len(model.search_rows("smith", 5000)["rows"])})
+        self.timed("count_students", lambda: model.count_students())
+        self.timed("page_first", lambda: {"rows": len(model.page(None, 100)["rows"])})
+        last_page_after = max(self.students - 100, 1)
+        self.timed("page_deep_by_email", lambda: {"rows": len(model.page(last_page_after, 100, "email")["rows"])})
+        self.timed("window_deep_offset", lambda: {"rows": len(model.get_students_window(last_page_after, 100))})
+        # Generated ids run 1..students, so the row before offset n has id n
+        self.timed("window_deep_seek",
+                   lambda: {"rows": len(model.get_students_window(last_page_after, 100, after_id=last_page_after))})
+        self.timed("student_crud", self.student_crud)
+        self.timed("course_stats", lambda: len(self.course_model.get_course_stats()))
+        self.timed("export_csv", self.export_csv)
+        self.timed("import_csv", self.import_csv)
+        self.timed("import_csv_bulk", lambda: self.import_csv(IMPORT_BULK_ROWS))
+        if include_view:
+            self.view_refresh()
+        return self.results
+
+    def student_crud(self):
+        n = self._take_student_numbers(1)
+        row = self.student_model.add_student(f"B{n}", "Bench", "Mark", f"bench{n}@example.edu", self.course_id)
+        self.student_model.update_student(row.id, f"B{n}", "Bench", "Marked", f"bench{n}@example.edu", self.course_id)
+        self.student_model.get_student(row.id)
+        self.student_model.delete_student(row.id)
+
+    def export_csv(self):
+        with open(os.path.join(self.work_dir, "export.csv"), "w", newline="", encoding="utf-8") as f:
+            return {"rows": self.student_model.export_csv(f)}
+
+    def import_csv(self, count=IMPORT_ROWS):
+        path = os.path.join(self.work_dir, "import.csv")
+        start = self._take_student_numbers(count)
+        names = {c.id: c.course_name for c in self.course_model.get_all_courses()}
+        # Same generator as the dataset, seeded per batch so every run imports comparable rows
+        rows = generate_students(count, list(names), random.Random(start), start=start)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(StudentModel.IMPORT_COLUMNS + ("phone",))
+            for student_no, first, last, email, phone, course_id in rows:
+                writer.writerow((student_no, first, last, email, names[course_id], phone or ""))
+        started = time.perf_counter()
+        result = self.student_model.import_csv(path)
+        return {"rows": result["imported"], "rows_per_s": round(result["imported"] / (time.perf_counter() - started))}
+
+    def _take_student_numbers(self, count):
+        first = self.next_student
+        self.next_student += count
+        return first
+
+    def view_refresh(self):
+        """Time the student tab's full reload and a search through it, with the root window withdrawn"""
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+        except Exception as e:  # no display; run under xvfb-run on a headless machine
+            self.skip("view_refresh", f"Tk unavailable ({e})")
+            self.skip("view_search", f"Tk unavailable ({e})")
+            return
+        from query_executor import QueryExecutor
+        from view.change_dispatcher import ChangeDispatcher
+        from view.student_view import StudentView
+
+        root.withdraw()
+        pool = ConnectionPool(self.db_file, readers=2)
+        executor = QueryExecutor(root, pool=pool)
+        changes = ChangeDispatcher(root)
+        try:
+            view = StudentView(root, pool, "config.json", executor, changes)
+            view.pack(fill="both", expand=True)
+            _settle(root, executor)
+
+            def show(term):
+                view.show_students(term)
+                _settle(root, executor)
+
+            self.timed("view_refresh", lambda: show(""))
+            self.timed("view_search", lambda: show("smith"))
+        finally:
+            executor.shutdown()
+            changes.close()
+            pool.close()
+            root.destroy()
+
+
+def _settle(root, executor):
+    """Run the Tk loop until every query the view sent has been delivered"""
+    root.update()
+    while executor.pending:
+        time.sleep(0.001)
+        root.update()
+    root.update_idletasks()
+
+
+# ------------------------------
+# BASELINE
+# ------------------------------
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, noise_floor_ms=NOISE_FLOOR_MS):
+    """Compare each benchmark's median with the baseline.
+
+    Returns (name, baseline_ms, current_ms, change) rows for benchmarks in
+    both, and the names that regressed. unmeasured() lists the rest.
+    """
+    rows, regressions = [], []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or "median_ms" not in current or "median_ms" not in previous:
+            continue
+        before, after = previous["median_ms"], current["median_ms"]
+        change = (after - before) / before if before else 0.0
+        rows.append((name, before, after, change))
+        if change > tolerance and after - before > noise_floor_ms:
+            regressions.append(name)
+    return rows, regressions
+
+
+def unmeasured(results, baseline):
+    """Benchmarks measured now that the baseline has no timing for, e.g. view ones saved without a display"""
+    return [name for name, current in results.items()
+            if "median_ms" in current and "median_ms" not in baseline.get(name, {})]
+
+
+def load_baseline(path, size):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get(size)
+
+
+def save_baseline(path, size, report):
+    """Store report as the size's baseline.
+
+    Skipped benchmarks are listed under "missing" with the reason rather
+    than kept as results, so a skip is never the reference a later run is
+    measured against.
+    """
+    results = report["results"]
+    report = dict(report, results={name: r for name, r in results.items() if "skipped" not in r})
+    report["missing"] = {name: r["skipped"] for name, r in results.items() if "skipped" in r}
+    baselines = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+    baselines[size] = report
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=4)
+
+
+def run_benchmarks(size="10k", seed=DEFAULT_SEED, repeat=DEFAULT_REPEAT, output=None, baseline_file=BASELINE_FILE,
+                   save=False, tolerance=DEFAULT_TOLERANCE, include_view=True):
+    """Run the suite on a preset dataset; returns True unless something regressed against the baseline"""
+    students, courses = SIZES[size]
+    suite = BenchmarkSuite(dataset_path(size, seed), students, repeat)
+    print(f"Benchmarking {students} students, {courses} courses (seed {seed}), {repeat} runs each")
+    try:
+        results = suite.run_all(include_view)
+    finally:
+        suite.close()
+
+    report = {
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "size": size, "seed": seed, "students": students, "courses": courses, "repeat": repeat,
+        "python": platform.python_version(), "sqlite": sqlite3.sqlite_version, "platform": platform.platform(),
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"Results written to {output}")
+
+    if save:
+        save_baseline(baseline_file, size, report)
+        print(f"Saved as the {size} baseline in {baseline_file}")
+        return True
+    baseline = load_baseline(baseline_file, size)
+    if baseline is None:
+        print(f"No {size} baseline in {baseline_file}; run with --save-baseline to store one")
+        return True
+    rows, regressions = compare(results, baseline["results"], tolerance)
+    print(f"\nAgainst the baseline from {baseline['created_at']}:")
+    for name, before, after, change in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"  {name:<28} {before:9.2f} -> {after:9.2f} ms  {change:+7.1%}{flag}")
+    missing = baseline.get("missing", {})
+    for name in unmeasured(results, baseline["results"]):
+        reason = f" ({missing[name]})" if name in missing else ""
+        print(f"  {name:<28} not in the baseline{reason}; save a baseline with it measured to compare")
+    if regressions:
+        print(f"{len(regressions)} benchmarks regressed by more than {tolerance:.0%}: {', '.join(regressions)}")
+    return not regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time model and view operations on a generated dataset")
+    parser.add_argument("--size", choices=SIZES, default="10k")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", help="write the results as JSON here")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline file to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="fractional slowdown of a median that counts as a regression")
+    parser.add_argument("--no-view", action="store_true", help="skip the Tk view benchmarks")
+    args = parser.parse_args()
+    success = run_benchmarks(args.size, args.seed, args.repeat, args.output, args.baseline, args.save_baseline,
+                             args.tolerance, not args.no_view)
+    sys.exit(0 if success else 1)
@@ -49,4 +49,8 @@ def run_tests():
 
 if __name__ == "__main__":
     success = run_tests()
+    # Timings on a generated dataset, compared with the stored baseline
+    if "--benchmark" in sys.argv:
+        from run_benchmarks import run_benchmarks
+        success = run_benchmarks() and success
     sys.exit(0 if success else 1)
\ No newline at end of file
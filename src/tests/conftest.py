@@ -7,31 +7,21 @@ import sys
 print("Setting up Python path for module imports...")
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-class TestDatabase:
-    """Creating test database class that mimics our main Database class"""
+from db import Database
+from model import audit_log
+from model.student_model import StudentModel
+
+class TestDatabase(Database):
+    """Creating test database class built on our main Database class"""
     
     def __init__(self, db_path=":memory:"):
         # Using in-memory database for isolated testing
         print("Initializing in-memory test database...")
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
+        super().__init__(db_path)
         print("Test database connection established successfully")
-        
-    def execute(self, query, params=()):
-        """Executing SQL queries with parameter binding"""
-        self.cursor.execute(query, params)
-        self.conn.commit()
-        
-    def fetchall(self, query, params=()):
-        """Fetching all results from database query"""
-        self.cursor.execute(query, params)
-        return self.cursor.fetchall()
-        
-    def fetchone(self, query, params=()):
-        """Fetching single result from database query"""
-        self.cursor.execute(query, params)
-        return self.cursor.fetchone()
+
+    def setup(self):
+        """Leaving the schema to setup_test_database; models migrate it when created"""
         
     def close(self):
         """Closing database connection"""
@@ -59,6 +49,13 @@ def test_database():
     print("Cleaning up test database resources...")
     db.close()
 
+@pytest.fixture(autouse=True)
+def scratch_audit_log(tmp_path, monkeypatch):
+    """Sending the student audit log to the test's own directory instead of logs/"""
+    monkeypatch.setattr(StudentModel, "LOG_FILE", str(tmp_path / "student_audit.log"))
+    yield
+    audit_log.close_all()
+
 def setup_test_database(db):
     """
     Setting up test data that matches our actual application structure
@@ -0,0 +1,103 @@
+import asyncio
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from db import Database
+from api_server import ApiServer
+
+@pytest.fixture
+def api(tmp_path):
+    """An ApiServer on a free port over a seeded database file, run on its own event loop"""
+    db = Database(str(tmp_path / "api.db"))
+    db.execute("INSERT INTO courses (course_code, course_name, lecturer, credits) VALUES ('CS101', 'Computing', 'Dr. Ada', 3)")
+    db.execute("INSERT INTO students (student_no, first_name, last_name, email, course_id) "
+               "VALUES ('S1', 'John', 'Doe', 'john@test.edu', 1)")
+    db.close()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = ApiServer(str(tmp_path / "api.db"), port=0, workers=4)
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+def request(server, method, path, body=None, conn=None):
+    conn = conn or http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+    conn.request(method, path, body=None if body is None else json.dumps(body),
+                 headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+class TestApiServer:
+    """Testing the HTTP/JSON API over the controllers"""
+
+    def test_student_crud(self, api):
+        status, student = request(api, "POST", "/students", {
+            "student_no": "S2", "first_name": "Ada", "last_name": "Lovelace", "email": "ada@test.edu", "course_code": "CS101"})
+        assert status == 201
+        assert student["course_name"] == "Computing" and student["name"] == "Ada Lovelace"
+
+        assert request(api, "GET", f"/students/{student['id']}")[1]["email"] == "ada@test.edu"
+        status, updated = request(api, "PATCH", f"/students/{student['id']}", {"last_name": "Byron"})
+        assert status == 200 and updated["last_name"] == "Byron"
+        assert request(api, "DELETE", f"/students/{student['id']}") == (200, {"id": student["id"]})
+        assert request(api, "GET", f"/students/{student['id']}")[0] == 404
+
+    def test_list_search_and_stats(self, api):
+        status, page = request(api, "GET", "/students?limit=10")
+        assert status == 200 and [r["student_no"] for r in page["rows"]] == ["S1"] and not page["has_more"]
+        assert request(api, "GET", "/students/search?q=doe")[1]["rows"][0]["id"] == 1
+        assert request(api, "GET", "/courses/stats")[1]["rows"] == [{"course_id": 1, "enrolled": 1, "credits_enrolled": 3}]
+        status, health = request(api, "GET", "/health")
+        assert status == 200 and health["status"] == "ok" and health["pool"]["readers"] == 4
+        status, metrics = request(api, "GET", "/metrics?top=50")
+        assert status == 200 and "students.page" in {q["name"] for q in metrics["queries"]}
+
+    def test_errors_map_to_status_codes(self, api):
+        assert request(api, "POST", "/students", {"student_no": "S9"})[0] == 400
+        assert request(api, "GET", "/students?limit=abc")[0] == 400
+        assert request(api, "GET", "/nowhere")[0] == 404
+        assert request(api, "DELETE", "/students")[0] == 405
+        # Restrict policy refuses to delete a course with students
+        assert request(api, "DELETE", "/courses/1?policy=restrict")[0] == 400
+        status, result = request(api, "POST", "/courses", {"course_code": "CS101", "course_name": "Again",
+                                                            "lecturer": "X", "credits": 1})
+        assert status == 409
+
+    def test_bulk_endpoint(self, api):
+        status, result = request(api, "POST", "/courses/bulk", {
+            "create": [{"course_code": f"B{i}", "course_name": f"Bulk {i}", "lecturer": "L", "credits": 2} for i in range(3)],
+            "delete": [999]})
+        assert status == 200
+        assert [r["ok"] for r in result["create"]] == [True] * 3
+        assert result["delete"] == [{"ok": False, "error": "Not found"}]
+
+        # Items that are not objects (or ids, for delete) reject the whole request
+        for body in ({"create": [{"course_code": "B9"}, "B10"]}, {"update": [7]}, {"delete": [{"id": 1}]},
+                     {"create": "B11"}):
+            status, error = request(api, "POST", "/courses/bulk", body)
+            assert status == 400
+        assert error["error"] == "bulk create must be a list"
+        status, error = request(api, "POST", "/courses/bulk", {"create": [{"course_code": "B9"}, "B10"]})
+        assert error["error"] == "bulk create[1] must be an object, not str"
+        assert request(api, "GET", "/courses?limit=100")[1]["rows"][-1]["course_code"] == "B2"
+
+    def test_concurrent_clients_with_keep_alive(self, api):
+        def client(n):
+            conn = http.client.HTTPConnection("127.0.0.1", api.port, timeout=10)
+            statuses = [request(api, "GET", "/students/1", conn=conn)[0] for _ in range(20)]
+            statuses.append(request(api, "POST", "/students", {
+                "student_no": f"C{n}", "first_name": "C", "last_name": str(n),
+                "email": f"c{n}@test.edu", "course_id": 1}, conn=conn)[0])
+            conn.close()
+            return statuses
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(client, range(32)))
+        assert all(statuses == [200] * 20 + [201] for statuses in results)
+        assert request(api, "GET", "/courses/stats")[1]["rows"][0]["enrolled"] == 33
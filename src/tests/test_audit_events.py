@@ -0,0 +1,75 @@
+import sqlite3
+import pytest
+from model.audit_model import AuditModel
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+class TestAuditEvents:
+    """Testing the audit_events table and its server-side paging"""
+
+    def test_writes_record_events(self, test_database):
+        student_model = StudentModel(test_database)
+        course_model = CourseModel(test_database)
+        audit_model = AuditModel(test_database)
+
+        student = student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+        student_model.update_student(student.id, 'S5001', 'Renamed', 'Student', 'new@test.edu', 1)
+        student_model.delete_student(student.id)
+        course_model.add_course('CS900', 'Compilers', 'Dr. Lee', 4)
+
+        events = audit_model.page()["rows"]
+        assert [(e.entity, e.action) for e in events] == [
+            ("course", "ADD"), ("student", "DELETE"), ("student", "UPDATE"), ("student", "ADD"),
+        ]
+        assert events[2].entity_id == student.id
+        assert events[2].data["first_name"] == 'Renamed'
+
+    def test_event_rolls_back_with_the_write(self, test_database):
+        student_model = StudentModel(test_database)
+        audit_model = AuditModel(test_database)
+
+        with pytest.raises(RuntimeError):
+            with test_database.transaction():
+                student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+                raise RuntimeError("abandon")
+
+        assert audit_model.count_events() == 0
+
+    def test_failed_write_records_nothing(self, test_database):
+        student_model = StudentModel(test_database)
+        audit_model = AuditModel(test_database)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            student_model.add_student('S1001', 'Duplicate', 'Number', 'dup@test.edu', 1)
+
+        assert audit_model.count_events() == 0
+
+    def test_events_are_append_only(self, test_database):
+        student_model = StudentModel(test_database)
+        student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            test_database.execute("UPDATE audit_events SET action = 'ADD'")
+        with pytest.raises(sqlite3.IntegrityError):
+            test_database.execute("DELETE FROM audit_events")
+
+    def test_pages_newest_first_with_filters(self, test_database):
+        student_model = StudentModel(test_database)
+        audit_model = AuditModel(test_database)
+        for i in range(25):
+            student = student_model.add_student(f'S5{i:03}', 'New', f'Student{i}', f's{i}@test.edu', 1)
+            if i % 5 == 0:
+                student_model.delete_student(student.id)
+
+        filters = {"entity": "student", "action": "ADD"}
+        first = audit_model.page(limit=10, filters=filters)
+        second = audit_model.page(first["last_id"], 10, filters)
+        third = audit_model.page(second["last_id"], 10, filters)
+
+        assert audit_model.count_events(filters) == 25
+        assert first["has_more"] and second["has_more"] and not third["has_more"]
+        ids = [e.id for page in (first, second, third) for e in page["rows"]]
+        assert ids == sorted(ids, reverse=True) and len(ids) == 25
+        assert audit_model.count_events({"action": "DELETE"}) == 5
+        assert audit_model.count_events({"text": "Student12"}) == 1
+        assert audit_model.count_events({"since": "2000-01-01", "until": "2000-01-02"}) == 0
@@ -0,0 +1,142 @@
+import gzip
+import json
+import os
+import threading
+import time
+from model.audit_log import AuditWriter
+from model import audit_log
+from model.student_model import StudentModel
+
+class TestAuditLog:
+    """Testing the background, batched audit log writer"""
+
+    def test_entries_are_written_in_groups(self, tmp_path):
+        path = str(tmp_path / "audit.log")
+        writer = AuditWriter(path, flush_interval=5)
+        writes = []
+        original = writer._write
+        writer._write = lambda text: (writes.append(text.count("\n")), original(text))
+
+        for i in range(100):
+            writer.log("ADD", {"id": i})
+        writer.flush()
+
+        assert sum(writes) == 100
+        assert len(writes) < 100  # grouped, not one write per entry
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        when, action, data = lines[0].split(" | ", 2)
+        assert action == "ADD"
+        assert json.loads(data) == {"id": 0}
+        writer.close()
+
+    def test_log_does_not_wait_for_the_disk(self, tmp_path):
+        writer = AuditWriter(str(tmp_path / "audit.log"), flush_interval=5)
+        original = writer._write
+        writer._write = lambda text: (time.sleep(0.2), original(text))
+
+        start = time.perf_counter()
+        for i in range(50):
+            writer.log("UPDATE", {"id": i})
+        assert time.perf_counter() - start < 0.1
+        writer.close()
+
+    def test_write_error_does_not_stop_the_writer(self, tmp_path, capsys):
+        path = str(tmp_path / "audit.log")
+        writer = AuditWriter(path, flush_interval=0)
+        original = writer._write
+        failures = [OSError("disk full")]
+
+        def write(text):
+            if failures:
+                raise failures.pop()
+            original(text)
+        writer._write = write
+
+        writer.log("ADD", {"id": 1})
+        assert writer.flush() is True  # released although the write failed
+        assert isinstance(writer.last_error, OSError)
+        assert "could not be written" in capsys.readouterr().err
+
+        writer.log("ADD", {"id": 2})
+        assert writer.flush() is True
+        writer.close()
+        with open(path, encoding="utf-8") as f:
+            assert [json.loads(line.split(" | ")[2]) for line in f] == [{"id": 2}]
+
+    def test_flush_and_close_give_up_on_a_stuck_writer(self, tmp_path):
+        writer = AuditWriter(str(tmp_path / "audit.log"), flush_interval=0)
+        release = threading.Event()
+        writer._write = lambda text: release.wait()
+
+        writer.log("ADD", {"id": 1})
+        start = time.perf_counter()
+        assert writer.flush(timeout=0.1) is False
+        writer.close(timeout=0.1)
+        assert time.perf_counter() - start < 2
+        release.set()
+
+    def test_close_writes_everything_queued(self, tmp_path):
+        path = str(tmp_path / "audit.log")
+        writer = AuditWriter(path, flush_interval=60)
+
+        for i in range(10):
+            writer.log("DELETE", {"id": i})
+        writer.close()
+
+        with open(path, encoding="utf-8") as f:
+            assert len(f.readlines()) == 10
+
+    def test_rotates_by_size_with_compression(self, tmp_path):
+        path = str(tmp_path / "audit.log")
+        writer = AuditWriter(path, flush_lines=1, max_bytes=200, backups=2, compress=True)
+
+        for i in range(30):
+            writer.log("ADD", {"id": i, "padding": "x" * 40})
+            writer.flush()
+        writer.close()
+
+        assert os.path.exists(path + ".1.gz")
+        assert os.path.exists(path + ".2.gz")
+        assert not os.path.exists(path + ".3.gz")
+        with gzip.open(path + ".1.gz", "rt", encoding="utf-8") as f:
+            assert " | ADD | " in f.readline()
+
+    def test_rotates_by_age(self, tmp_path):
+        path = str(tmp_path / "audit.log")
+        writer = AuditWriter(path, flush_lines=1, max_age=0.05, compress=False)
+
+        writer.log("ADD", {"id": 1})
+        writer.flush()
+        time.sleep(0.1)
+        writer.log("ADD", {"id": 2})
+        writer.close()
+
+        with open(path + ".1", encoding="utf-8") as f:
+            assert '"id": 1' in f.read()
+        with open(path, encoding="utf-8") as f:
+            assert '"id": 2' in f.read()
+
+    def test_student_model_logs_through_shared_writer(self, test_database, tmp_path):
+        student_model = StudentModel(test_database)
+        student_model.log_file = str(tmp_path / "student_audit.log")
+
+        student = student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+        student_model.delete_student(student.id)
+        audit_log.close_all()
+
+        with open(student_model.log_file, encoding="utf-8") as f:
+            actions = [line.split(" | ")[1] for line in f]
+        assert actions == ["ADD", "DELETE"]
+
+    def test_update_of_missing_student_is_not_logged(self, test_database, tmp_path):
+        student_model = StudentModel(test_database)
+        student_model.log_file = str(tmp_path / "student_audit.log")
+
+        assert student_model.update_student(9999, 'S9999', 'No', 'One', 'none@test.edu', 1) is None
+        student_model.update_student(1, 'S1001', 'John', 'Renamed', 'john.doe@email.com', 1)
+        audit_log.close_all()
+
+        with open(student_model.log_file, encoding="utf-8") as f:
+            entries = [json.loads(line.split(" | ")[2]) for line in f]
+        assert [e["id"] for e in entries] == [1]
@@ -0,0 +1,59 @@
+import random
+import pytest
+from db import Database
+from generate_data import generate, generate_students
+import json
+from run_benchmarks import compare, save_baseline, unmeasured
+
+@pytest.fixture
+def generated(tmp_path):
+    def build(name, seed):
+        db = Database(str(tmp_path / f"{name}.db"))
+        generate(db, 500, 20, seed, batch_size=200)
+        return db
+    return build
+
+class TestBenchmarks:
+    """Testing the seeded data generator and the baseline comparison"""
+
+    def test_same_seed_gives_the_same_dataset(self, generated):
+        first, second, other = generated("a", 7), generated("b", 7), generated("c", 8)
+        query = "SELECT student_no, first_name, last_name, email, phone, course_id FROM students ORDER BY id"
+        assert first.fetchall(query) == second.fetchall(query)
+        assert first.fetchall(query) != other.fetchall(query)
+        assert first.fetchone("SELECT COUNT(DISTINCT email) FROM students")[0] == 500
+        assert first.fetchone("SELECT COUNT(*) FROM courses")[0] == 20
+        # Full-text index and enrolment counts are filled in like any other write
+        assert first.fetchone("SELECT COUNT(*) FROM students_fts")[0] == 500
+        assert first.fetchone("SELECT SUM(enrolled) FROM course_stats")[0] == 500
+
+    def test_generate_refuses_a_database_with_data(self, generated):
+        with pytest.raises(ValueError):
+            generate(generated("a", 1), 10, 2)
+
+    def test_enrolment_is_skewed_towards_the_first_courses(self):
+        rows = list(generate_students(2000, list(range(1, 101)), random.Random(1)))
+        first_course = sum(1 for row in rows if row[5] == 1)
+        assert first_course > sum(1 for row in rows if row[5] == 100) * 10
+
+    def test_compare_flags_only_slowdowns_beyond_tolerance_and_noise(self):
+        baseline = {"slow": {"median_ms": 100.0}, "fast": {"median_ms": 1.0}, "steady": {"median_ms": 50.0}}
+        results = {"slow": {"median_ms": 140.0}, "fast": {"median_ms": 2.0}, "steady": {"median_ms": 55.0},
+                   "view_refresh": {"skipped": "no display"}}
+        rows, regressions = compare(results, baseline)
+        assert regressions == ["slow"]  # "fast" doubled, but by less than the noise floor
+        assert [row[0] for row in rows] == ["slow", "fast", "steady"]
+
+    def test_skipped_benchmarks_are_saved_as_missing(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        report = {"created_at": "now", "results": {"steady": {"median_ms": 5.0},
+                                                   "view_refresh": {"skipped": "no display"}}}
+        save_baseline(path, "10k", report)
+
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)["10k"]
+        assert saved["results"] == {"steady": {"median_ms": 5.0}}
+        assert saved["missing"] == {"view_refresh": "no display"}
+        # A later run with a display measures it, and it is reported as having no reference
+        results = {"steady": {"median_ms": 5.0}, "view_refresh": {"median_ms": 40.0}}
+        assert unmeasured(results, saved["results"]) == ["view_refresh"]
@@ -0,0 +1,105 @@
+import io
+import pytest
+from model import changes
+from model.changes import Change
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+from view.change_dispatcher import ChangeDispatcher
+from test_live_search import FakeWidget
+
+@pytest.fixture
+def published():
+    """Collect every change published while the test runs"""
+    seen = []
+    unsubscribe = changes.feed.subscribe(seen.append)
+    yield seen
+    unsubscribe()
+
+class TestChangeFeed:
+    """Testing the model change feed and its per-frame dispatch"""
+
+    def test_writes_publish_changes(self, test_database, published):
+        course_model = CourseModel(test_database)
+        student_model = StudentModel(test_database)
+
+        course = course_model.add_course('CS900', 'Compilers', 'Dr. Lee', 4)
+        student = student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', course['id'])
+        student_model.delete_student(student['id'])
+
+        assert [(c.entity, c.op, c.id) for c in published] == [
+            ("course", "insert", course['id']),
+            ("student", "insert", student['id']),
+            ("student", "delete", student['id']),
+        ]
+        assert published[1].values == student
+
+    def test_nothing_published_until_commit(self, test_database, published):
+        student_model = StudentModel(test_database)
+
+        with test_database.transaction():
+            student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+            assert published == []
+        assert len(published) == 1
+
+    def test_rolled_back_writes_are_not_published(self, test_database, published):
+        student_model = StudentModel(test_database)
+
+        with test_database.transaction():
+            student_model.add_student('S5001', 'Kept', 'Student', 'kept@test.edu', 1)
+            with pytest.raises(Exception):
+                with test_database.transaction():
+                    student_model.add_student('S5002', 'Undone', 'Student', 'undone@test.edu', 1)
+                    raise RuntimeError("undo inner block")
+
+        assert [c.values['first_name'] for c in published] == ['Kept']
+
+    def test_import_publishes_one_change(self, test_database, published):
+        student_model = StudentModel(test_database)
+        lines = ["student_no,first_name,last_name,email,course"]
+        lines += [f"S{i},First,Last,s{i}@test.edu,Test Programming" for i in range(100)]
+
+        student_model.import_csv(io.StringIO("\n".join(lines)), batch_size=10)
+
+        assert [(c.entity, c.op, c.id) for c in published] == [("student", "import", None)]
+
+    def test_coalesce_keeps_net_change_per_row(self):
+        batch = [
+            Change("student", "insert", 1, {"v": 1}),
+            Change("student", "update", 1, {"v": 2}),
+            Change("student", "update", 2, {"v": 1}),
+            Change("student", "insert", 3, {"v": 1}),
+            Change("student", "delete", 3, None),
+            Change("course", "update", 1, {"v": 1}),
+        ]
+
+        assert changes.coalesce(batch) == [
+            Change("student", "insert", 1, {"v": 2}),
+            Change("student", "update", 2, {"v": 1}),
+            Change("course", "update", 1, {"v": 1}),
+        ]
+
+    def test_coalesce_import_absorbs_row_changes(self):
+        batch = [Change("course", "update", 1, {})] + [Change("student", "import", None, None)] * 3
+        batch += [Change("student", "update", 7, {})]
+
+        assert changes.coalesce(batch) == [
+            Change("course", "update", 1, {}),
+            Change("student", "import", None, None),
+        ]
+
+    def test_dispatcher_delivers_one_batch_per_frame(self, test_database):
+        widget, batches = FakeWidget(), []
+        dispatcher = ChangeDispatcher(widget)
+        dispatcher.subscribe(batches.append)
+        course_model = CourseModel(test_database)
+
+        for i in range(20):
+            course_model.add_course(f'CS9{i:02}', f'Course {i}', 'Dr. Lee', 3)
+        assert batches == []
+        widget.fire()
+        widget.fire()  # an empty frame delivers nothing
+
+        assert len(batches) == 1
+        assert len(batches[0]) == 20
+        dispatcher.close()
+        assert widget.timers == {}
@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+import time
+import pytest
+from db import ConnectionPool
+from model.course_model import CourseModel
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), readers=2, timeout=5)
+    yield pool
+    pool.close()
+
+class TestConnectionPool:
+    """Testing the writer + readers connection pool"""
+
+    def test_writer_and_read_only_readers(self, pool):
+        with pool.connection(write=True) as db:
+            db.model(CourseModel).add_course("CS101", "Computing", "Dr. Ada", 3)
+        with pool.connection() as db:
+            assert db.read_only
+            assert db.model(CourseModel).get_course_id("Computing") == 1
+            assert db.model(CourseModel) is db.model(CourseModel)
+            with pytest.raises(sqlite3.OperationalError):
+                db.execute("DELETE FROM courses")
+        with pool.connection() as db:
+            assert db.fetchone("PRAGMA foreign_keys")[0] == 1  # tuning applied to readers too
+
+    def test_readers_work_from_other_threads_in_parallel(self, pool):
+        inside, results = threading.Barrier(2, timeout=5), []
+
+        def read():
+            with pool.connection() as db:
+                inside.wait()  # both readers checked out at once
+                results.append(db.fetchone("SELECT COUNT(*) FROM courses")[0])
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [0, 0]
+        assert pool.metrics()["peak_in_use"] == 2
+
+    def test_checkout_waits_then_times_out(self, pool):
+        writer = pool.checkout(write=True)
+        with pytest.raises(TimeoutError):
+            pool.checkout(write=True, timeout=0.05)
+
+        threading.Timer(0.05, pool.checkin, (writer,)).start()
+        started = time.monotonic()
+        with pool.connection(write=True):
+            assert time.monotonic() - started >= 0.04
+        metrics = pool.metrics()
+        assert metrics["timeouts"] == 1 and metrics["waits"] == 1 and metrics["in_use"] == 0
+
+    def test_checkin_undoes_open_transaction(self, pool):
+        db = pool.checkout(write=True)
+        db.conn.execute("BEGIN")
+        db.conn.execute("INSERT INTO courses (course_code, course_name, lecturer, credits) VALUES ('X', 'X', 'X', 1)")
+        pool.checkin(db)
+        with pool.connection(write=True) as db:
+            assert not db.conn.in_transaction
+            assert db.fetchone("SELECT COUNT(*) FROM courses")[0] == 0
+
+    def test_broken_connections_are_replaced(self, pool, monkeypatch):
+        broken = pool.readers[0]
+        broken.conn.close()
+        assert pool.check_health() == 1
+        assert broken not in pool.readers
+
+        # Connections idle past HEALTH_CHECK_AFTER are pinged on checkout
+        monkeypatch.setattr(ConnectionPool, "HEALTH_CHECK_AFTER", 0)
+        pool.writer.conn.close()
+        with pool.connection(write=True) as db:
+            assert db.fetchone("SELECT 1")[0] == 1
+        assert pool.metrics()["replaced"] == 2
+
+    def test_closed_pool_refuses_checkout(self, pool):
+        db = pool.checkout()
+        pool.close()
+        with pytest.raises(ValueError):
+            pool.checkout()
+        pool.checkin(db)  # closed on return
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.conn.execute("SELECT 1")
+
+    def test_in_memory_database_rejected(self):
+        with pytest.raises(ValueError):
+            ConnectionPool(":memory:")
@@ -0,0 +1,74 @@
+import pytest
+from controller.student_controller import StudentController
+from controller.course_controller import CourseController
+
+class TestControllers:
+    """Testing the headless student and course service layer"""
+
+    def test_create_student_resolves_course(self, test_database):
+        controller = StudentController(test_database)
+        by_name = controller.create({"student_no": "S2001", "first_name": "Ada", "last_name": "Lovelace",
+                                     "email": "ada@test.edu", "course": "Test Physics"})
+        by_code = controller.create({"student_no": "S2002", "first_name": "Alan", "last_name": "Turing",
+                                     "email": "alan@test.edu", "course_code": "TEST201"})
+        by_id = controller.create({"student_no": "S2003", "first_name": "Grace", "last_name": "Hopper",
+                                   "email": "grace@test.edu", "course_id": 1})
+        assert (by_name.course_code, by_code.course_code, by_id.course_code) == ("TEST301", "TEST201", "TEST101")
+
+    @pytest.mark.parametrize("data, message", [
+        ({"first_name": "A", "last_name": "B", "email": "a@b.co", "course": "Test Physics"}, "Student no is required"),
+        ({"student_no": "S1", "first_name": "A", "last_name": "B", "email": "not-an-email", "course": "Test Physics"},
+         "not a valid email"),
+        ({"student_no": "S1", "first_name": "A", "last_name": "B", "email": "a@b.co", "course": "Nope"},
+         "course not found"),
+        ({"student_no": "S1", "first_name": "A", "last_name": "B", "email": "a@b.co"}, "Course is required"),
+    ])
+    def test_invalid_student_rejected(self, test_database, data, message):
+        with pytest.raises(ValueError, match=message):
+            StudentController(test_database).create(data)
+
+    def test_update_keeps_missing_fields(self, test_database):
+        controller = StudentController(test_database)
+        row = controller.update(1, {"last_name": "Doe-Smith"})
+        assert (row.first_name, row.last_name, row.course_code) == ("John", "Doe-Smith", "TEST101")
+        assert controller.update(999, {"last_name": "X"}) is None
+
+    def test_update_keeps_a_null_or_dangling_course(self, test_database):
+        controller = StudentController(test_database)
+        test_database.execute("UPDATE students SET course_id = NULL WHERE id = 1")
+        assert controller.update(1, {"last_name": "Doe-Smith"}).last_name == "Doe-Smith"
+        # A form with no course selected sends it blank
+        assert controller.update(1, {"first_name": "Jon", "course": ""}).first_name == "Jon"
+        assert test_database.fetchone("SELECT course_id FROM students WHERE id = 1")[0] is None
+
+        test_database.conn.execute("PRAGMA foreign_keys = OFF")
+        test_database.execute("UPDATE students SET course_id = 999 WHERE id = 2")
+        test_database.conn.execute("PRAGMA foreign_keys = ON")
+        assert controller.update(2, {"last_name": "Smythe"}).last_name == "Smythe"
+        assert test_database.fetchone("SELECT course_id FROM students WHERE id = 2")[0] == 999
+        assert controller.update(2, {"course_code": "TEST201"}).course_code == "TEST201"
+
+    def test_course_validation_and_update(self, test_database):
+        controller = CourseController(test_database)
+        with pytest.raises(ValueError, match="whole number"):
+            controller.create({"course_code": "C1", "course_name": "C", "lecturer": "L", "credits": "three"})
+        row = controller.create({"course_code": "C1", "course_name": "C", "lecturer": "L", "credits": "3"})
+        assert row.credits == 3
+        assert controller.update(row.id, {"credits": 5}).credits == 5
+
+    def test_bulk_reports_each_item(self, test_database):
+        controller = StudentController(test_database)
+        result = controller.bulk(
+            create=[{"student_no": "S3001", "first_name": "A", "last_name": "One", "email": "one@test.edu", "course_id": 2},
+                    {"student_no": "S1001", "first_name": "Dup", "last_name": "Number", "email": "dup@test.edu",
+                     "course_id": 2}],
+            update=[{"id": 2, "first_name": "Janet"}],
+            delete=[3, 999],
+        )
+        assert [r["ok"] for r in result["create"]] == [True, False]
+        assert "UNIQUE" in result["create"][1]["error"]
+        assert result["update"] == [{"ok": True, "id": 2}]
+        assert result["delete"] == [{"ok": True, "id": 3}, {"ok": False, "error": "Not found"}]
+        # Failed items were rolled back alone; the rest committed
+        assert test_database.fetchone("SELECT COUNT(*) FROM students")[0] == 3
+        assert controller.get(2).first_name == "Janet"
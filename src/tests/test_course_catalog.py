@@ -0,0 +1,76 @@
+import io
+from db import Database
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+class TestCourseCatalog:
+    """Testing the cached course catalogue and its invalidation"""
+
+    def test_lookups_are_served_from_memory(self, test_database):
+        course_model = CourseModel(test_database)
+
+        assert course_model.get_course_id('Test Programming') == 1
+        assert course_model.get_course_id('No Such Course') is None
+        assert course_model.get_course_names() == ['Test Mathematics', 'Test Physics', 'Test Programming']
+
+        # Only the first lookup read the table
+        assert course_model.catalog.stats() == {"hits": 2, "misses": 1, "size": 3}
+
+    def test_shared_with_student_model(self, test_database):
+        course_model = CourseModel(test_database)
+        student_model = StudentModel(test_database)
+
+        assert student_model.courses is course_model.catalog
+        assert student_model.get_course_name(2) == 'Test Mathematics'
+
+    def test_writes_patch_the_catalogue_in_place(self, test_database):
+        course_model = CourseModel(test_database)
+        course_model.get_course_names()
+
+        added = course_model.add_course('CS900', 'Compilers', 'Dr. Lee', 4)
+        assert course_model.get_course_id('Compilers') == added['id']
+
+        course_model.update_course(added['id'], 'CS900', 'Compilers II', 'Dr. Lee', 4)
+        assert course_model.get_course_id('Compilers') is None
+        assert course_model.catalog.code_for_id(added['id']) == 'CS900'
+        assert course_model.get_course_id('Compilers II') == added['id']
+
+        course_model.delete_course(added['id'])
+        assert course_model.get_course_id('Compilers II') is None
+        assert course_model.catalog.misses == 1
+
+    def test_rolled_back_write_leaves_catalogue_alone(self, test_database):
+        course_model = CourseModel(test_database)
+        course_model.get_course_names()
+
+        try:
+            with test_database.transaction():
+                course_model.add_course('CS900', 'Compilers', 'Dr. Lee', 4)
+                raise RuntimeError("abandon")
+        except RuntimeError:
+            pass
+
+        assert course_model.get_course_id('Compilers') is None
+
+    def test_import_forces_reload(self, test_database):
+        course_model = CourseModel(test_database)
+        course_model.get_course_names()
+
+        course_model.import_csv(io.StringIO("course_code,course_name,lecturer,credits\nCS900,Compilers,Dr. Lee,4\n"))
+
+        assert course_model.get_course_id('Compilers') is not None
+        assert course_model.catalog.misses == 2
+
+    def test_sees_writes_from_another_connection(self, tmp_path):
+        path = str(tmp_path / "catalog.db")
+        reader_db, writer_db = Database(path), Database(path)
+        reader = CourseModel(reader_db)
+        writer = CourseModel(writer_db)
+        assert reader.get_course_names() == []
+
+        added = writer.add_course('CS900', 'Compilers', 'Dr. Lee', 4)
+
+        assert reader.get_course_id('Compilers') == added['id']
+        assert reader.catalog.misses == 1
+        reader_db.close()
+        writer_db.close()
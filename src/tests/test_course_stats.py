@@ -0,0 +1,93 @@
+import io
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+def stats_by_course(course_model):
+    return {row.course_id: (row.enrolled, row.credits_enrolled) for row in course_model.get_course_stats()}
+
+def recount(db):
+    rows = db.fetchall("SELECT c.id, COUNT(s.id) FROM courses c LEFT JOIN students s ON s.course_id = c.id GROUP BY c.id")
+    return {r[0]: r[1] for r in rows}
+
+class TestCourseStats:
+    """Testing the trigger-maintained course_stats summary table"""
+
+    def test_counts_existing_students_on_upgrade(self, test_database):
+        # Fixture rows were inserted before the summary table existed
+        course_model = CourseModel(test_database)
+        # TEST101 (3 credits) has two students, TEST201 (4 credits) one
+        assert stats_by_course(course_model) == {1: (2, 6), 2: (1, 4), 3: (0, 0)}
+
+    def test_follows_student_writes(self, test_database):
+        course_model = CourseModel(test_database)
+        student_model = StudentModel(test_database)
+
+        student = student_model.add_student('S2001', 'Ada', 'Lovelace', 'ada@test.edu', 3)
+        assert stats_by_course(course_model)[3] == (1, 3)
+
+        student_model.update_student(student.id, 'S2001', 'Ada', 'Lovelace', 'ada@test.edu', 2)
+        assert stats_by_course(course_model)[2] == (2, 8)
+        assert stats_by_course(course_model)[3] == (0, 0)
+
+        student_model.delete_student(student.id)
+        assert stats_by_course(course_model)[2] == (1, 4)
+        assert {k: v[0] for k, v in stats_by_course(course_model).items()} == recount(test_database)
+
+    def test_follows_course_writes_and_imports(self, test_database):
+        course_model = CourseModel(test_database)
+        student_model = StudentModel(test_database)
+
+        course = course_model.add_course('TEST401', 'Test Chemistry', 'Dr. Test', 5)
+        assert stats_by_course(course_model)[course.id] == (0, 0)
+
+        result = student_model.import_csv(io.StringIO(
+            "student_no,first_name,last_name,email,course\n"
+            "S3001,Al,One,al@test.edu,Test Chemistry\n"
+            "S3002,Bo,Two,bo@test.edu,Test Chemistry\n"
+        ))
+        assert result["imported"] == 2
+        assert stats_by_course(course_model)[course.id] == (2, 10)
+
+        # Changing credits changes the credit total without touching the count
+        course_model.update_course(course.id, 'TEST401', 'Test Chemistry', 'Dr. Test', 6)
+        assert stats_by_course(course_model)[course.id] == (2, 12)
+
+        course_model.delete_course(1, policy="cascade")
+        assert 1 not in stats_by_course(course_model)
+
+    def test_bulk_inserts_count_once_per_batch(self, test_database):
+        from controller.student_controller import StudentController
+        course_model = CourseModel(test_database)
+        student_model = StudentModel(test_database)
+        statements = []
+        test_database.conn.set_trace_callback(statements.append)
+        try:
+            student_model.import_csv(io.StringIO(
+                "student_no,first_name,last_name,email,course\n"
+                + "".join(f"S4{i:03d},Bulk,{i},bulk{i}@test.edu,Test Programming\n" for i in range(30))), batch_size=10)
+            StudentController(test_database).bulk(create=[
+                {"student_no": "S5001", "first_name": "Ada", "last_name": "L", "email": "ada@test.edu", "course_id": 2},
+                {"student_no": "S5002", "first_name": "Bo", "last_name": "T", "email": "bo@test.edu", "course_id": 3}])
+        finally:
+            test_database.conn.set_trace_callback(None)
+
+        # The per-row trigger is suspended for each of the three import batches and the bulk create
+        assert len([s for s in statements if s.startswith("DROP TRIGGER IF EXISTS course_stats_student_ai")]) == 4
+        assert len([s for s in statements if "INSERT OR REPLACE INTO course_stats" in s]) == 4
+        assert stats_by_course(course_model)[1][0] == 32
+        assert {k: v[0] for k, v in stats_by_course(course_model).items()} == recount(test_database)
+        # The trigger is back for ordinary writes
+        student_model.add_student('S6001', 'One', 'More', 'more@test.edu', 3)
+        assert stats_by_course(course_model)[3][0] == 2
+
+    def test_rebuild_matches_recount(self, test_database):
+        course_model = CourseModel(test_database)
+        test_database.execute("UPDATE course_stats SET enrolled = 99")
+        course_model.rebuild_course_stats()
+        assert {k: v[0] for k, v in stats_by_course(course_model).items()} == recount(test_database)
+
+    def test_reading_stats_does_not_scan_students(self, test_database):
+        CourseModel(test_database)
+        plan = test_database.fetchall(
+            "EXPLAIN QUERY PLAN SELECT cs.course_id, cs.enrolled FROM course_stats cs JOIN courses c ON c.id = cs.course_id")
+        assert not any("students" in r["detail"] for r in plan)
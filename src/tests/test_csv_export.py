@@ -0,0 +1,55 @@
+import csv
+import io
+import threading
+import pytest
+from db import Database
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+class TestCsvExport:
+    """Testing the streaming CSV export path"""
+
+    def test_export_students(self, test_database):
+        student_model = StudentModel(test_database)
+        out = io.StringIO()
+        written = student_model.export_csv(out, batch_size=2)
+
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        assert written == 3
+        assert rows[0][0] == "Exported"
+        assert rows[1] == StudentModel.EXPORT_HEADER
+        assert rows[2] == ["1", "S1001", "John Doe", "john.doe@email.com", "Test Programming"]
+
+    def test_export_reports_progress_and_cancels(self, test_database):
+        course_model = CourseModel(test_database)
+        progress = []
+        written = course_model.export_csv(io.StringIO(), batch_size=1, progress=progress.append)
+        assert written == 3
+        assert progress == [1, 2, 3]
+
+        # Cancelling after the first batch stops the export
+        assert course_model.export_csv(io.StringIO(), batch_size=1,
+                                       cancelled=lambda: len(progress) > 3,
+                                       progress=progress.append) is None
+
+    def test_export_from_worker_thread(self, tmp_path):
+        db = Database(str(tmp_path / "export.db"))
+        course_model = CourseModel(db)
+        course_model.add_course('CS101', 'Computer Science', 'Dr. Smith', 3)
+        out = io.StringIO()
+        results = []
+
+        def worker():
+            conn = db.open_reader()
+            try:
+                results.append(course_model.export_csv(out, conn=conn))
+            finally:
+                conn.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert results == [1]
+        assert "Computer Science" in out.getvalue()
+        db.close()
@@ -0,0 +1,70 @@
+import io
+import pytest
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+class TestCsvImport:
+    """Testing the batched CSV importers on both models"""
+
+    def test_import_students(self, test_database):
+        student_model = StudentModel(test_database)
+        csv_data = io.StringIO(
+            "student_no,first_name,last_name,email,course\n"
+            "S3001,Ada,Lovelace,ada@test.edu,Test Programming\n"
+            "S3002,Alan,Turing,alan@test.edu,Test Mathematics\n"
+        )
+        result = student_model.import_csv(csv_data)
+
+        assert result == {"imported": 2, "rejected": []}
+        assert student_model.count_students() == 5
+        assert student_model.search_students('Turing')[0]['course'] == 'Test Mathematics'
+
+    def test_rejects_are_reported_per_row(self, test_database):
+        student_model = StudentModel(test_database)
+        csv_data = io.StringIO(
+            "student_no,first_name,last_name,email,course,phone\n"
+            "S3001,Ada,Lovelace,ada@test.edu,Test Programming,0400000000\n"
+            "S3002,,Turing,alan@test.edu,Test Mathematics,\n"
+            "S3003,Grace,Hopper,grace@test.edu,Unknown Course,\n"
+            "S1001,Dup,Number,dup@test.edu,Test Physics,\n"
+            "S3004,Edsger,Dijkstra,edsger@test.edu,Test Physics,\n"
+        )
+        # Small batches so the duplicate forces one batch onto the row-by-row path
+        result = student_model.import_csv(csv_data, batch_size=2)
+
+        assert result["imported"] == 2
+        assert [line for line, _ in result["rejected"]] == [3, 4, 5]
+        assert "first_name" in result["rejected"][0][1]
+        assert "Unknown Course" in result["rejected"][1][1]
+        assert "UNIQUE" in result["rejected"][2][1]
+        assert test_database.fetchone("SELECT phone FROM students WHERE student_no = 'S3001'")[0] == "0400000000"
+        assert len(student_model.search_students('Dijkstra')) == 1
+
+    def test_import_courses(self, test_database):
+        course_model = CourseModel(test_database)
+        csv_data = io.StringIO(
+            "course_code,course_name,lecturer,credits\n"
+            "CS101,Computer Science,Dr. Smith,3\n"
+            "CS102,Data Structures,Dr. Jones,three\n"
+        )
+        result = course_model.import_csv(csv_data)
+
+        assert result["imported"] == 1
+        assert result["rejected"][0][0] == 3
+        assert len(course_model.get_all_courses()) == 4
+
+    def test_clean_batches_insert_without_savepoints(self, test_database):
+        # A savepoint per batch journals every index page it touches, so batches slow as the table grows
+        student_model = StudentModel(test_database)
+        rows = "".join(f"S4{i:03d},Bulk,Student{i},bulk{i}@test.edu,Test Programming\n" for i in range(50))
+        statements = []
+        test_database.conn.set_trace_callback(statements.append)
+        try:
+            result = student_model.import_csv(io.StringIO("student_no,first_name,last_name,email,course\n" + rows),
+                                              batch_size=20)
+        finally:
+            test_database.conn.set_trace_callback(None)
+
+        assert result == {"imported": 50, "rejected": []}
+        assert not [s for s in statements if s.startswith("SAVEPOINT")]
+        assert len(student_model.search_students('Student49')) == 1
@@ -0,0 +1,37 @@
+import pytest
+from db import Database, DEFAULT_TUNING, load_config
+
+class TestConnectionTuning:
+    """Testing the connection tuning profile applied by Database"""
+
+    def test_default_profile_applied(self, tmp_path):
+        db = Database(str(tmp_path / "tuned.db"))
+        settings = db.settings()
+        assert settings["journal_mode"] == "WAL"
+        assert settings["synchronous"] == "NORMAL"
+        assert settings["temp_store"] == "MEMORY"
+        assert settings["cache_size"] == DEFAULT_TUNING["cache_size"]
+        assert settings["busy_timeout"] == DEFAULT_TUNING["busy_timeout"]
+        db.close()
+
+    def test_config_overrides_defaults(self, tmp_path):
+        db = Database(str(tmp_path / "tuned.db"), tuning={"synchronous": "full", "busy_timeout": 250})
+        settings = db.settings()
+        assert settings["synchronous"] == "FULL"
+        assert settings["busy_timeout"] == 250
+        assert settings["journal_mode"] == "WAL"
+        db.close()
+
+    def test_invalid_settings_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            Database(str(tmp_path / "tuned.db"), tuning={"journal_mode": "WAL; DROP TABLE students"})
+        with pytest.raises(ValueError):
+            Database(str(tmp_path / "tuned.db"), tuning={"page_size": 4096})
+
+    def test_tuning_read_from_config_file(self, tmp_path):
+        path = tmp_path / "config.json"
+        assert load_config(str(path)) == {}
+        path.write_text('{"database": {"busy_timeout": 250}}', encoding="utf-8")
+        db = Database(str(tmp_path / "tuned.db"), tuning=load_config(str(path)).get("database"))
+        assert db.settings()["busy_timeout"] == 250
+        db.close()
@@ -0,0 +1,109 @@
+import sqlite3
+import pytest
+from db import Database
+from model.course_model import CourseModel
+from model.student_model import StudentModel
+from model import integrity
+
+def add_orphans(db, course_id, count, start=100):
+    """Students on a course that no longer exists, as written before FKs were enforced"""
+    db.conn.execute("PRAGMA foreign_keys = OFF")
+    for i in range(start, start + count):
+        db.execute("INSERT INTO students (student_no, first_name, last_name, email, course_id) VALUES (?, ?, ?, ?, ?)",
+                   (f"S{i}", "Orphan", str(i), f"orphan{i}@test.edu", course_id))
+    db.conn.execute("PRAGMA foreign_keys = ON")
+
+class TestReferentialIntegrity:
+    """Testing foreign key enforcement, course delete policies and the orphan scanner"""
+
+    def test_foreign_keys_enforced(self, test_database):
+        StudentModel(test_database)
+        assert test_database.settings()["foreign_keys"] == "ON"
+        with pytest.raises(sqlite3.IntegrityError):
+            test_database.execute("INSERT INTO students (student_no, first_name, last_name, email, course_id) "
+                                  "VALUES ('S9', 'No', 'Course', 'no@test.edu', 999)")
+
+    def test_restrict_refuses_course_with_students(self, test_database):
+        course_model = CourseModel(test_database)
+        with pytest.raises(ValueError, match="2 students"):
+            course_model.delete_course(1, policy="restrict")
+        assert course_model.get_course_by_id(1) is not None
+        # A course nobody is enrolled on is deleted as before
+        assert course_model.delete_course(3, policy="restrict") == 3
+
+    def test_cascade_deletes_students(self, test_database):
+        course_model = CourseModel(test_database)
+        StudentModel(test_database)
+        assert course_model.delete_course(1, policy="cascade") == 1
+        assert test_database.fetchone("SELECT COUNT(*) FROM students WHERE course_id = 1")[0] == 0
+        assert test_database.fetchone("SELECT COUNT(*) FROM students")[0] == 1
+        events = test_database.fetchall("SELECT entity, action FROM audit_events WHERE entity = 'student'")
+        assert [tuple(e) for e in events] == [("student", "DELETE")] * 2
+
+    def test_reassign_moves_students(self, test_database):
+        course_model = CourseModel(test_database)
+        course_model.delete_course(1, policy="reassign", reassign_to="TEST301")
+        rows = test_database.fetchall("SELECT course_id FROM students ORDER BY id")
+        assert [r[0] for r in rows] == [3, 2, 3]
+        assert {row.course_id: row.enrolled for row in course_model.get_course_stats()}[3] == 2
+
+        with pytest.raises(ValueError):
+            course_model.delete_course(2, policy="reassign", reassign_to="NOPE")
+        assert course_model.get_course_by_id(2) is not None
+
+    def test_delete_messages_for_missing_or_unnamed_courses(self, test_database):
+        course_model = CourseModel(test_database)
+        # A missing course is not found, whatever policy was asked for
+        assert course_model.delete_course(999, policy="restrict") is None
+        assert course_model.delete_course(999, policy="orphan") is None
+
+        test_database.execute("UPDATE courses SET course_code = NULL WHERE id = 1")
+        with pytest.raises(ValueError) as restrict:
+            course_model.delete_course(1, policy="restrict")
+        with pytest.raises(ValueError) as no_target:
+            course_model.delete_course(1, policy="reassign", reassign_to=None)
+        assert "None" not in str(restrict.value) and "None" not in str(no_target.value)
+        assert "Test Programming" in str(restrict.value)
+
+    def test_configured_policy_is_the_default(self, test_database, monkeypatch):
+        course_model = CourseModel(test_database)
+        monkeypatch.setattr(CourseModel, "delete_policy", CourseModel.delete_policy)
+        monkeypatch.setattr(CourseModel, "reassign_to", CourseModel.reassign_to)
+        CourseModel.configure(delete_policy="cascade")
+        assert course_model.delete_course(1) == 1
+        with pytest.raises(ValueError):
+            CourseModel.configure(delete_policy="orphan")
+
+    def test_policy_check_seeks_the_index(self):
+        db = Database(":memory:")
+        plan = db.fetchall("EXPLAIN QUERY PLAN SELECT id FROM students WHERE course_id = ?", (1,))
+        assert any("idx_students_course_id" in r["detail"] for r in plan)
+        db.close()
+
+    def test_scanner_reports_and_repairs_in_batches(self, test_database):
+        StudentModel(test_database)
+        add_orphans(test_database, 77, 5)
+        batches = []
+
+        report = integrity.scan_orphans(test_database, batch_size=2, progress=lambda done, total: batches.append(done))
+        assert report == {"orphans": 5, "repaired": 0, "by_course": {77: 5}}
+        assert len(batches) == 4  # ids 1..8 in ranges of 2
+
+        report = integrity.scan_orphans(test_database, repair="null", batch_size=3)
+        assert report["repaired"] == 5
+        assert integrity.scan_orphans(test_database)["orphans"] == 0
+        assert test_database.fetchone("SELECT COUNT(*) FROM students WHERE course_id IS NULL")[0] == 5
+
+    def test_scanner_reassign_and_delete(self, test_database):
+        course_model = CourseModel(test_database)
+        add_orphans(test_database, 77, 3)
+        integrity.scan_orphans(test_database, repair="reassign", reassign_to=3)
+        assert {row.course_id: row.enrolled for row in course_model.get_course_stats()}[3] == 3
+
+        add_orphans(test_database, 88, 2, start=200)
+        report = integrity.scan_orphans(test_database, repair="delete")
+        assert report["repaired"] == 2
+        assert test_database.fetchone("SELECT COUNT(*) FROM students")[0] == 6
+
+        with pytest.raises(ValueError):
+            integrity.scan_orphans(test_database, repair="reassign", reassign_to=999)
@@ -0,0 +1,117 @@
+import time
+import pytest
+from db import Database
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+from query_executor import QueryExecutor
+from view.live_search import LiveSearch
+from test_query_executor import FakeRoot
+
+class FakeVar:
+    """Minimal StringVar: stores a value and fires write traces"""
+
+    def __init__(self):
+        self.value = ""
+        self.traces = []
+
+    def trace_add(self, mode, callback):
+        self.traces.append(callback)
+
+    def set(self, value):
+        self.value = value
+        for callback in self.traces:
+            callback("var", "", "write")
+
+    def get(self):
+        return self.value
+
+class FakeWidget:
+    """Records after() timers so the test decides when they fire"""
+
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.timers[self.next_id] = func
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def fire(self):
+        timers, self.timers = self.timers, {}
+        for func in timers.values():
+            func()
+
+class TestLiveSearch:
+    """Testing debounced, incremental search"""
+
+    def test_keystrokes_are_debounced(self):
+        widget, var, searches = FakeWidget(), FakeVar(), []
+        LiveSearch(widget, var, searches.append)
+
+        for text in ["J", "Jo", "Joh", "John"]:
+            var.set(text)
+        # Each keystroke replaced the pending timer
+        assert len(widget.timers) == 1
+        widget.fire()
+        assert searches == ["John"]
+
+        # Same term again does not search twice
+        var.set("John ")
+        widget.fire()
+        assert searches == ["John"]
+
+    def test_refine_matches_database_search(self, test_database):
+        student_model = StudentModel(test_database)
+        if not student_model.fts_enabled:
+            pytest.skip("SQLite build has no FTS5 trigram tokenizer")
+
+        first = student_model.search_rows("Joh", 100)
+        assert first["complete"]
+        assert student_model.can_refine("Joh", "John")
+        assert not student_model.can_refine("Jo", "John")
+        assert not student_model.can_refine("Joh", "Jane")
+
+        refined = student_model.refine(first["rows"], "johnson")
+        expected = student_model.search_rows("johnson", 100)["rows"]
+        assert [r["id"] for r in refined] == [r["id"] for r in expected] == [3]
+
+        # Course fields are searchable too
+        assert len(student_model.refine(student_model.search_rows("Test", 100)["rows"], "Programming")) == 2
+
+    def test_incomplete_results_are_flagged(self, test_database):
+        student_model = StudentModel(test_database)
+        result = student_model.search_rows("email", 2)
+        assert len(result["rows"]) == 2
+        assert not result["complete"]
+
+    def test_superseded_query_is_interrupted(self, tmp_path):
+        db = Database(str(tmp_path / "live.db"))
+        CourseModel(db)
+        root = FakeRoot()
+        executor = QueryExecutor(root, db.db_file)
+        errors, results = [], []
+
+        # A deliberately endless query, cancelled while it runs
+        slow = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n"
+        future = executor.call(SlowModel, "run", slow, errback=errors.append, key="search")
+        time.sleep(0.05)
+        executor.cancel("search")
+        executor.call(CourseModel, "count_courses", callback=results.append, key="search")
+        root.pump()
+
+        assert "interrupted" in str(future.exception())
+        assert errors == []  # superseded failures are not reported
+        assert results == [0]
+        executor.shutdown()
+        db.close()
+
+class SlowModel:
+    def __init__(self, db):
+        self.db = db
+
+    def run(self, query):
+        return self.db.fetchone(query)[0]
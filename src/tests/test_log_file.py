@@ -0,0 +1,116 @@
+import os
+import time
+from model import log_file
+from model.log_file import LogFile, LogSearch
+
+def write_lines(path, lines, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        f.writelines(f"{line}\n" for line in lines)
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+class TestLogFile:
+    """Testing random access and searching over large log files"""
+
+    def test_reads_lines_by_number(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(log_file, "BLOCK_SIZE", 1024)  # many checkpoints
+        path = str(tmp_path / "audit.log")
+        write_lines(path, [f"line {i}" for i in range(5000)])
+        log = LogFile(path)
+
+        assert log.index_more() == 5000
+        assert len(log.checkpoint_lines) > 10
+        assert log.read_lines(0, 2) == ["line 0", "line 1"]
+        assert log.read_lines(3210, 3) == ["line 3210", "line 3211", "line 3212"]
+        assert log.read_lines(4998, 10) == ["line 4998", "line 4999"]
+
+    def test_follows_appended_lines(self, tmp_path):
+        path = str(tmp_path / "audit.log")
+        write_lines(path, ["first"])
+        log = LogFile(path)
+        log.index_more()
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("second\nthird (unfinished")
+        assert log.index_more() == 1
+        assert log.read_lines(0, 5) == ["first", "second"]
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(")\n")
+        assert log.index_more() == 1
+        assert log.read_lines(2, 1) == ["third (unfinished)"]
+
+    def test_starts_over_when_file_is_rotated(self, tmp_path):
+        path = str(tmp_path / "audit.log")
+        write_lines(path, [f"old {i}" for i in range(100)])
+        log = LogFile(path)
+        log.index_more()
+        generation = log.generation
+
+        os.replace(path, path + ".1")
+        write_lines(path, ["new 0"])
+        log.index_more()
+
+        assert log.generation != generation
+        assert log.line_count == 1
+        assert log.read_lines(0, 1) == ["new 0"]
+
+    def test_background_indexing(self, tmp_path):
+        path = str(tmp_path / "audit.log")
+        write_lines(path, [f"line {i}" for i in range(1000)])
+        log = LogFile(path)
+        log.start()
+        try:
+            assert wait_for(lambda: log.line_count == 1000)
+            write_lines(path, ["appended"], mode="a")
+            assert wait_for(lambda: log.line_count == 1001)
+        finally:
+            log.stop()
+
+    def test_search_finds_matching_lines(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(log_file, "BLOCK_SIZE", 256)  # matches span several chunks
+        path = str(tmp_path / "audit.log")
+        write_lines(path, [f"2024-01-01 | {'DELETE' if i % 7 == 0 else 'ADD'} | {{\"id\": {i}}}" for i in range(500)])
+        log = LogFile(path)
+        log.index_more()
+
+        search = LogSearch(log, "delete")
+        try:
+            assert wait_for(lambda: search.scanned_pos == log.indexed_pos)
+            assert search.match_count == len(range(0, 500, 7))
+            assert search.line_numbers[:3] == [1, 8, 15]
+            assert log.read_at(search.offsets[1:2]) == ['2024-01-01 | DELETE | {"id": 7}']
+        finally:
+            search.cancel()
+
+    def test_regex_search(self, tmp_path):
+        path = str(tmp_path / "audit.log")
+        write_lines(path, ["id 10", "id 200", "id 3000"])
+        log = LogFile(path)
+        log.index_more()
+
+        search = LogSearch(log, r"id \d{3}$", regex=True)
+        try:
+            assert wait_for(lambda: search.scanned_pos == log.indexed_pos)
+            assert search.line_numbers == [2]
+        finally:
+            search.cancel()
+
+    def test_empty_match_pattern_finds_every_line_once(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(log_file, "BLOCK_SIZE", 64)  # several chunks, each ending in a newline
+        path = str(tmp_path / "audit.log")
+        write_lines(path, [f"line {i}" for i in range(100)])
+        log = LogFile(path)
+        log.index_more()
+
+        search = LogSearch(log, "^", regex=True)
+        try:
+            assert wait_for(lambda: search.scanned_pos == log.indexed_pos)
+            time.sleep(0.05)  # a rescanning thread would keep adding matches
+            assert search.line_numbers == list(range(1, 101))
+        finally:
+            search.cancel()
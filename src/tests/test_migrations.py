@@ -0,0 +1,45 @@
+import sqlite3
+import pytest
+from db import Database, migrate, SCHEMA_VERSION
+from model.student_model import StudentModel
+
+class TestSchemaMigrations:
+    """Testing the PRAGMA user_version migration runner"""
+
+    def test_fresh_database_reaches_latest_version(self):
+        db = Database(":memory:")
+        assert db.fetchone("PRAGMA user_version")[0] == SCHEMA_VERSION
+
+        indexes = {r["name"] for r in db.fetchall("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_students_course_id" in indexes
+        assert "idx_courses_course_name" in indexes
+
+        columns = [r[1] for r in db.fetchall("PRAGMA table_info(students)")]
+        assert "phone" in columns
+        db.close()
+
+    def test_old_database_is_upgraded_in_place(self, test_database):
+        # The fixture builds the pre-migration schema: no phone, no indexes
+        StudentModel(test_database)
+
+        columns = [r[1] for r in test_database.fetchall("PRAGMA table_info(students)")]
+        assert "phone" in columns
+        assert test_database.fetchone("PRAGMA user_version")[0] == SCHEMA_VERSION
+        # Existing rows survive the upgrade
+        assert test_database.fetchone("SELECT COUNT(*) FROM students")[0] == 3
+
+    def test_migrate_is_idempotent(self):
+        conn = sqlite3.connect(":memory:")
+        assert migrate(conn) == 0
+        assert migrate(conn) == SCHEMA_VERSION
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        conn.close()
+
+    def test_course_join_uses_index(self):
+        db = Database(":memory:")
+        plan = db.fetchall("EXPLAIN QUERY PLAN SELECT id FROM students WHERE course_id = ?", (1,))
+        assert any("idx_students_course_id" in r["detail"] for r in plan)
+
+        plan = db.fetchall("EXPLAIN QUERY PLAN SELECT id FROM courses WHERE course_name = ?", ("x",))
+        assert any("idx_courses_course_name" in r["detail"] for r in plan)
+        db.close()
@@ -0,0 +1,88 @@
+import pytest
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+class TestKeysetPagination:
+    """Testing keyset (seek) pagination on both models"""
+
+    def test_student_pages_cover_table_once(self, test_database):
+        student_model = StudentModel(test_database)
+        for i in range(7):
+            student_model.add_student(f"P{i:03d}", "Page", f"Student{i}", f"page{i}@test.edu", 1)
+
+        seen = []
+        page = student_model.page(limit=3)
+        seen += [s['id'] for s in page['rows']]
+        while page['has_more']:
+            page = student_model.page(page['last_id'], 3)
+            seen += [s['id'] for s in page['rows']]
+
+        # 3 seeded students + 7 added, each returned exactly once and in id order
+        assert seen == sorted(seen)
+        assert len(seen) == len(set(seen)) == 10
+
+    def test_student_pages_by_email(self, test_database):
+        student_model = StudentModel(test_database)
+
+        first = student_model.page(limit=2, order_by='email')
+        assert [s['email'] for s in first['rows']] == ['bob.johnson@email.com', 'jane.smith@email.com']
+        assert first['has_more']
+
+        second = student_model.page(first['last_id'], 2, order_by='email')
+        assert [s['email'] for s in second['rows']] == ['john.doe@email.com']
+        assert not second['has_more']
+
+    def test_student_page_with_search_term(self, test_database):
+        student_model = StudentModel(test_database)
+        page = student_model.page(limit=10, term='John')
+        assert len(page['rows']) == 2
+        assert not page['has_more']
+
+    def test_unindexed_order_rejected(self, test_database):
+        with pytest.raises(ValueError):
+            StudentModel(test_database).page(order_by='first_name')
+        with pytest.raises(ValueError):
+            CourseModel(test_database).page(order_by='lecturer; DROP TABLE courses')
+
+    def test_course_pages(self, test_database):
+        course_model = CourseModel(test_database)
+
+        first = course_model.page(limit=2, order_by='course_code')
+        assert [c['course_code'] for c in first['rows']] == ['TEST101', 'TEST201']
+        assert first['has_more']
+
+        second = course_model.page(first['last_id'], 2, order_by='course_code')
+        assert [c['course_code'] for c in second['rows']] == ['TEST301']
+        assert not second['has_more']
+        assert course_model.page(second['last_id'], 2)['rows'] == []
+
+    def test_next_page_after_last_row_deleted(self, test_database):
+        student_model = StudentModel(test_database)
+
+        first = student_model.page(limit=2, order_by='email')
+        student_model.delete_student(first['last_id'])
+
+        # The page's last_value still marks the position once its row is gone
+        second = student_model.page(first['last_id'], 2, order_by='email', after_value=first['last_value'])
+        assert [s['email'] for s in second['rows']] == ['john.doe@email.com']
+        with pytest.raises(ValueError):
+            student_model.page(first['last_id'], 2, order_by='email')
+
+    def test_course_pages_through_null_codes(self, test_database):
+        course_model = CourseModel(test_database)
+        for name in ('No Code A', 'No Code B'):
+            test_database.execute("INSERT INTO courses (course_code, course_name) VALUES (NULL, ?)", (name,))
+
+        codes = []
+        page = course_model.page(limit=1, order_by='course_code')
+        codes += [c['course_code'] for c in page['rows']]
+        while page['has_more']:
+            page = course_model.page(page['last_id'], 1, order_by='course_code', after_value=page['last_value'])
+            codes += [c['course_code'] for c in page['rows']]
+
+        # NULLs sort first and paging carries on past them
+        assert codes == [None, None, 'TEST101', 'TEST201', 'TEST301']
+
+        # Resuming from the id alone looks up the NULL anchor and carries on the same way
+        first = course_model.page(limit=1, order_by='course_code')
+        assert len(course_model.page(first['last_id'], 10, order_by='course_code')['rows']) == 4
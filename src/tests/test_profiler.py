@@ -0,0 +1,54 @@
+import json
+import pytest
+from db import Database
+from model.course_model import CourseModel
+from profiler import chrome_trace, profiler
+from query_executor import InlineExecutor
+
+@pytest.fixture
+def traced(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    profiler.configure(enabled=True, history=10, trace_file=str(trace))
+    profiler.clear()
+    db = Database(str(tmp_path / "profiled.db"))
+    yield db, trace
+    db.close()
+    profiler.close()
+
+class TestProfiler:
+    """Testing opt-in operation profiling and the trace file"""
+
+    def test_operation_splits_sql_python_and_tk_time(self, traced):
+        db, trace = traced
+        executor = InlineExecutor(db)
+        executor.call(CourseModel, "add_course", "CS101", "Computing", "Dr. Ada", 3)
+        delivered = []
+        executor.call(CourseModel, "get_all_courses", callback=delivered.append)
+
+        latest = profiler.recent()[0]
+        assert latest["name"] == "CourseModel.get_all_courses" and latest["outcome"] == "ok"
+        assert latest["rows"] == 1 and latest["statements"] >= 1
+        assert latest["sql_ms"] > 0 and latest["tk_ms"] >= 0
+        assert latest["total_ms"] >= latest["sql_ms"] + latest["python_ms"]
+        # The insert's triggers show up as extra statements in the trace callback
+        assert profiler.recent()[1]["statements"] > 1
+
+    def test_trace_file_holds_chrome_trace_events(self, traced, tmp_path):
+        db, trace = traced
+        InlineExecutor(db).call(CourseModel, "count_courses")
+        events = [json.loads(line) for line in trace.read_text().splitlines()]
+        assert {"sql", "model", "tk", "operation"} <= {event["cat"] for event in events}
+        assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+        operation = next(event for event in events if event["cat"] == "operation")
+        assert operation["args"]["sql"]
+
+        output = tmp_path / "trace.json"
+        assert chrome_trace(str(trace), str(output)) == len(events)
+        assert len(json.loads(output.read_text())["traceEvents"]) == len(events)
+
+    def test_disabled_profiler_records_nothing(self, traced):
+        db, _ = traced
+        profiler.disable()
+        InlineExecutor(db).call(CourseModel, "count_courses")
+        assert profiler.start("anything") is None
+        assert profiler.recent() == []
@@ -0,0 +1,125 @@
+import threading
+import time
+import pytest
+from db import Database
+from model.course_model import CourseModel
+from query_executor import QueryExecutor, InlineExecutor
+from view.base_view import BaseView
+
+class FakeRoot:
+    """Stands in for the Tk root: collects after() callbacks for the test to pump"""
+
+    def __init__(self):
+        self.scheduled = []
+        self.errors = []
+
+    def after(self, ms, func):
+        self.scheduled.append(func)
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.errors.append(exc)
+
+    def pump(self, timeout=5):
+        deadline = time.time() + timeout
+        while self.scheduled and time.time() < deadline:
+            func = self.scheduled.pop(0)
+            time.sleep(0.005)
+            func()
+
+class TestQueryExecutor:
+    """Testing the worker-thread query executor"""
+
+    def test_calls_run_off_the_calling_thread(self, tmp_path):
+        db = Database(str(tmp_path / "exec.db"))
+        root = FakeRoot()
+        executor = QueryExecutor(root, db.db_file)
+        results, threads, busy = [], [], []
+        executor.add_busy_listener(busy.append)
+
+        executor.call(CourseModel, "add_course", "CS101", "Computer Science", "Dr. Smith", 3)
+        executor.call(CourseModel, "get_all_courses",
+                      callback=lambda rows: (results.append(rows), threads.append(threading.current_thread())))
+        root.pump()
+
+        assert results[0][0]["course_code"] == "CS101"
+        # Callback came back on the thread that pumps the event loop
+        assert threads == [threading.current_thread()]
+        assert busy == [True, False]
+        # The write is visible to the main connection
+        assert CourseModel(db).get_course_id("Computer Science") == 1
+        executor.shutdown()
+        db.close()
+
+    def test_superseded_results_are_dropped(self, tmp_path):
+        db = Database(str(tmp_path / "exec.db"))
+        root = FakeRoot()
+        executor = QueryExecutor(root, db.db_file)
+        delivered = []
+
+        executor.call(CourseModel, "search_courses", "first", callback=lambda r: delivered.append("first"), key="table")
+        executor.call(CourseModel, "search_courses", "second", callback=lambda r: delivered.append("second"), key="table")
+        root.pump()
+
+        assert delivered == ["second"]
+        executor.shutdown()
+        db.close()
+
+    def test_errors_go_to_errback(self, tmp_path):
+        db = Database(str(tmp_path / "exec.db"))
+        root = FakeRoot()
+        executor = QueryExecutor(root, db.db_file)
+        errors = []
+
+        executor.call(CourseModel, "add_course", "CS101", "A", "B", 3)
+        executor.call(CourseModel, "add_course", "CS101", "A", "B", 3, errback=errors.append)
+        root.pump()
+
+        assert len(errors) == 1
+        assert "UNIQUE" in str(errors[0])
+        executor.shutdown()
+        db.close()
+
+    def test_view_busy_listener_sets_the_cursor(self, tmp_path):
+        class Widget:
+            """Just what BaseView.set_busy touches; config is the loaded config.json, as in BaseView"""
+            config = {"theme": "light"}
+            cursors = []
+
+            def configure(self, **options):
+                self.cursors.append(options["cursor"])
+
+        db = Database(str(tmp_path / "exec.db"))
+        root, widget, results = FakeRoot(), Widget(), []
+        executor = QueryExecutor(root, db.db_file)
+        executor.add_busy_listener(lambda busy: BaseView.set_busy(widget, busy))
+        executor.call(CourseModel, "count_courses", callback=results.append)
+        root.pump()
+        assert results == [0] and widget.cursors == ["watch", ""] and root.errors == []
+        executor.shutdown()
+        db.close()
+
+    def test_failing_busy_listener_does_not_stop_delivery(self, tmp_path):
+        def broken(busy):
+            raise TypeError("listener bug")
+
+        db = Database(str(tmp_path / "exec.db"))
+        root, results = FakeRoot(), []
+        executor = QueryExecutor(root, db.db_file)
+        executor.add_busy_listener(broken)
+        executor.call(CourseModel, "count_courses", callback=results.append)
+        executor.call(CourseModel, "get_course_names", callback=results.append)
+        root.pump()
+        assert results == [0, []]
+        assert not executor.polling and executor.pending == 0
+        assert [str(e) for e in root.errors] == ["listener bug", "listener bug"]
+        executor.shutdown()
+        db.close()
+
+    def test_inline_executor(self, test_database):
+        executor = InlineExecutor(test_database)
+        results = []
+        executor.call(CourseModel, "get_course_names", callback=results.append)
+        assert results == [["Test Mathematics", "Test Physics", "Test Programming"]]
+
+        with pytest.raises(Exception):
+            executor.call(CourseModel, "add_course", "TEST101", "Dup", "Dr. Dup", 3)
@@ -0,0 +1,73 @@
+import pytest
+from db import Database
+from model.course_model import CourseModel
+from model.student_model import StudentModel
+from query_registry import AD_HOC, QueryRegistry, registry
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "queries.db"))
+    registry.reset()
+    yield db
+    db.close()
+
+def timings(name):
+    return next(entry for entry in registry.snapshot() if entry["name"] == name)
+
+class TestQueryRegistry:
+    """Testing declared queries and their per-query timings"""
+
+    def test_declare_returns_the_same_query_for_the_same_text(self):
+        queries = QueryRegistry()
+        first = queries.declare("x.get", "SELECT 1")
+        assert queries.declare("x.get", "SELECT 1") is first
+        variant = queries.declare("x.get", "SELECT 2")
+        assert variant.name == "x.get" and variant is not first
+        assert queries.statement_cache_size() >= 128
+
+    def test_snapshot_reports_calls_rows_and_percentiles(self):
+        queries = QueryRegistry()
+        for ms in range(1, 101):
+            queries.record("x.get", ms / 1000, 2)
+        queries.record("x.cheap", 0.0001, 0)
+        report = queries.snapshot()
+        assert [entry["name"] for entry in report] == ["x.get", "x.cheap"]  # most total time first
+        entry = report[0]
+        assert entry["calls"] == 100 and entry["rows"] == 200
+        assert entry["p50_ms"] == pytest.approx(50) and entry["p95_ms"] == pytest.approx(95)
+        assert entry["p99_ms"] == pytest.approx(99) and entry["max_ms"] == pytest.approx(100)
+        assert queries.snapshot(top=1) == report[:1]
+        queries.reset()
+        assert queries.snapshot() == []
+
+    def test_model_calls_are_timed_by_name(self, db):
+        courses, students = CourseModel(db), StudentModel(db)
+        course = courses.add_course("CS101", "Computing", "Dr. Ada", 3)
+        for n in range(3):
+            students.add_student(f"S{n}", "Jane", "Doe", f"jane{n}@example.com", course.id)
+        students.page(limit=2)
+        students.page(after_id=2, limit=2)
+        db.fetchall("SELECT * FROM courses")
+
+        assert timings("students.insert")["calls"] == 3 and timings("students.insert")["rows"] == 3
+        page = timings("students.page")
+        assert page["calls"] == 2 and page["rows"] == 4  # each page reads one extra row
+        assert timings(AD_HOC)["rows"] == 1
+
+    def test_variants_are_built_once(self, db):
+        students = StudentModel(db)
+        assert students._page_query("id", True, students.MATCH_ALL) is students._page_query("id", True, students.MATCH_ALL)
+        assert students._count_query(students.MATCH_LIKE).name == "students.count"
+
+    def test_helper_statements_are_timed_apart(self, db):
+        courses, students = CourseModel(db), StudentModel(db)
+        course = courses.add_course("CS101", "Computing", "Dr. Ada", 3)
+        for n in range(3):
+            students.add_student(f"S{n}", "Jane", "Doe", f"jane{n}@example.com", course.id)
+        students.page(after_id=1, limit=2, order_by="student_no")
+        students.delete_student(1)
+
+        assert timings("students.page")["calls"] == 1
+        assert timings("students.page_anchor")["calls"] == 1
+        assert timings("students.delete")["calls"] == 1
+        assert timings("students.select_for_delete")["calls"] == 1
@@ -0,0 +1,37 @@
+import pytest
+from model.records import StudentRow, CourseRow
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+class TestRecords:
+    """Testing the compact row records models return"""
+
+    def test_student_rows_read_like_dicts(self, test_database):
+        student_model = StudentModel(test_database)
+
+        row = student_model.get_student(1)
+
+        assert isinstance(row, StudentRow)
+        assert row['student_no'] == row.student_no == 'S1001'
+        assert row['name'] == 'John Doe'
+        assert row['course'] == 'Test Programming'
+        assert row[0] == 1
+        with pytest.raises(KeyError):
+            row['no_such_field']
+
+    def test_rows_use_no_per_row_dict(self, test_database):
+        student_model = StudentModel(test_database)
+        course_model = CourseModel(test_database)
+
+        assert not hasattr(student_model.get_all_students()[0], '__dict__')
+        assert not hasattr(course_model.get_all_courses()[0], '__dict__')
+
+    def test_as_dict_includes_computed_fields(self, test_database):
+        course_model = CourseModel(test_database)
+        student_model = StudentModel(test_database)
+
+        student = student_model.get_student(1).as_dict()
+        assert student['name'] == 'John Doe'
+        assert student['course_code'] == 'TEST101'
+        assert isinstance(course_model.get_course_by_id(1), CourseRow)
+        assert course_model.get_course_by_id(1).as_dict()['credits'] == 3
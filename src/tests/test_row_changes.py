@@ -0,0 +1,44 @@
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+class TestRowChanges:
+    """Testing that writes return the rows views need to patch their tables"""
+
+    def test_add_student_returns_display_row(self, test_database):
+        student_model = StudentModel(test_database)
+
+        row = student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+
+        assert row['student_no'] == 'S5001'
+        assert row['name'] == 'New Student'
+        assert row['course'] == row['course_name']
+        assert row == student_model.get_student(row['id'])
+
+    def test_update_student_returns_new_values(self, test_database):
+        student_model = StudentModel(test_database)
+        row = student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+
+        updated = student_model.update_student(row['id'], 'S5001', 'Renamed', 'Student', 'new@test.edu', 1)
+
+        assert updated['id'] == row['id']
+        assert updated['name'] == 'Renamed Student'
+
+    def test_delete_student_returns_id_once(self, test_database):
+        student_model = StudentModel(test_database)
+        row = student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+
+        assert student_model.delete_student(row['id']) == row['id']
+        assert student_model.delete_student(row['id']) is None
+
+    def test_course_writes_return_rows(self, test_database):
+        course_model = CourseModel(test_database)
+
+        row = course_model.add_course('CS900', 'Compilers', 'Dr. Lee', 4)
+        assert row['course_code'] == 'CS900'
+        assert row['credits'] == 4
+
+        updated = course_model.update_course(row['id'], 'CS900', 'Compilers II', 'Dr. Lee', 4)
+        assert updated['course_name'] == 'Compilers II'
+
+        assert course_model.delete_course(row['id']) == row['id']
+        assert course_model.delete_course(row['id']) is None
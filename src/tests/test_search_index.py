@@ -0,0 +1,84 @@
+import pytest
+from model.student_model import StudentModel
+from model.course_model import CourseModel
+
+class TestSearchIndex:
+    """Testing the FTS5 shadow index used by student and course search"""
+
+    def test_index_built_for_existing_rows(self, test_database):
+        # Fixture rows were inserted before the index existed
+        student_model = StudentModel(test_database)
+        if not student_model.fts_enabled:
+            pytest.skip("SQLite build has no FTS5 trigram tokenizer")
+
+        results = student_model.search_students('johnson')
+        assert [s['student_no'] for s in results] == ['S1003']
+
+    def test_index_follows_student_writes(self, test_database):
+        course_model = CourseModel(test_database)
+        student_model = StudentModel(test_database)
+        if not student_model.fts_enabled:
+            pytest.skip("SQLite build has no FTS5 trigram tokenizer")
+
+        student_model.add_student('S2001', 'Ada', 'Lovelace', 'ada@test.edu', 2)
+        assert len(student_model.search_students('Lovelace')) == 1
+
+        student_model.update_student(4, 'S2001', 'Ada', 'Byron', 'ada@test.edu', 2)
+        assert student_model.search_students('Lovelace') == []
+        assert len(student_model.search_students('Byron')) == 1
+
+        student_model.delete_student(4)
+        assert student_model.search_students('Byron') == []
+
+    def test_student_search_by_course(self, test_database):
+        course_model = CourseModel(test_database)
+        student_model = StudentModel(test_database)
+        if not student_model.fts_enabled:
+            pytest.skip("SQLite build has no FTS5 trigram tokenizer")
+
+        assert len(student_model.search_students('Programming')) == 2
+
+        # Renaming a course re-indexes its students
+        course_model.update_course(1, 'TEST101', 'Software Craft', 'Dr. Test', 3)
+        assert student_model.search_students('Programming') == []
+        assert len(student_model.search_students('Craft')) == 2
+        assert student_model.count_students('Craft') == 2
+
+    def test_course_search_and_rebuild(self, test_database):
+        course_model = CourseModel(test_database)
+        if not course_model.fts_enabled:
+            pytest.skip("SQLite build has no FTS5 trigram tokenizer")
+
+        assert len(course_model.search_courses('Prof')) == 1
+
+        test_database.execute("DELETE FROM courses_fts")
+        assert course_model.search_courses('Prof') == []
+        course_model.rebuild_search_index()
+        assert len(course_model.search_courses('Prof')) == 1
+
+    def test_short_terms_and_query_syntax(self, test_database):
+        student_model = StudentModel(test_database)
+
+        # Two characters is below trigram length; LIKE fallback still matches
+        assert len(student_model.search_students('Jo')) == 2
+        # FTS operators in user input are matched literally
+        assert student_model.search_students('John OR "x') == []
+
+    def test_rebuild_script_rebuilds_once(self, tmp_path, monkeypatch):
+        import json
+        import rebuild_search_index
+        from model import search_index
+
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "data").mkdir()
+        (tmp_path / "config.json").write_text(json.dumps({"database": {"cache_size": -4000}}))
+
+        calls = []
+        rebuild = search_index.rebuild_search_index
+        monkeypatch.setattr(search_index, "rebuild_search_index", lambda conn: calls.append(1) or rebuild(conn))
+        # A new database gets its index while migrating, an existing one from the explicit rebuild
+        for _ in range(2):
+            if not rebuild_search_index.rebuild_search_index():
+                pytest.skip("SQLite build has no FTS5 trigram tokenizer")
+            assert len(calls) == 1
+            calls.clear()
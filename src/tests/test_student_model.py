@@ -62,3 +62,32 @@ class TestStudentModel:
         
         students = student_model.get_all_students()
         assert students[0]['name'] == 'John Smith'
+
+    def test_students_window(self, test_database):
+        student_model = StudentModel(test_database)
+
+        # Fixture seeds three students; windows are ordered by id
+        assert student_model.count_students() == 3
+        window = student_model.get_students_window(1, 2)
+        assert [s['student_no'] for s in window] == ['S1002', 'S1003']
+        assert window[0]['name'] == 'Jane Smith'
+
+        assert student_model.count_students('John') == 2
+        assert len(student_model.get_students_window(0, 10, 'John')) == 2
+        assert student_model.get_students_window(5, 10) == []
+
+    def test_students_window_seeks_from_neighbour(self, test_database):
+        student_model = StudentModel(test_database)
+        for i in range(5):
+            student_model.add_student(f"W{i:03d}", "Window", f"Student{i}", f"window{i}@test.edu", 1)
+        ids = [s['id'] for s in student_model.get_students_window(0, 8)]
+
+        # Seeking from a neighbouring window's edge row gives the same rows as OFFSET
+        assert [s['id'] for s in student_model.get_students_window(3, 3, after_id=ids[2])] == ids[3:6]
+        assert [s['id'] for s in student_model.get_students_window(3, 3, before_id=ids[6])] == ids[3:6]
+
+        # The edge row stays a valid anchor after it is deleted
+        student_model.delete_student(ids[2])
+        assert [s['id'] for s in student_model.get_students_window(2, 3, after_id=ids[2])] == ids[3:6]
+        matching = student_model.get_students_window(0, 10, 'Window', after_id=ids[3])
+        assert [s['id'] for s in matching] == ids[4:8]
@@ -0,0 +1,49 @@
+import pytest
+from db import Database
+from model.student_model import StudentModel
+
+class TestTransactions:
+    """Testing the Database.transaction() unit of work"""
+
+    def test_block_commits_once(self, tmp_path):
+        db = Database(str(tmp_path / "tx.db"))
+        student_model = StudentModel(db)
+        db.execute("INSERT INTO courses (course_code, course_name) VALUES ('CS101', 'Computer Science')")
+
+        commits = []
+        db.conn.set_trace_callback(lambda sql: commits.append(sql) if sql == "COMMIT" else None)
+        with db.transaction():
+            for i in range(50):
+                student_model.add_student(f"S{i}", "Batch", f"Student{i}", f"s{i}@test.edu", 1)
+        db.conn.set_trace_callback(None)
+
+        assert commits == ["COMMIT"]
+        assert db.fetchone("SELECT COUNT(*) FROM students")[0] == 50
+        db.close()
+
+    def test_failure_rolls_back_whole_block(self, test_database):
+        student_model = StudentModel(test_database)
+
+        with pytest.raises(Exception):
+            with test_database.transaction():
+                student_model.add_student('S5001', 'New', 'Student', 'new@test.edu', 1)
+                # Duplicate student number fails the second write
+                student_model.add_student('S1001', 'Dup', 'Student', 'dup@test.edu', 1)
+
+        assert test_database.fetchone("SELECT COUNT(*) FROM students")[0] == 3
+        assert not test_database.in_transaction
+
+    def test_nested_failure_only_undoes_savepoint(self, test_database):
+        student_model = StudentModel(test_database)
+
+        with test_database.transaction():
+            student_model.add_student('S5001', 'Kept', 'Student', 'kept@test.edu', 1)
+            try:
+                with test_database.transaction():
+                    test_database.execute("DELETE FROM students")
+                    raise RuntimeError("abort inner block")
+            except RuntimeError:
+                pass
+
+        # Inner delete was rolled back, outer insert committed
+        assert test_database.fetchone("SELECT COUNT(*) FROM students")[0] == 4
@@ -0,0 +1,140 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from model.audit_model import AuditModel
+
+
+class AuditLogWindow(tk.Toplevel):
+    """Pages through audit_events, newest first, with filtering done in SQL.
+
+    Only one page of events is ever loaded; Older/Newer move by keyset
+    (the id of the last event shown), so paging stays fast however long
+    the trail grows.
+    """
+
+    PAGE_SIZE = 200
+    ANY = "All"
+
+    def __init__(self, parent, executor, entity=None):
+        super().__init__(parent)
+        self.title("Audit Log")
+        self.geometry("900x550")
+        self.executor = executor
+        self.filters = {}
+        # before_id of every page visited, so Newer can step back
+        self.page_starts = [None]
+        self.next_before = None
+
+        self.create_filters(entity)
+        self.create_table()
+        self.create_pager()
+        self.apply_filters()
+
+    # ------------------------------
+    # LAYOUT
+    # ------------------------------
+    def create_filters(self, entity):
+        frame = tk.Frame(self)
+        frame.pack(fill="x", padx=10, pady=8)
+
+        tk.Label(frame, text="Entity:").pack(side="left")
+        self.entity_var = tk.StringVar(value=entity or self.ANY)
+        ttk.Combobox(frame, textvariable=self.entity_var, width=9, state="readonly",
+                     values=(self.ANY,) + AuditModel.ENTITIES).pack(side="left", padx=(2, 8))
+
+        tk.Label(frame, text="Action:").pack(side="left")
+        self.action_var = tk.StringVar(value=self.ANY)
+        ttk.Combobox(frame, textvariable=self.action_var, width=9, state="readonly",
+                     values=(self.ANY,) + AuditModel.ACTIONS).pack(side="left", padx=(2, 8))
+
+        self.since_var, self.until_var, self.text_var = tk.StringVar(), tk.StringVar(), tk.StringVar()
+        for label, var, width in (("From (YYYY-MM-DD):", self.since_var, 11),
+                                  ("To:", self.until_var, 11),
+                                  ("Contains:", self.text_var, 18)):
+            tk.Label(frame, text=label).pack(side="left")
+            entry = tk.Entry(frame, textvariable=var, width=width)
+            entry.pack(side="left", padx=(2, 8))
+            entry.bind("<Return>", lambda e: self.apply_filters())
+
+        tk.Button(frame, text="Apply", command=self.apply_filters).pack(side="left")
+
+    def create_table(self):
+        frame = tk.Frame(self)
+        frame.pack(fill="both", expand=True, padx=10)
+        columns = ("Time", "Entity", "Action", "Row ID", "Details")
+        self.tree = ttk.Treeview(frame, columns=columns, show="headings")
+        for col, width in zip(columns, (140, 70, 70, 60, 520)):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor="w" if col == "Details" else "center",
+                             stretch=col == "Details")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+    def create_pager(self):
+        frame = tk.Frame(self)
+        frame.pack(fill="x", padx=10, pady=8)
+        self.btn_newer = tk.Button(frame, text="◀ Newer", command=self.newer_page, state="disabled")
+        self.btn_newer.pack(side="left")
+        self.btn_older = tk.Button(frame, text="Older ▶", command=self.older_page, state="disabled")
+        self.btn_older.pack(side="left", padx=5)
+        self.status = tk.Label(frame, text="")
+        self.status.pack(side="left", padx=10)
+        self.total = None
+
+    # ------------------------------
+    # PAGING
+    # ------------------------------
+    def apply_filters(self):
+        self.filters = {
+            "entity": "" if self.entity_var.get() == self.ANY else self.entity_var.get(),
+            "action": "" if self.action_var.get() == self.ANY else self.action_var.get(),
+            "since": self.since_var.get().strip(),
+            # An end date includes that whole day
+            "until": self.until_var.get().strip() + " 99" if self.until_var.get().strip() else "",
+            "text": self.text_var.get().strip(),
+        }
+        self.page_starts = [None]
+        self.total = None
+        self.executor.call(AuditModel, "count_events", self.filters, callback=self.on_count,
+                           key="audit.count")
+        self.load_page()
+
+    def older_page(self):
+        self.page_starts.append(self.next_before)
+        self.load_page()
+
+    def newer_page(self):
+        if len(self.page_starts) > 1:
+            self.page_starts.pop()
+            self.load_page()
+
+    def load_page(self):
+        self.executor.call(AuditModel, "page", self.page_starts[-1], self.PAGE_SIZE, self.filters,
+                           callback=self.show_page, key="audit.page",
+                           errback=lambda e: messagebox.showerror("Error", f"Failed to load audit log: {e}",
+                                                                  parent=self))
+
+    def on_count(self, total):
+        if not self.winfo_exists():
+            return  # closed while the query ran
+        self.total = total
+        self.update_status()
+
+    def show_page(self, page):
+        if not self.winfo_exists():
+            return  # closed while the query ran
+        self.tree.delete(*self.tree.get_children())
+        for event in page["rows"]:
+            self.tree.insert("", "end", values=(event.created_at, event.entity, event.action,
+                                                "" if event.entity_id is None else event.entity_id,
+                                                event.payload))
+        self.next_before = page["last_id"]
+        self.btn_older.config(state="normal" if page["has_more"] else "disabled")
+        self.btn_newer.config(state="normal" if len(self.page_starts) > 1 else "disabled")
+        self.update_status()
+
+    def update_status(self):
+        matching = "" if self.total is None else f" · {self.total} matching events"
+        self.status.config(text=f"Page {len(self.page_starts)}{matching}")
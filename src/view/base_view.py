@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk
 import json
 
+from profiler import profiler
+
 class BaseView(tk.Frame):
     def load_config(self, config_file):
         self.config_file = config_file
@@ -26,6 +28,24 @@ class BaseView(tk.Frame):
         self.configure(bg=self.bg)
         self.refresh_colors()
 
+    def load_after_paint(self, load):
+        """Call load() once this view has been laid out and drawn, so it shows before its data"""
+        def run():
+            if self.winfo_exists():
+                self.update_idletasks()
+                with self.profiled("load_data"):
+                    load()
+        self.after_idle(run)
+
+    def profiled(self, name):
+        """Time a block of this view's Tk-side work into the profiler trace (no-op unless enabled)"""
+        return profiler.span(f"{type(self).__name__}.{name}", "tk")
+
+    def set_busy(self, busy):
+        """Show a busy cursor while the query executor has work in flight"""
+        # self.config holds the loaded config.json, so the Tk option method is configure
+        self.configure(cursor="watch" if busy else "")
+
     def refresh_colors(self):
         for widget in self.winfo_children():
             self._apply_widget_colors(widget)
@@ -0,0 +1,49 @@
+import queue
+
+from model import changes
+from profiler import profiler
+
+
+class ChangeDispatcher:
+    """Hands model changes to Tk listeners on the Tk thread, one batch per frame.
+
+    Models publish on whichever thread wrote (usually the query worker), so
+    changes are queued and drained by an after() loop. Everything that
+    arrived during a frame is coalesced and delivered as one list, which
+    turns a burst such as a bulk import into a single update per view.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, root, feed=changes.feed):
+        self.root = root
+        self.queue = queue.SimpleQueue()
+        self.listeners = []
+        self.unsubscribe = feed.subscribe(self.queue.put)
+        self.after_id = root.after(self.FRAME_MS, self._poll)
+
+    def subscribe(self, listener):
+        """Call listener(changes) on the Tk thread with each coalesced batch"""
+        self.listeners.append(listener)
+
+    def _poll(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            batch = changes.coalesce(batch)
+            for listener in list(self.listeners):
+                try:
+                    with profiler.span(getattr(listener, "__qualname__", "change listener"), "tk"):
+                        listener(batch)
+                except Exception as e:
+                    # One failing view must not starve the others or stop the loop
+                    self.root.report_callback_exception(type(e), e, e.__traceback__)
+        self.after_id = self.root.after(self.FRAME_MS, self._poll)
+
+    def close(self):
+        self.unsubscribe()
+        self.root.after_cancel(self.after_id)
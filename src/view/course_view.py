@@ -1,25 +1,46 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
 
+from controller.course_controller import CourseController
 from model.course_model import CourseModel
+from query_executor import QueryExecutor
 from view.base_view import BaseView
+from view.change_dispatcher import ChangeDispatcher
+from view.export_dialog import ExportDialog
+from view.live_search import LiveSearch
 
 
 class CourseView(BaseView):
-    def __init__(self, parent, db, config_file="config.json"):
+    def __init__(self, parent, pool, config_file="config.json", executor=None, changes=None):
         super().__init__(parent)
-        self.db = db
-        self.model = CourseModel(db)
+        self.connections = pool
+        # All reads and writes go through the executor, off the Tk thread
+        self.executor = executor or QueryExecutor(self, pool=pool)
+        # Only for the configured delete policy and for export_csv, which the
+        # export dialog runs on its own connection; queries go through the executor
+        with pool.connection() as db:
+            self.model = CourseModel(db)
+        self.executor.add_busy_listener(self.set_busy)
+        # Committed writes from any view or import arrive here, batched per frame
+        self.changes = changes or ChangeDispatcher(self)
+        self.changes.subscribe(self.on_changes)
         self.load_config(config_file)
         self.apply_theme()
+        # Search term the table is currently filtered by
+        self.table_term = ""
+        # Enrolment figures by course id, shown alongside each course
+        self.stats = {}
 
         self.create_header()
         self.create_theme_toggle()
         self.create_form()
         self.create_search()
         self.create_table()
+        self.load_after_paint(self.load_data)
+
+    def load_data(self):
         self.load_courses()
+        self.load_stats()
 
     # ------------------------------
     # HEADER
@@ -63,11 +84,12 @@ class CourseView(BaseView):
         self.btn_update = tk.Button(button_frame, text="Update", command=self.update_course)
         self.btn_delete = tk.Button(button_frame, text="Delete", command=self.delete_course)
         self.btn_clear = tk.Button(button_frame, text="Clear", command=self.clear_form)
+        self.btn_import = tk.Button(button_frame, text="Import CSV", command=self.import_csv)
         self.btn_export = tk.Button(button_frame, text="Export Logs", command=self.export_logs)
         self.btn_view_logs = tk.Button(button_frame, text="View Logs", command=self.view_logs)
 
-        for b in [self.btn_add, self.btn_update, self.btn_delete,
-                  self.btn_clear, self.btn_export, self.btn_view_logs]:
+        for b in [self.btn_add, self.btn_update, self.btn_delete, self.btn_clear,
+                  self.btn_import, self.btn_export, self.btn_view_logs]:
             b.pack(pady=5)
 
     def clear_form(self):
@@ -77,22 +99,16 @@ class CourseView(BaseView):
     # ------------------------------
     # CRUD METHODS
     # ------------------------------
+    def form_data(self):
+        return {field: entry.get() for field, entry in self.entries.items()}
+
     def save_course(self):
-        code = self.entries['course_code'].get().strip()
-        name = self.entries['course_name'].get().strip()
-        lecturer = self.entries['lecturer'].get().strip()
-        credits = self.entries['credits'].get().strip()
-        if not (code and name and lecturer and credits):
-            messagebox.showerror("Error", "All fields are required.")
-            return
-        
-        try:
-            self.model.add_course(code, name, lecturer, credits)
-            messagebox.showinfo("Success", "Course added successfully.")
-            self.load_courses()
-            self.clear_form()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add course: {e}")
+        # Validation happens in the controller, on the worker
+        self.executor.call(
+            CourseController, "create", self.form_data(),
+            callback=lambda _: self.on_write_done("Success", "Course added successfully."),
+            errback=lambda e: messagebox.showerror("Error", f"Failed to add course: {e}")
+        )
 
     def update_course(self):
         selected = self.tree.selection()
@@ -100,19 +116,11 @@ class CourseView(BaseView):
             messagebox.showwarning("Select Course", "Please select a course to update.")
             return
         id = self.tree.item(selected[0])["values"][0]
-        try:
-            self.model.update_course(
-                id,
-                self.entries['course_code'].get().strip(),
-                self.entries['course_name'].get().strip(),
-                self.entries['lecturer'].get().strip(),
-                self.entries['credits'].get().strip()
-            )
-            messagebox.showinfo("Success", "Course updated successfully.")
-            self.load_courses()
-            self.clear_form()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update course: {e}")
+        self.executor.call(
+            CourseController, "update", id, self.form_data(),
+            callback=lambda _: self.on_write_done("Success", "Course updated successfully."),
+            errback=lambda e: messagebox.showerror("Error", f"Failed to update course: {e}")
+        )
 
     def delete_course(self):
         selected = self.tree.selection()
@@ -120,29 +128,109 @@ class CourseView(BaseView):
             messagebox.showwarning("Delete Course", "Please select a course to delete.")
             return
         id = self.tree.item(selected[0])["values"][0]
-        confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this course?")
+        stats = self.stats.get(id)
+        enrolled = stats.enrolled if stats else 0
+        policy = self.model.delete_policy
+        if enrolled and policy == "restrict":
+            messagebox.showerror("Delete Course",
+                                 f"{enrolled} students are enrolled on this course. "
+                                 "Move or delete them before deleting the course.")
+            return
+        if enrolled and policy == "reassign" and not self.model.reassign_to:
+            messagebox.showerror("Delete Course",
+                                 f"{enrolled} students are enrolled on this course and no course is set "
+                                 "to move them to (reassign_to in config.json).")
+            return
+        question = "Are you sure you want to delete this course?"
+        if enrolled and policy == "cascade":
+            question += f"\n\nIts {enrolled} enrolled students will be deleted too."
+        elif enrolled:
+            question += f"\n\nIts {enrolled} enrolled students will be moved to {self.model.reassign_to}."
+        confirm = messagebox.askyesno("Confirm Delete", question)
         if not confirm:
             return
-        try:
-            self.model.delete_course(id)
-            messagebox.showinfo("Deleted", "Course deleted successfully.")
-            self.load_courses()
+        self.executor.call(
+            CourseController, "delete", id,
+            callback=self.on_delete_done,
+            errback=lambda e: messagebox.showerror("Error", f"Failed to delete course: {e}")
+        )
+
+    def on_delete_done(self, course_id):
+        if course_id is None:
+            # Deleted elsewhere since the table was drawn; the change feed has removed it
+            messagebox.showwarning("Delete Course", "This course no longer exists.")
             self.clear_form()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete course: {e}")
+        else:
+            self.on_write_done("Deleted", "Course deleted successfully.")
+
+    def on_write_done(self, title, message):
+        # The table itself is updated from the change feed, see on_changes
+        messagebox.showinfo(title, message)
+        self.clear_form()
+
+    def on_changes(self, batch):
+        """Bring the table in line with committed course writes"""
+        course_changes = [change for change in batch if change.entity == "course"]
+        if any(change.entity == "student" or change.op != "insert" for change in batch):
+            # Enrolments or credits moved; the summary table makes re-reading them cheap
+            self.load_stats()
+        if any(change.op == "import" or (change.op == "insert" and self.table_term)
+               for change in course_changes):
+            # Whether and where new courses rank in the results is up to the query
+            self.show_courses(self.table_term)
+            return
+        for change in course_changes:
+            self.apply_change(change)
+
+    def apply_change(self, change):
+        """Patch the one affected tree item instead of refilling the table"""
+        iid = str(change.id)
+        if change.op == "delete":
+            if self.tree.exists(iid):
+                self.tree.delete(iid)
+        elif change.op == "update":
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=self.row_values(change.values))
+        elif not self.tree.exists(iid):  # a reload may already have picked it up
+            self.tree.insert("", "end", iid=iid, values=self.row_values(change.values))
 
     def load_courses(self):
-        self.tree.delete(*self.tree.get_children())
-        rows = self.model.get_all_courses()
-        for r in rows:
-            self.tree.insert("", "end", values=(r["id"], r["course_code"], r["course_name"], r["lecturer"], r["credits"]))
+        self.table_term = ""
+        # Same key as search, so whichever was requested last fills the table
+        self.executor.call(CourseModel, "get_all_courses", callback=self.fill_tree, key="courses.table")
 
     def search_course(self):
-        term = self.search_var.get().strip()
-        rows = self.model.search_courses(term)
+        self.live_search.search_now(force=True)
+
+    def show_courses(self, term):
+        if not term:
+            self.load_courses()
+            return
+        self.table_term = term
+        self.executor.call(CourseModel, "search_courses", term, callback=self.fill_tree, key="courses.table")
+
+    def fill_tree(self, rows):
         self.tree.delete(*self.tree.get_children())
+        # Course ids double as item ids so a single row can be patched after a write
         for r in rows:
-            self.tree.insert("", "end", values=(r["id"], r["course_code"], r["course_name"], r["lecturer"], r["credits"]))
+            self.tree.insert("", "end", iid=str(r["id"]), values=self.row_values(r))
+
+    def row_values(self, r):
+        stats = self.stats.get(r["id"])
+        enrolled, credits_enrolled = (stats.enrolled, stats.credits_enrolled) if stats else (0, 0)
+        return (r["id"], r["course_code"], r["course_name"], r["lecturer"], r["credits"],
+                enrolled, credits_enrolled)
+
+    def load_stats(self):
+        self.executor.call(CourseModel, "get_course_stats", callback=self.show_stats, key="courses.stats")
+
+    def show_stats(self, rows):
+        """Fill in the enrolment columns of the courses on screen"""
+        self.stats = {row.course_id: row for row in rows}
+        for iid in self.tree.get_children():
+            stats = self.stats.get(int(iid))
+            self.tree.set(iid, "Students", stats.enrolled if stats else 0)
+            self.tree.set(iid, "Enrolled Credits", stats.credits_enrolled if stats else 0)
 
     # ------------------------------
     # SEARCH BAR + TABLE
@@ -153,7 +241,10 @@ class CourseView(BaseView):
 
         tk.Label(frame, text="🔎 Search:").pack(side="left")
         self.search_var = tk.StringVar()
-        tk.Entry(frame, textvariable=self.search_var, width=40).pack(side="left", padx=10)
+        search_entry = tk.Entry(frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side="left", padx=10)
+        search_entry.bind("<Return>", lambda e: self.search_course())
+        self.live_search = LiveSearch(self, self.search_var, self.show_courses)
         tk.Button(frame, text="Search", command=self.search_course,
                   bg=self.button_bg, fg=self.button_fg).pack(side="left", padx=5)
         tk.Button(frame, text="Clear", command=self.load_courses,
@@ -162,11 +253,12 @@ class CourseView(BaseView):
     def create_table(self):
         frame = tk.Frame(self, bg=self.bg)
         frame.pack(fill="both", expand=True, padx=20, pady=10)
-        columns = ("ID", "Course Code", "Course Name", "Lecturer", "Credits")
+        columns = ("ID", "Course Code", "Course Name", "Lecturer", "Credits", "Students", "Enrolled Credits")
         self.tree = ttk.Treeview(frame, columns=columns, show="headings")
         for col in columns:
             self.tree.heading(col, text=col)
-            self.tree.column(col, width=150, anchor="center")
+            self.tree.column(col, width=150 if col not in ("Students", "Enrolled Credits") else 110,
+                             anchor="center")
         self.tree.pack(fill="both", expand=True)
         self.tree.bind("<<TreeviewSelect>>", self.on_row_select)
 
@@ -186,43 +278,63 @@ class CourseView(BaseView):
         self.entries['credits'].delete(0, tk.END)
         self.entries['credits'].insert(0, values[4])
 
+    # ------------------------------
+    # BULK IMPORT
+    # ------------------------------
+    def import_csv(self):
+        file_path = filedialog.askopenfilename(
+            title="Import courses (columns: course_code, course_name, lecturer, credits)",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        self.executor.call(CourseModel, "import_csv", file_path, callback=self.on_import_done,
+                           errback=lambda e: messagebox.showerror("Error", f"Failed to import courses: {e}"))
+
+    def on_import_done(self, result):
+        rejected = result["rejected"]
+        summary = f"Imported {result['imported']} courses, rejected {len(rejected)}."
+        if rejected:
+            # Show the first few rejects rather than one messagebox per row
+            details = "\n".join(f"Line {line}: {reason}" for line, reason in rejected[:10])
+            more = f"\n... and {len(rejected) - 10} more" if len(rejected) > 10 else ""
+            messagebox.showwarning("Import CSV", f"{summary}\n\n{details}{more}")
+        else:
+            messagebox.showinfo("Import CSV", summary)
+
     # ------------------------------
     # LOGS
     # ------------------------------
     def export_logs(self):
-        try:
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
-            )
-            if not file_path:
-                return
-            rows = self.model.get_all_courses()
-            with open(file_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["ID", "Course Code", "Course Name", "Lecturer", "Credits"])
-                for r in rows:
-                    writer.writerow([r["id"], r["course_code"], r["course_name"], r["lecturer"], r["credits"]])
-            messagebox.showinfo("Export Logs", f"Logs exported successfully to {file_path}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export logs: {e}")
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        # Rows stream from a worker thread straight into the file
+        self.executor.call(
+            CourseModel, "count_courses",
+            callback=lambda total: ExportDialog(self, self.connections, self.model.export_csv, file_path,
+                                                total=total, title="Export Courses")
+        )
 
     def view_logs(self):
-        try:
-            rows = self.model.get_all_courses()
-            if not rows:
-                messagebox.showinfo("View Logs", "No course records found.")
-                return
-            log_window = tk.Toplevel(self)
-            log_window.title("Course Logs")
-            log_window.geometry("600x400")
-            cols = ("ID", "Course Code", "Course Name", "Lecturer", "Credits")
-            tree = ttk.Treeview(log_window, columns=cols, show="headings")
-            for col in cols:
-                tree.heading(col, text=col)
-                tree.column(col, width=150, anchor="center")
-            tree.pack(fill="both", expand=True)
-            for r in rows:
-                tree.insert("", "end", values=(r["id"], r["course_code"], r["course_name"], r["lecturer"], r["credits"]))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load logs: {e}")
+        self.executor.call(CourseModel, "get_all_courses", callback=self.show_logs,
+                           errback=lambda e: messagebox.showerror("Error", f"Failed to load logs: {e}"))
+
+    def show_logs(self, rows):
+        if not rows:
+            messagebox.showinfo("View Logs", "No course records found.")
+            return
+        log_window = tk.Toplevel(self)
+        log_window.title("Course Logs")
+        log_window.geometry("600x400")
+        cols = ("ID", "Course Code", "Course Name", "Lecturer", "Credits")
+        tree = ttk.Treeview(log_window, columns=cols, show="headings")
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor="center")
+        tree.pack(fill="both", expand=True)
+        for r in rows:
+            tree.insert("", "end", values=(r["id"], r["course_code"], r["course_name"], r["lecturer"], r["credits"]))
@@ -0,0 +1,75 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import os
+import threading
+
+
+class ExportDialog(tk.Toplevel):
+    """Runs a model export on a worker thread with a progress bar and cancel button.
+
+    export(f, conn=..., progress=..., cancelled=...) is a model export_csv
+    method; it is given a read-only connection checked out of the pool for
+    as long as the export runs.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, parent, pool, export, file_path, total, title="Export"):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("420x140")
+        self.resizable(False, False)
+        self.transient(parent)
+
+        self.connections = pool
+        self.export = export
+        self.file_path = file_path
+        self.total = total
+        self.written = 0
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+
+        self.label = tk.Label(self, text=f"Exporting 0 of {total} rows...")
+        self.label.pack(pady=(15, 5))
+        self.progress = ttk.Progressbar(self, length=360, mode="determinate", maximum=max(total, 1))
+        self.progress.pack(pady=5)
+        self.btn_cancel = tk.Button(self, text="Cancel", command=self.cancel)
+        self.btn_cancel.pack(pady=5)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+        self.after(self.POLL_MS, self._poll)
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.btn_cancel.config(state="disabled", text="Cancelling...")
+
+    def _run(self):
+        # Worker thread: never touches Tk, only plain attributes polled by _poll
+        try:
+            with self.connections.connection() as db, open(self.file_path, "w", newline="", encoding="utf-8") as f:
+                self.result = self.export(f, conn=db.conn, progress=self._on_progress,
+                                          cancelled=self.cancel_event.is_set)
+            if self.result is None:
+                os.remove(self.file_path)
+        except Exception as e:
+            self.error = e
+
+    def _on_progress(self, written):
+        self.written = written
+
+    def _poll(self):
+        self.progress["value"] = self.written
+        self.label.config(text=f"Exporting {self.written} of {self.total} rows...")
+        if self.worker.is_alive():
+            self.after(self.POLL_MS, self._poll)
+            return
+        self.destroy()
+        if self.error is not None:
+            messagebox.showerror("Error", f"Failed to export logs: {self.error}")
+        elif self.result is None:
+            messagebox.showinfo("Export Logs", "Export cancelled.")
+        else:
+            messagebox.showinfo("Export Logs", f"Exported {self.result} rows to {self.file_path}")
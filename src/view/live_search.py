@@ -0,0 +1,30 @@
+class LiveSearch:
+    """Search-as-you-type for a StringVar, debounced so only pauses in typing search.
+
+    Each keystroke just restarts a timer; on_search(term) runs once the user
+    has stopped typing for delay_ms, and only if the term actually changed.
+    """
+
+    def __init__(self, widget, variable, on_search, delay_ms=200):
+        self.widget = widget
+        self.variable = variable
+        self.on_search = on_search
+        self.delay_ms = delay_ms
+        self.after_id = None
+        self.last_term = None
+        variable.trace_add("write", self._on_change)
+
+    def _on_change(self, *args):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+        self.after_id = self.widget.after(self.delay_ms, self.search_now)
+
+    def search_now(self, force=False):
+        """Run the search immediately, e.g. from a Search button or Enter"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        term = self.variable.get().strip()
+        if force or term != self.last_term:
+            self.last_term = term
+            self.on_search(term)
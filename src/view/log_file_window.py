@@ -0,0 +1,150 @@
+import re
+import tkinter as tk
+from tkinter import messagebox
+
+from model.log_file import LogFile, LogSearch
+from view.virtual_tree import VirtualTreeview
+
+
+class LogFileWindow(tk.Toplevel):
+    """Shows a text log of any size, reading only the lines on screen.
+
+    The file is indexed on a background thread, so the window opens at once
+    and the line count grows as indexing proceeds. With Follow ticked the
+    view stays pinned to the end as new lines are appended, like tail -f.
+    A filter runs as a background LogSearch; its matches fill in while it
+    scans.
+    """
+
+    POLL_MS = 250
+
+    def __init__(self, parent, path, title="Log File"):
+        super().__init__(parent)
+        self.title(f"{title} - {path}")
+        self.geometry("900x550")
+        self.log = LogFile(path)
+        self.search = None
+        self.shown_count = None
+        self.shown_generation = self.log.generation
+
+        self.create_toolbar()
+        self.create_table()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.log.start()
+        self.poll_id = self.after(self.POLL_MS, self.poll)
+
+    # ------------------------------
+    # LAYOUT
+    # ------------------------------
+    def create_toolbar(self):
+        frame = tk.Frame(self)
+        frame.pack(fill="x", padx=10, pady=8)
+
+        tk.Label(frame, text="Filter:").pack(side="left")
+        self.filter_var = tk.StringVar()
+        entry = tk.Entry(frame, textvariable=self.filter_var, width=30)
+        entry.pack(side="left", padx=(2, 5))
+        entry.bind("<Return>", lambda e: self.apply_filter())
+        self.regex_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame, text="Regex", variable=self.regex_var).pack(side="left")
+        tk.Button(frame, text="Apply", command=self.apply_filter).pack(side="left", padx=5)
+        tk.Button(frame, text="Clear", command=self.clear_filter).pack(side="left")
+
+        tk.Button(frame, text="Jump to End", command=self.jump_to_end).pack(side="left", padx=(20, 5))
+        self.follow_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(frame, text="Follow", variable=self.follow_var,
+                       command=lambda: self.follow_var.get() and self.jump_to_end()).pack(side="left")
+
+        self.status = tk.Label(frame, text="Indexing...")
+        self.status.pack(side="right")
+
+    def create_table(self):
+        self.table = VirtualTreeview(
+            self, ("Line", "Text"),
+            fetch_window=self.fetch_window,
+            count_rows=lambda deliver: deliver(self.row_count()),
+            row_values=lambda r: r,
+            row_key=lambda r: r[0],
+            row_height=22
+        )
+        self.table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.table.tree.heading("Line", text="Line")
+        self.table.tree.column("Line", width=70, anchor="e", stretch=False)
+        self.table.tree.heading("Text", text="Text")
+        self.table.tree.column("Text", width=800, anchor="w")
+
+    # ------------------------------
+    # DATA SOURCE
+    # ------------------------------
+    def row_count(self):
+        return self.search.match_count if self.search else self.log.line_count
+
+    def fetch_window(self, offset, limit, deliver):
+        # Reads are a seek plus at most a block of lines, cheap enough for the Tk thread
+        if self.search:
+            offsets = self.search.offsets[offset:offset + limit]
+            numbers = self.search.line_numbers[offset:offset + limit]
+            deliver(list(zip(numbers, self.log.read_at(offsets))))
+        else:
+            lines = self.log.read_lines(offset, limit)
+            deliver([(offset + i + 1, text) for i, text in enumerate(lines)])
+
+    def poll(self):
+        if self.log.generation != self.shown_generation:
+            # File rotated or truncated: start over, including any filter
+            self.shown_generation = self.log.generation
+            if self.search:
+                self.apply_filter()
+        count = self.row_count()
+        if count != self.shown_count:
+            self.shown_count = count
+            self.table.reload(keep_position=True)
+            if self.follow_var.get():
+                self.jump_to_end()
+        self.update_status()
+        self.poll_id = self.after(self.POLL_MS, self.poll)
+
+    def update_status(self):
+        text = f"{self.log.line_count:,} lines"
+        if self.search:
+            scanning = self.search.scanned_pos < self.log.indexed_pos
+            text = f"{self.search.match_count:,} matching{' (searching...)' if scanning else ''} of {text}"
+        self.status.config(text=text)
+
+    # ------------------------------
+    # ACTIONS
+    # ------------------------------
+    def jump_to_end(self):
+        if self.table.total:
+            self.table.see_index(self.table.total - 1)
+
+    def apply_filter(self):
+        pattern = self.filter_var.get()
+        if not pattern:
+            self.clear_filter()
+            return
+        try:
+            search = LogSearch(self.log, pattern, regex=self.regex_var.get())
+        except re.error as e:
+            messagebox.showerror("Filter", f"Invalid regular expression: {e}", parent=self)
+            return
+        if self.search:
+            self.search.cancel()
+        self.search = search
+        self.shown_count = None
+        self.table.reload()
+
+    def clear_filter(self):
+        if self.search:
+            self.search.cancel()
+            self.search = None
+        self.shown_count = None
+        self.table.reload()
+
+    def close(self):
+        self.after_cancel(self.poll_id)
+        self.log.stop()
+        if self.search:
+            self.search.cancel()
+        self.destroy()
@@ -0,0 +1,92 @@
+import tkinter as tk
+from tkinter import ttk
+
+from profiler import profiler
+
+
+class PerformanceWindow(tk.Toplevel):
+    """Live list of the latest profiled operations, newest first.
+
+    Each row is one model call from request to callback, split into time
+    queued for the worker, SQL, Python in the model (mostly building rows)
+    and the Tk callback that filled the widgets. Profiling can be switched
+    on and off here; the panel redraws only when operations complete.
+    """
+
+    POLL_MS = 500
+    COLUMNS = (("name", "Operation", 220), ("total_ms", "Total ms", 80), ("queued_ms", "Queued ms", 80),
+               ("sql_ms", "SQL ms", 80), ("python_ms", "Python ms", 80), ("tk_ms", "Tk ms", 80),
+               ("statements", "Statements", 80), ("rows", "Rows", 70), ("outcome", "Outcome", 80))
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Performance")
+        self.geometry("950x450")
+        self.shown = None
+
+        self.create_toolbar()
+        self.create_table()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.poll_id = self.after(0, self.poll)
+
+    # ------------------------------
+    # LAYOUT
+    # ------------------------------
+    def create_toolbar(self):
+        frame = tk.Frame(self)
+        frame.pack(fill="x", padx=10, pady=8)
+        self.enabled_var = tk.BooleanVar(value=profiler.enabled)
+        tk.Checkbutton(frame, text="Profiling enabled", variable=self.enabled_var,
+                       command=self.toggle).pack(side="left")
+        tk.Button(frame, text="Clear", command=profiler.clear).pack(side="left", padx=10)
+        trace = profiler.trace_path or "off (set profiling.trace_file in config.json)"
+        tk.Label(frame, text=f"Trace file: {trace}").pack(side="left", padx=10)
+        self.summary = tk.Label(frame, text="")
+        self.summary.pack(side="right")
+
+    def create_table(self):
+        frame = tk.Frame(self)
+        frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree = ttk.Treeview(frame, columns=[c[0] for c in self.COLUMNS], show="headings")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w" if column in ("name", "outcome") else "e")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+    # ------------------------------
+    # UPDATES
+    # ------------------------------
+    def toggle(self):
+        if self.enabled_var.get():
+            profiler.enable()
+        else:
+            profiler.disable()
+
+    def poll(self):
+        if profiler.completed != self.shown:
+            self.shown = profiler.completed
+            self.show(profiler.recent())
+        self.poll_id = self.after(self.POLL_MS, self.poll)
+
+    def show(self, operations):
+        self.tree.delete(*self.tree.get_children())
+        for op in operations:
+            self.tree.insert("", "end", values=[_format(op[column]) for column, _, _ in self.COLUMNS])
+        if operations:
+            count = len(operations)
+            totals = {part: sum(op[part] for op in operations) for part in ("sql_ms", "python_ms", "tk_ms")}
+            self.summary.config(text=f"{count} operations, mean SQL {totals['sql_ms'] / count:.1f} ms, "
+                                     f"Python {totals['python_ms'] / count:.1f} ms, Tk {totals['tk_ms'] / count:.1f} ms")
+        else:
+            self.summary.config(text="No operations yet")
+
+    def close(self):
+        self.after_cancel(self.poll_id)
+        self.destroy()
+
+
+def _format(value):
+    return f"{value:.1f}" if isinstance(value, float) else value
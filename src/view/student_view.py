@@ -1,27 +1,54 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv, os
 
+from controller.student_controller import StudentController
 from model.student_model import StudentModel
+from model.course_model import CourseModel
+from model import audit_log
+from query_executor import QueryExecutor
 from view.base_view import BaseView
+from view.change_dispatcher import ChangeDispatcher
+from view.virtual_tree import VirtualTreeview
+from view.export_dialog import ExportDialog
+from view.audit_log_window import AuditLogWindow
+from view.log_file_window import LogFileWindow
+from view.live_search import LiveSearch
 
 
 class StudentView(BaseView):
-    def __init__(self, parent, db, config_file="config.json"):
+    # Complete search results up to this size are kept for in-memory refinement
+    REFINE_LIMIT = 5000
+
+    def __init__(self, parent, pool, config_file="config.json", executor=None, changes=None):
         super().__init__(parent)
-        self.db = db
-        self.model = StudentModel(db)
+        self.connections = pool
+        # All reads and writes go through the executor, off the Tk thread
+        self.executor = executor or QueryExecutor(self, pool=pool)
+        # Kept for helpers that need no connection of their own (search refinement, export)
+        with pool.connection() as db:
+            self.model = StudentModel(db)
+        self.executor.add_busy_listener(self.set_busy)
+        # Committed writes from any view or import arrive here, batched per frame
+        self.changes = changes or ChangeDispatcher(self)
+        self.changes.subscribe(self.on_changes)
         self.load_config(config_file)
         self.apply_theme()
         
         # This will store the ID of the student being edited
         self.current_student_id = None
+        # (term, rows) of the last complete search, refined in memory as the term grows
+        self.search_results = None
+        self.table_term = ""
+        self.search_generation = 0
 
         self.create_header()
         self.create_theme_toggle()
         self.create_form()
         self.create_search()
         self.create_table()
+        self.load_after_paint(self.load_data)
+
+    def load_data(self):
         self.load_courses_dropdown()
         self.load_students()
 
@@ -73,13 +100,15 @@ class StudentView(BaseView):
         self.btn_update = tk.Button(button_frame, text="Update", command=self.update_student)
         self.btn_delete = tk.Button(button_frame, text="Delete", command=self.delete_student)
         self.btn_clear = tk.Button(button_frame, text="Clear Fields", command=self.clear_form)
+        self.btn_import = tk.Button(button_frame, text="Import CSV", command=self.import_csv)
         self.btn_export = tk.Button(button_frame, text="Export Logs", command=self.export_logs)
         self.btn_view_logs = tk.Button(button_frame, text="View Logs", command=self.view_logs)
         self.btn_audit = tk.Button(button_frame, text="View Audit Log", command=self.view_audit_log)
+        self.btn_audit_file = tk.Button(button_frame, text="Audit Log File", command=self.view_audit_file)
  
 
-        for b in [self.btn_add, self.btn_update, self.btn_delete,
-                  self.btn_clear, self.btn_export, self.btn_view_logs, self.btn_audit]:
+        for b in [self.btn_add, self.btn_update, self.btn_delete, self.btn_clear,
+                  self.btn_import, self.btn_export, self.btn_view_logs, self.btn_audit, self.btn_audit_file]:
             b.pack(pady=5)
 
     def clear_form(self):
@@ -98,59 +127,32 @@ class StudentView(BaseView):
     # ------------------------------
     # CRUD METHODS
     # ------------------------------
+    def form_data(self):
+        return {
+            "student_no": self.entries['student_no'].get(),
+            "first_name": self.entries['first_name'].get(),
+            "last_name": self.entries['last_name'].get(),
+            "email": self.entries['email'].get(),
+            "course": self.entries['course'].get(),
+        }
+
     def save_student(self):
-        student_no = self.entries['student_no'].get().strip()
-        first_name = self.entries['first_name'].get().strip()
-        last_name = self.entries['last_name'].get().strip()
-        email = self.entries['email'].get().strip()
-        course_name = self.entries['course'].get().strip()
-        # Missing: Email format validation, name character validation, etc.
-        if not (student_no and first_name and last_name and email and course_name):
-            messagebox.showerror("Error", "All fields are required.")
-            return
+        # Validation and course lookup happen in the controller, on the worker
+        self.executor.call(
+            StudentController, "create", self.form_data(),
+            callback=lambda _: self.on_write_done("Success", "Student added successfully."),
+            errback=lambda e: messagebox.showerror("Error", f"Failed to add student: {e}")
+        )
 
-        course_row = self.db.fetchone("SELECT id FROM courses WHERE course_name = ?", (course_name,))
-        if not course_row:
-            messagebox.showerror("Error", "Selected course not found.")
-            return
-        course_id = course_row[0]
-
-        try:
-            self.model.add_student(student_no, first_name, last_name, email, course_id)
-            messagebox.showinfo("Success", "Student added successfully.")
-            self.load_students()
-            self.clear_form()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add student: {e}")
-            
     def update_student(self):
         if self.current_student_id is None:
             messagebox.showwarning("Select Student", "Please select a student to update.")
             return
-      
-        student_no = self.entries['student_no'].get().strip()
-        first_name = self.entries['first_name'].get().strip()
-        last_name = self.entries['last_name'].get().strip()
-        email = self.entries['email'].get().strip()
-        course_name = self.entries['course'].get().strip()
-
-        if not (student_no and first_name and last_name and email and course_name):
-            messagebox.showerror("Error", "All fields are required.")
-            return
-
-        course_row = self.db.fetchone("SELECT id FROM courses WHERE course_name = ?", (course_name,))
-        if not course_row:
-            messagebox.showerror("Error", "Selected course not found.")
-            return
-        course_id = course_row[0]
-
-        try:
-            self.model.update_student(self.current_student_id, student_no, first_name, last_name, email, course_id)
-            messagebox.showinfo("Success", "Student updated successfully.")
-            self.load_students()
-            self.clear_form()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update student: {e}")
+        self.executor.call(
+            StudentController, "update", self.current_student_id, self.form_data(),
+            callback=lambda _: self.on_write_done("Success", "Student updated successfully."),
+            errback=lambda e: messagebox.showerror("Error", f"Failed to update student: {e}")
+        )
 
     def delete_student(self):
         if self.current_student_id is None:
@@ -161,34 +163,139 @@ class StudentView(BaseView):
         if not confirm:
             return
 
-        try:
-            self.model.delete_student(self.current_student_id)
-            messagebox.showinfo("Deleted", "Student deleted successfully.")
-            self.load_students()
-            self.clear_form()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete student: {e}")
+        self.executor.call(
+            StudentController, "delete", self.current_student_id,
+            callback=lambda _: self.on_write_done("Deleted", "Student deleted successfully."),
+            errback=lambda e: messagebox.showerror("Error", f"Failed to delete student: {e}")
+        )
+
+    def on_write_done(self, title, message):
+        # The table itself is updated from the change feed, see on_changes
+        messagebox.showinfo(title, message)
+        self.clear_form()
+
+    def on_changes(self, batch):
+        """Bring the table and course dropdown in line with committed writes"""
+        refresh = False
+        for change in batch:
+            if change.entity == "course":
+                if change.op != "insert":
+                    # Rows show their course name, which a rename or delete changes
+                    refresh = True
+            elif change.op == "import":
+                refresh = True
+            elif not refresh:
+                self.apply_change(change)
+        if any(change.entity == "course" for change in batch):
+            self.load_courses_dropdown()
+        if refresh:
+            self.refresh_table()
+
+    def apply_change(self, change):
+        """Patch the table for one written student instead of reloading every row"""
+        row = change.values
+        if self.search_results is not None:
+            # List mode: keep the in-memory results, which later refines narrow, in step
+            term, rows = self.search_results
+            if change.op == "insert":
+                if self.model.refine([row], term):
+                    rows.append(row)
+                    self.table.append_row(row)
+                return
+            index = next((i for i, r in enumerate(rows) if r["id"] == change.id), None)
+            if index is None:
+                return
+            if change.op == "delete":
+                del rows[index]
+                self.table.remove_row(change.id)
+            else:
+                rows[index] = row
+                self.table.update_row(row)
+        elif change.op == "update":
+            self.table.update_row(row)
+        elif change.op == "delete":
+            self.table.remove_row(change.id)
+        elif self.table_term:
+            # Whether a new row matches the filter is up to SQL; recount in place
+            self.table.reload(keep_position=True)
+        else:
+            # Windowed rows are ordered by id, so a new student always goes last
+            self.table.append_row(row)
+
+    def refresh_table(self):
+        """Re-read the table after changes too broad to patch row by row"""
+        if self.search_results is not None:
+            term = self.search_results[0]
+            self.search_results = None
+            self.show_students(term)
+        else:
+            self.table.reload(keep_position=True)
 
     def load_students(self):
-        self.tree.delete(*self.tree.get_children())
-        rows = self.model.get_all_students()
-        for r in rows:
-            self.tree.insert("", "end", values=(r["id"], r["student_no"], r["name"], r["email"], r["course"]))
+        self.show_students("")
 
     def search_student(self):
-        term = self.search_var.get().strip()
-        rows = self.model.search_students(term)
-        self.tree.delete(*self.tree.get_children())
-        for r in rows:
-            self.tree.insert("", "end", values=(r["id"], r["student_no"], r["name"], r["email"], r["course"]))
+        self.live_search.search_now(force=True)
+
+    def show_students(self, term):
+        self.search_generation += 1
+        self.executor.cancel("students.search")
+        if not term:
+            self.search_results = None
+            self.show_windowed(term)
+        elif self.search_results and self.model.can_refine(self.search_results[0], term):
+            # The new term extends the last one: narrow the rows already in memory
+            rows = self.model.refine(self.search_results[1], term)
+            self.search_results = (term, rows)
+            self.show_rows(rows)
+        else:
+            generation = self.search_generation
+            self.executor.call(StudentModel, "search_rows", term, self.REFINE_LIMIT,
+                               callback=lambda result: self.on_search_rows(generation, term, result),
+                               key="students.search")
+
+    def on_search_rows(self, generation, term, result):
+        if generation != self.search_generation:
+            return
+        if result["complete"]:
+            self.search_results = (term, result["rows"])
+            self.show_rows(result["rows"])
+        else:
+            # Too many matches to keep in memory; page through them instead
+            self.search_results = None
+            self.show_windowed(term)
+
+    def show_rows(self, rows):
+        self.table.set_source(
+            fetch_window=lambda offset, limit, deliver: deliver(rows[offset:offset + limit]),
+            count_rows=lambda deliver: deliver(len(rows))
+        )
+
+    def show_windowed(self, term):
+        self.table_term = term
+
+        def fetch_window(offset, limit, deliver, after=None, before=None):
+            # Windows next to a cached one seek from its edge row instead of using OFFSET
+            self.executor.call(StudentModel, "get_students_window", offset, limit, term,
+                               None if after is None else after["id"], None if before is None else before["id"],
+                               callback=deliver)
+
+        # Only the visible rows are fetched; the table pulls more as it scrolls
+        self.table.set_source(
+            fetch_window=fetch_window,
+            count_rows=lambda deliver: self.executor.call(
+                StudentModel, "count_students", term, callback=deliver, key="students.count"),
+            seekable=True
+        )
 
     # ------------------------------
     # COURSE DROPDOWN
     # ------------------------------
     def load_courses_dropdown(self):
-        rows = self.db.fetchall("SELECT course_name FROM courses ORDER BY course_name")
-        course_names = [r[0] for r in rows]
-        self.entries["course"]["values"] = course_names
+        def on_names(course_names):
+            self.entries["course"]["values"] = course_names
+
+        self.executor.call(CourseModel, "get_course_names", callback=on_names, key="students.dropdown")
 
     # ------------------------------
     # SEARCH BAR + TABLE
@@ -199,7 +306,10 @@ class StudentView(BaseView):
 
         tk.Label(frame, text="🔎 Search:").pack(side="left")
         self.search_var = tk.StringVar()
-        tk.Entry(frame, textvariable=self.search_var, width=40).pack(side="left", padx=10)
+        search_entry = tk.Entry(frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side="left", padx=10)
+        search_entry.bind("<Return>", lambda e: self.search_student())
+        self.live_search = LiveSearch(self, self.search_var, self.show_students)
         tk.Button(frame, text="Search", command=self.search_student,
                   bg=self.button_bg, fg=self.button_fg).pack(side="left", padx=5)
         tk.Button(frame, text="Clear", command=self.load_students,
@@ -209,17 +319,25 @@ class StudentView(BaseView):
         frame = tk.Frame(self, bg=self.bg)
         frame.pack(fill="both", expand=True, padx=20, pady=10)
         columns = ("ID", "Student No", "Firstname Lastname", "Email", "Course")
-        self.tree = ttk.Treeview(frame, columns=columns, show="headings")
+        self.table = VirtualTreeview(
+            frame, columns,
+            fetch_window=lambda offset, limit, deliver: deliver([]),
+            count_rows=lambda deliver: deliver(0),
+            row_values=lambda r: (r["id"], r["student_no"], r["name"], r["email"], r["course"])
+        )
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=150, anchor="center")
-        self.tree.pack(fill="both", expand=True)
-        self.tree.bind("<<TreeviewSelect>>", self.on_row_select)
+        self.tree.bind("<<TreeviewSelect>>", self.on_row_select, add="+")
 
     def on_row_select(self, event):
         selected = self.tree.selection()
         if not selected:
-            self.clear_form()
+            # The virtual table drops the highlight when the selected row scrolls away
+            if self.table.selected_index is None:
+                self.clear_form()
             return
         
         values = self.tree.item(selected[0])["values"]
@@ -248,68 +366,72 @@ class StudentView(BaseView):
         self.btn_update.config(state="normal")
         self.btn_delete.config(state="normal")
 
+    # ------------------------------
+    # BULK IMPORT
+    # ------------------------------
+    def import_csv(self):
+        file_path = filedialog.askopenfilename(
+            title="Import students (columns: student_no, first_name, last_name, email, course)",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        self.executor.call(StudentModel, "import_csv", file_path, callback=self.on_import_done,
+                           errback=lambda e: messagebox.showerror("Error", f"Failed to import students: {e}"))
+
+    def on_import_done(self, result):
+        rejected = result["rejected"]
+        summary = f"Imported {result['imported']} students, rejected {len(rejected)}."
+        if rejected:
+            # Show the first few rejects rather than one messagebox per row
+            details = "\n".join(f"Line {line}: {reason}" for line, reason in rejected[:10])
+            more = f"\n... and {len(rejected) - 10} more" if len(rejected) > 10 else ""
+            messagebox.showwarning("Import CSV", f"{summary}\n\n{details}{more}")
+        else:
+            messagebox.showinfo("Import CSV", summary)
+
     # ------------------------------
     # LOGS
     # ------------------------------
     def export_logs(self):
-        try:
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
-            )
-            if not file_path:
-                return
-            rows = self.model.get_all_students()
-            with open(file_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                timestamp = datetime.datetime.now().strftime("%y%m%d%H%M%S")
-                writer.writerow(["Exported", timestamp])  # Add timestamp row
-                writer.writerow(["ID", "Student No", "Firstname Lastname", "Email", "Course"])
-                for r in rows:
-                    writer.writerow([r["id"], r["student_no"], r["name"], r["email"], r["course"]])
-            messagebox.showinfo("Export Logs", f"Logs exported successfully to {file_path}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export logs: {e}")
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        # Rows stream from a worker thread straight into the file
+        self.executor.call(
+            StudentModel, "count_students",
+            callback=lambda total: ExportDialog(self, self.connections, self.model.export_csv, file_path,
+                                                total=total, title="Export Students")
+        )
 
     def view_logs(self):
-        try:
-            rows = self.model.get_all_students()
-            if not rows:
-                messagebox.showinfo("View Logs", "No student records found.")
-                return
-            log_window = tk.Toplevel(self)
-            log_window.title("Student Logs")
-            log_window.geometry("600x400")
-            cols = ("ID", "Student No", "Name", "Email", "Course")
-            tree = ttk.Treeview(log_window, columns=cols, show="headings")
-            for col in cols:
-                tree.heading(col, text=col)
-                tree.column(col, width=150, anchor="center")
-            tree.pack(fill="both", expand=True)
-            for r in rows:
-                tree.insert("", "end", values=(r["id"], r["student_no"], r["name"], r["email"], r["course"]))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load logs: {e}")
+        self.executor.call(StudentModel, "get_all_students", callback=self.show_logs,
+                           errback=lambda e: messagebox.showerror("Error", f"Failed to load logs: {e}"))
 
-    def view_audit_log(self):
-        log_path = "logs/student_audit.log"
-        if not os.path.exists(log_path):
-            messagebox.showinfo("Audit Log", "No audit log file found.")
+    def show_logs(self, rows):
+        if not rows:
+            messagebox.showinfo("View Logs", "No student records found.")
             return
-
         log_window = tk.Toplevel(self)
-        log_window.title("Student Audit Log")
-        log_window.geometry("800x500")
-
-        text = tk.Text(log_window, wrap="none", font=("Consolas", 10))
-        text.pack(fill="both", expand=True)
+        log_window.title("Student Logs")
+        log_window.geometry("600x400")
+        cols = ("ID", "Student No", "Name", "Email", "Course")
+        tree = ttk.Treeview(log_window, columns=cols, show="headings")
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor="center")
+        tree.pack(fill="both", expand=True)
+        for r in rows:
+            tree.insert("", "end", values=(r["id"], r["student_no"], r["name"], r["email"], r["course"]))
 
-        with open(log_path, "r", encoding="utf-8") as f:
-            log_content = f.read()
-            text.insert("1.0", log_content)
-        text.config(state="disabled")
+    def view_audit_log(self):
+        # Paged and filtered in SQL, so the size of the trail does not matter
+        AuditLogWindow(self, self.executor, entity="student")
 
-        # Optional: Add a vertical scrollbar
-        scrollbar = ttk.Scrollbar(log_window, orient="vertical", command=text.yview)
-        text.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+    def view_audit_file(self):
+        # Queued entries first, then the viewer follows anything written after
+        audit_log.writer_for(self.model.log_file).flush()
+        LogFileWindow(self, self.model.log_file, title="Student Audit Log")
\ No newline at end of file
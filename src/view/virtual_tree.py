@@ -0,0 +1,283 @@
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+
+from profiler import profiler
+
+
+class VirtualTreeview(tk.Frame):
+    """Treeview that only materializes the rows currently scrolled into view.
+
+    The Treeview holds one item per visible line. Scrolling re-fills those
+    items in place from windows of rows fetched through ``fetch_window``,
+    so refresh cost does not depend on how many rows the source has.
+
+    The source is asynchronous: ``fetch_window(offset, limit, deliver)`` and
+    ``count_rows(deliver)`` hand their result to ``deliver`` whenever it is
+    ready (possibly immediately). Rows still loading are drawn blank, and
+    results from a source that has since been replaced are dropped.
+
+    A ``seekable`` source also takes ``after=row`` or ``before=row``: the
+    row just before or after the window, taken from a neighbouring window
+    already cached, so a database source can seek to it instead of using
+    OFFSET when scrolling deep into a large table.
+    """
+
+    def __init__(self, parent, columns, fetch_window, count_rows, row_values,
+                 row_key=lambda row: row["id"], window_size=200, max_windows=4, row_height=28, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.fetch_window = fetch_window      # (offset, limit, deliver(rows))
+        self.count_rows = count_rows          # (deliver(total))
+        self.row_values = row_values          # row -> tuple of column values
+        self.row_key = row_key                # row -> unique id
+        self.window_size = window_size
+        self.max_windows = max_windows
+        self.row_height = row_height
+        self.seekable = False
+
+        self.total = 0
+        self.top = 0
+        self.visible_rows = 1
+        self.windows = OrderedDict()
+        self.positions = {}                   # row id -> index, for cached rows
+        self.requested = set()
+        self.generation = 0
+        self.drawing = False
+        self.items = []
+        self.selected_index = None
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=1)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-self.visible_rows))
+        self.tree.bind("<Next>", lambda e: self._scroll_by(self.visible_rows))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    # ------------------------------
+    # DATA SOURCE
+    # ------------------------------
+    def set_source(self, fetch_window=None, count_rows=None, seekable=False):
+        """Point the view at a (possibly new) row source and redraw from the top"""
+        if fetch_window is not None:
+            self.fetch_window = fetch_window
+            self.seekable = seekable
+        if count_rows is not None:
+            self.count_rows = count_rows
+        self.reload()
+
+    def reload(self, keep_position=False):
+        """Drop cached windows, recount and redraw"""
+        self.generation += 1
+        self.windows.clear()
+        self.positions.clear()
+        self.requested.clear()
+        if not keep_position:
+            self.top = 0
+            self.selected_index = None
+        generation = self.generation
+        self.count_rows(lambda total: self._on_count(generation, total))
+
+    def _on_count(self, generation, total):
+        if generation != self.generation:
+            return
+        self.total = total
+        self.top = max(0, min(self.top, self.total - self.visible_rows))
+        self._redraw()
+
+    def get_row(self, index):
+        """Return the source row at ``index``, or None while its window is loading"""
+        if index < 0 or index >= self.total:
+            return None
+        window = index // self.window_size
+        if window not in self.windows and window not in self.requested:
+            self.requested.add(window)
+            generation = self.generation
+            self._fetch(window, lambda rows: self._on_window(generation, window, rows))
+        rows = self.windows.get(window)
+        if rows is None:
+            return None
+        self.windows.move_to_end(window)
+        offset = index - window * self.window_size
+        return rows[offset] if offset < len(rows) else None
+
+    def _fetch(self, window, deliver):
+        offset = window * self.window_size
+        if self.seekable:
+            previous, following = self.windows.get(window - 1), self.windows.get(window + 1)
+            # Only a full window ends right before this one
+            if previous is not None and len(previous) == self.window_size:
+                return self.fetch_window(offset, self.window_size, deliver, after=previous[-1])
+            if following:
+                return self.fetch_window(offset, self.window_size, deliver, before=following[0])
+        self.fetch_window(offset, self.window_size, deliver)
+
+    def _on_window(self, generation, window, rows):
+        if generation != self.generation:
+            return
+        self.requested.discard(window)
+        self.windows[window] = rows
+        start = window * self.window_size
+        for i, row in enumerate(rows):
+            self.positions[self.row_key(row)] = start + i
+        if len(self.windows) > self.max_windows:
+            self._forget_window(next(iter(self.windows)))
+        # A synchronous source delivers while _redraw is already filling rows
+        if not self.drawing:
+            self._redraw()
+
+    def _forget_window(self, window):
+        for row in self.windows.pop(window, ()):
+            self.positions.pop(self.row_key(row), None)
+
+    # ------------------------------
+    # ROW-LEVEL CHANGES
+    # ------------------------------
+    # These patch the cached windows and redraw only the visible items, so a
+    # single edit costs the same however many rows the source has.
+    def update_row(self, row):
+        """Show new values for a row already in the source"""
+        index = self.positions.get(self.row_key(row))
+        if index is None:
+            return  # not cached; it will be fetched fresh when scrolled to
+        window, offset = divmod(index, self.window_size)
+        self.windows[window][offset] = row
+        if self.top <= index < self.top + self.visible_rows:
+            self._redraw()
+
+    def append_row(self, row):
+        """Add a row after the last one, e.g. a new id in an id-ordered source"""
+        index = self.total
+        self.total += 1
+        window, offset = divmod(index, self.window_size)
+        rows = self.windows.get(window)
+        if rows is not None and offset == len(rows):
+            rows.append(row)
+            self.positions[self.row_key(row)] = index
+        self._redraw()
+
+    def remove_row(self, row_id):
+        """Drop a row from the source; rows after it move up by one"""
+        index = self.positions.get(row_id)
+        self.total = max(0, self.total - 1)
+        # Cached windows from the removed row onwards are now misaligned
+        first_stale = 0 if index is None else index // self.window_size
+        for window in [w for w in self.windows if w >= first_stale]:
+            self._forget_window(window)
+        if self.selected_index is not None and index is not None:
+            if self.selected_index == index:
+                self.selected_index = None
+            elif self.selected_index > index:
+                self.selected_index -= 1
+        self.top = max(0, min(self.top, self.total - self.visible_rows))
+        self._redraw()
+
+    # ------------------------------
+    # SCROLLING
+    # ------------------------------
+    def yview(self, *args):
+        """Scrollbar protocol: ``moveto fraction`` or ``scroll n units|pages``"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * self.total))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_rows
+            self._scroll_by(step)
+
+    def see_index(self, index):
+        """Scroll the minimum amount needed for ``index`` to be visible"""
+        if index < self.top:
+            self._scroll_to(index)
+        elif index >= self.top + self.visible_rows:
+            self._scroll_to(index - self.visible_rows + 1)
+
+    def _scroll_by(self, step):
+        self._scroll_to(self.top + step)
+        return "break"
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, self.total - self.visible_rows))
+        if top != self.top:
+            self.top = top
+            self._redraw()
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        # Heading takes roughly one row of the available height
+        rows = max(1, event.height // self.row_height - 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._scroll_to(self.top)
+            self._redraw()
+
+    # ------------------------------
+    # SELECTION
+    # ------------------------------
+    def _on_select(self, event):
+        selected = self.tree.selection()
+        if selected and selected[0] in self.items:
+            self.selected_index = self.top + self.items.index(selected[0])
+
+    def _move_selection(self, step):
+        if self.total == 0:
+            return "break"
+        index = self.top if self.selected_index is None else self.selected_index + step
+        index = max(0, min(index, self.total - 1))
+        self.selected_index = index
+        self.see_index(index)
+        self._redraw()
+        return "break"
+
+    # ------------------------------
+    # RENDERING
+    # ------------------------------
+    def _redraw(self):
+        self.drawing = True
+        try:
+            with profiler.span("VirtualTreeview.redraw", "tk"):
+                self._fill_items()
+        finally:
+            self.drawing = False
+
+    def _fill_items(self):
+        count = max(0, min(self.visible_rows, self.total - self.top))
+
+        # Grow or shrink the item pool to the number of visible rows
+        while len(self.items) < count:
+            self.items.append(self.tree.insert("", "end", values=()))
+        while len(self.items) > count:
+            self.tree.delete(self.items.pop())
+
+        selected_item = None
+        for i, item in enumerate(self.items):
+            row = self.get_row(self.top + i)
+            self.tree.item(item, values=self.row_values(row) if row is not None else ())
+            if self.top + i == self.selected_index:
+                selected_item = item
+
+        current = self.tree.selection()
+        if selected_item is not None and current != (selected_item,):
+            self.tree.selection_set(selected_item)
+            self.tree.focus(selected_item)
+        elif selected_item is None and current:
+            # Selected row scrolled out of view; keep the index, clear the highlight
+            self.tree.selection_remove(*current)
+
+        if self.total:
+            first = self.top / self.total
+            last = min(1.0, (self.top + count) / self.total)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)